@@ -0,0 +1,144 @@
+"""
+=============================================================================
+BENCHMARK — ARTEFACTOS DOS MODELOS: pickle vs. UBJSON vs. árvores compactas
+=============================================================================
+Treina, numa pasta temporária, um XGBRegressor por entrada do manifesto em
+Models/ (mesmos hiperparâmetros e nº de features, dados sintéticos) e grava o
+mesmo modelo em três formatos:
+  pickle    : {'modelo': XGBRegressor, 'features', 'mae'} (o formato antigo)
+  UBJSON    : booster nativo do XGBoost
+  compacto  : .npz + manifesto do Source/ML/registro_modelos.py (gravar_modelo)
+Mede, para os modelos todos:
+  tamanho      : bytes em disco
+  carga quente : desserializar num processo que já importou tudo
+  carga a frio : processo novo (import + carga de todos), como no arranque do app
+  previsão     : 1 linha e 25 linhas (elenco) por modelo
+e confere que as previsões são iguais bit a bit.
+
+Uso: python Benchmarks/benchmark_artefatos_modelos.py [--repeticoes 3]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import subprocess
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+RAIZ_PROJETO = os.path.abspath(os.path.join(DIRETORIO_ATUAL, '..'))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.append(RAIZ_PROJETO)
+
+import numpy as np
+import xgboost as xgb
+import Source.Dados.config as config
+from Source.ML.registro_modelos import ler_manifesto_modelos, gravar_modelo, chave_modelo, ArvoresCompactas
+
+CARGAS = {
+    'pickle': "import pickle\nfor c in CAMINHOS:\n    with open(c, 'rb') as f: pickle.load(f)",
+    'UBJSON': "import xgboost as xgb\nfor c in CAMINHOS:\n    xgb.Booster().load_model(c)",
+    'compacto': (
+        f"sys.path.append({RAIZ_PROJETO!r})\nfrom Source.ML.registro_modelos import ArvoresCompactas\n"
+        "for c in CAMINHOS:\n    with open(c, 'rb') as f: ArvoresCompactas.de_bytes(f.read())"
+    ),
+}
+
+def treinar(entrada, rng, linhas=3000):
+    """XGBRegressor com os hiperparâmetros da entrada, num alvo não linear com valores em falta."""
+    X = rng.normal(size=(linhas, len(entrada['features']))) * 100
+    y = 50 * np.sin(X[:, 0] / 40) + np.abs(X[:, 1]) + X[:, 2] * (X[:, 3] > 0) + rng.normal(size=linhas) * 5
+    X[rng.random(X.shape) < 0.05] = np.nan
+    modelo = xgb.XGBRegressor(**entrada['hiperparametros'], n_jobs=1, verbosity=0)
+    modelo.fit(X, y)
+    return modelo
+
+def gravar_formatos(entradas, pasta, rng):
+    """Mesmo modelo nos três formatos; devolve {formato: [caminhos]} e os modelos por formato."""
+    caminhos = {formato: [] for formato in CARGAS}
+    modelos = {formato: [] for formato in CARGAS}
+    for chave, entrada in entradas.items():
+        modelo = treinar(entrada, rng)
+        caminho = os.path.join(pasta, f"modelo_{chave}")
+        with open(caminho + '.pkl', 'wb') as f:
+            pickle.dump({'modelo': modelo, 'features': entrada['features'], 'mae': entrada['mae']}, f)
+        modelo.get_booster().save_model(caminho + '.ubj')
+        sufixo, periodo = chave.rsplit('_T', 1)
+        arquivo = gravar_modelo(pasta, sufixo, periodo, modelo.get_booster(), entrada['features'],
+                                entrada['mae'], entrada['hiperparametros'], entrada['versao_dados'])
+        assert chave_modelo(sufixo, periodo) == chave
+        for formato, arq in zip(CARGAS, (caminho + '.pkl', caminho + '.ubj', os.path.join(pasta, arquivo))):
+            caminhos[formato].append(arq)
+        modelos['pickle'].append(modelo)
+        modelos['UBJSON'].append(modelo.get_booster())
+        with open(os.path.join(pasta, arquivo), 'rb') as f:
+            modelos['compacto'].append(ArvoresCompactas.de_bytes(f.read()))
+    return caminhos, modelos
+
+def carga_quente(codigo, caminhos, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        exec(codigo, {'CAMINHOS': caminhos, 'sys': sys})
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def carga_a_frio(codigo, caminhos, repeticoes):
+    """Processo novo (imports incluídos; o pickle importa o xgboost e o sklearn ao desserializar)."""
+    script = "import time, sys\nCAMINHOS = sys.argv[1:]\ninicio = time.perf_counter()\n" + codigo + "\nprint(time.perf_counter() - inicio)"
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', script, *caminhos], capture_output=True, text=True, check=True)
+        melhor = min(melhor, float(saida.stdout))
+    return melhor
+
+def previsao(modelos, amostras, repeticoes):
+    """Melhor tempo de uma previsão de cada modelo (como um tick do Live Tracker com todas as abas)."""
+    prever = (lambda m, X: m.predict(X)) if isinstance(modelos[0], xgb.XGBRegressor) else (lambda m, X: m.inplace_predict(X))
+    melhor = float('inf')
+    for _ in range(repeticoes * 10):
+        inicio = time.perf_counter()
+        for modelo, X in zip(modelos, amostras):
+            prever(modelo, X)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    entradas = ler_manifesto_modelos().get('modelos', {})
+    if not entradas:
+        print(f"Sem manifesto em {config.DIRETORIO_MODELOS}: rode o Source/ML/predictive.py")
+        return
+    rng = np.random.default_rng(0)
+    pasta = tempfile.mkdtemp(prefix='bench_artefatos_')
+    caminhos, modelos = gravar_formatos(entradas, pasta, rng)
+
+    # Mesma previsão nos três formatos, com valores em falta
+    amostras = []
+    for entrada in entradas.values():
+        X = (rng.normal(size=(25, len(entrada['features']))) * 100).astype(np.float32)
+        X[rng.random(X.shape) < 0.1] = np.nan
+        amostras.append(X)
+    for i, X in enumerate(amostras):
+        antigo = modelos['pickle'][i].predict(X)
+        for formato in ('UBJSON', 'compacto'):
+            np.testing.assert_array_equal(modelos[formato][i].inplace_predict(X), antigo)
+
+    manifesto = os.path.getsize(os.path.join(pasta, config.ARQUIVO_MANIFESTO_MODELOS))
+    print(f"{len(entradas)} modelos, previsões idênticas nos três formatos\n")
+    print(f"{'Formato':<12}{'disco':>10}{'carga quente':>15}{'a frio':>10}{'prever 1':>12}{'prever 25':>12}")
+    for formato, lista in caminhos.items():
+        tamanho = sum(os.path.getsize(c) for c in lista) + (manifesto if formato == 'compacto' else 0)
+        quente = carga_quente(CARGAS[formato], lista, args.repeticoes)
+        frio = carga_a_frio(CARGAS[formato], lista, args.repeticoes)
+        uma = previsao(modelos[formato], [X[:1] for X in amostras], args.repeticoes)
+        elenco = previsao(modelos[formato], amostras, args.repeticoes)
+        print(f"{formato:<12}{tamanho / 1e6:>7.2f} MB{quente * 1e3:>12.1f} ms{frio:>9.2f}s{uma * 1e3:>9.1f} ms{elenco * 1e3:>9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+=============================================================================
+BENCHMARK — BASE ANALÍTICA (DuckDB/SQLite) vs. pandas em várias temporadas
+=============================================================================
+Gera N temporadas sintéticas: as anteriores vão para as partições em disco e a
+última fica como temporada atual, como faz a ingestão. Compara as consultas das
+páginas feitas em pandas com as mesmas consultas empurradas para o motor:
+  pandas (disco)  : carrega as partições pedidas e agrupa (o que a Temporada fazia)
+  pandas (memória): só o agrupamento, com tudo já carregado (limite inferior)
+  SQL             : consulta na base analítica, sem cache (temporadas anteriores no
+                    motor + temporada atual agregada em memória, como a página Temporada)
+  SQL (cache)     : mesma consulta, mesma versão (st.cache_data)
+
+Uso: python Benchmarks/benchmark_base_analitica.py [--temporadas 5] [--atletas 18] [--repeticoes 3]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import pandas as pd
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+from dados_sinteticos import gerar_base_bruta
+import Source.Dados.config as config
+import Source.Dados.particoes as particoes
+import Source.Dados.base_analitica as base_analitica
+from Source.Dados.data_loader import _processar_bruto, construir_cubo_jogos, concatenar_bases
+
+JOGOS_POR_TEMPORADA = 91 # Um jogo a cada 4 dias
+CHAVES_JOGO = ['Data', 'Data_Display', 'Competição', 'Name', 'Jogou_em_Casa']
+METRICAS = ['Total Distance', 'HIA', 'V5 Dist', 'Player Load']
+
+def cronometrar(funcao, repeticoes, antes=None):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def _ler_temporadas(temporadas, df_atual):
+    """O que a página fazia sem a base analítica: partições pedidas + temporada atual em memória."""
+    return concatenar_bases(particoes.ler_particoes(set(temporadas)) + [df_atual])
+
+def _temporada_sql(antigas, cubo_atual):
+    """Atleta × jogo: temporadas anteriores agregadas no motor + a atual a partir do cubo em memória."""
+    antigo = base_analitica.agregar('cubo', CHAVES_JOGO, METRICAS, temporadas=antigas)
+    return concatenar_bases([antigo, cubo_atual.groupby(CHAVES_JOGO, observed=True)[METRICAS].sum().reset_index()])
+
+def _placar_sql(antigas, df_atual):
+    """Média de HIA por placar: soma e contagem das anteriores no motor, juntas às da temporada atual."""
+    soma = base_analitica.agregar('minutos', ['Placar'], ['HIA'], funcao='SUM', temporadas=antigas).set_index('Placar')['HIA']
+    contagem = base_analitica.agregar('minutos', ['Placar'], ['HIA'], funcao='COUNT', temporadas=antigas).set_index('Placar')['HIA']
+    atual = df_atual.groupby('Placar', observed=True)['HIA'].agg(['sum', 'count']).rename(index=str)
+    total = atual.add(pd.DataFrame({'sum': soma, 'count': contagem}), fill_value=0)
+    return total['sum'] / total['count']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--temporadas', type=int, default=5)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger('streamlit.runtime.caching.cache_data_api').setLevel(logging.ERROR) # cache_data fora do `streamlit run`
+
+    pasta = tempfile.mkdtemp(prefix='bench_analitica_')
+    config.DIRETORIO_PARTICOES = os.path.join(pasta, 'particoes')
+    config.DIRETORIO_BASE_ANALITICA = os.path.join(pasta, '_analitico')
+    try:
+        inicio = time.perf_counter()
+        df = _processar_bruto(gerar_base_bruta(JOGOS_POR_TEMPORADA * args.temporadas, args.atletas))
+        temporada = particoes.temporada_de(df['Data'])
+        ano_atual = int(temporada.max())
+        df_atual = df[temporada == ano_atual].reset_index(drop=True)
+        particoes.gravar_jogos(df[temporada < ano_atual], {}, {})
+        print(f"Base: {len(df)} linhas, {args.temporadas} temporadas | processada e arquivada em {time.perf_counter() - inicio:.1f}s")
+
+        cubo_atual = construir_cubo_jogos(df_atual)
+        base_analitica.publicar(1, cubo_atual)
+        estado = base_analitica.ESTADO_BASE_ANALITICA
+        print(f"Motor: {estado['motor']} | arquivo gravado em {estado['segundos_arquivo']:.2f}s, cubo da temporada atual em {estado['segundos_atual']:.2f}s\n")
+
+        anos = sorted(set(temporada.dropna().astype(int)))
+        antigas = [a for a in anos if a != ano_atual]
+        # A tabela de minutos do motor só tem as temporadas anteriores: o jogo comparado é de uma delas
+        df_jogo = df[temporada == antigas[-1]]
+        data_jogo = df_jogo['Data'].iloc[0]
+        nomes = sorted(df_jogo['Name'].dropna().unique())[:2]
+        df_tudo = _ler_temporadas(antigas, df_atual)
+        df_cubo_tudo = construir_cubo_jogos(df_tudo)
+
+        # (nome, tabela do motor, pandas a partir da base em memória, SQL via base_analitica)
+        consultas = [
+            (
+                'Temporada: atleta × jogo (soma)', 'cubo',
+                lambda d: construir_cubo_jogos(d).groupby(CHAVES_JOGO, observed=True)[METRICAS].sum(),
+                lambda: _temporada_sql(antigas, cubo_atual),
+            ),
+            (
+                'Temporada: Placar (média HIA)', 'minutos',
+                lambda d: d.groupby('Placar', observed=True)['HIA'].mean(),
+                lambda: _placar_sql(antigas, df_atual),
+            ),
+            (
+                'Comparação: 2 atletas × minuto', 'minutos',
+                lambda d: d[(d['Data'] == data_jogo) & d['Name'].isin(nomes)].groupby(['Name', 'Interval'], observed=True)[METRICAS].sum(),
+                lambda: base_analitica.consultar(
+                    'SELECT "Name", "Interval", ' + ', '.join(f'SUM("{m}") AS "{m}"' for m in METRICAS)
+                    + ' FROM minutos WHERE "Data" = ? AND "Name" IN (?, ?) GROUP BY 1, 2 ORDER BY 1, 2',
+                    [data_jogo.to_pydatetime(), *nomes],
+                ),
+            ),
+            (
+                'Percentis: P90 distância por atleta', 'cubo',
+                lambda d: construir_cubo_jogos(d).groupby('Name', observed=True)['Total Distance'].quantile(0.9),
+                (lambda: base_analitica.consultar(
+                    'SELECT "Name", quantile_cont("Total Distance", 0.9) AS p90 FROM cubo GROUP BY 1 ORDER BY 1'
+                )) if base_analitica.MOTOR == 'duckdb' else None, # SQLite não tem percentis nativos
+            ),
+        ]
+
+        print(f"{'Consulta (melhor de N)':<38}{'pandas (disco)':>16}{'pandas (mem.)':>15}{'SQL':>11}{'SQL (cache)':>13}")
+        for nome, tabela, via_pandas, via_sql in consultas:
+            if tabela not in base_analitica.TABELAS_MOTOR:
+                via_sql = None # SQLite só guarda o cubo
+            t_disco = cronometrar(lambda: via_pandas(_ler_temporadas(antigas, df_atual)), args.repeticoes)
+            t_memoria = cronometrar(lambda: via_pandas(df_tudo), args.repeticoes)
+            if via_sql is not None:
+                t_sql = cronometrar(via_sql, args.repeticoes, antes=base_analitica._consultar.clear)
+                t_cache = cronometrar(via_sql, args.repeticoes)
+                sql_txt, cache_txt = f"{t_sql * 1e3:.1f} ms", f"{t_cache * 1e3:.2f} ms"
+            else:
+                sql_txt = cache_txt = "n/d"
+            print(f"{nome:<38}{t_disco * 1e3:>13.1f} ms{t_memoria * 1e3:>12.1f} ms{sql_txt:>11}{cache_txt:>13}")
+
+        mem = df_tudo.memory_usage(deep=True).sum() + df_cubo_tudo.memory_usage(deep=True).sum()
+        print(f"\nMemória que o pandas precisa ter carregada: {mem / 1e6:.1f} MB (a base analítica consulta direto do disco)")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+=============================================================================
+BENCHMARK — CURVA DE PROJEÇÃO: laço por minuto vs. operações em array
+=============================================================================
+Mede a latência por chamada do projetar_com_modelo_treinado (predict + repartição
+do que falta pelos minutos restantes):
+  laço     : a versão anterior (media_min_geral.loc[m] minuto a minuto e
+             `m in minutos_futuros` numa lista: quadrático no nº de minutos)
+  array    : ml_engine.projetar_com_modelo_treinado (reindex, fmax, cumsum e máscara)
+  lote     : ml_engine.projetar_lote_com_modelo_treinado com todos os atletas
+             de uma vez (um predict), custo dividido por atleta
+Confere que as três vias dão a mesma curva, incluindo slider além dos 45/50 min
+e curvas com minutos em falta.
+Usa os modelos do manifesto em Models/ (treinados pelo Source/ML/predictive.py).
+
+Uso: python Benchmarks/benchmark_distribuicao_minutos.py [--atletas 18] [--periodo 1] [--minuto 20] [--ate 48]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+RAIZ_PROJETO = os.path.abspath(os.path.join(DIRETORIO_ATUAL, '..'))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.append(RAIZ_PROJETO)
+
+import numpy as np
+import pandas as pd
+from Source.ML.ml_engine import carregar_modelo_treinado, projetar_com_modelo_treinado, projetar_lote_com_modelo_treinado, _prever
+
+def projetar_laco(modelo_dict, row_atleta, minutos_futuros, dist_acumulada_atual, media_min_geral, periodo, minuto_atual):
+    """projetar_com_modelo_treinado antes da vetorização (referência)."""
+    features = modelo_dict['features']
+    sample_df = pd.DataFrame([{f: row_atleta.get(f, 0) for f in features}])[features]
+    dist_final_prevista = float(_prever(modelo_dict['modelo'], sample_df)[0])
+    dist_restante = max(0.0, dist_final_prevista - dist_acumulada_atual)
+    minuto_final_periodo = 45 if periodo == 1 else 50
+    minuto_limite_calculo = max(minuto_final_periodo, minutos_futuros[-1] if minutos_futuros else minuto_final_periodo)
+    todos_minutos_restantes = list(range(minuto_atual + 1, minuto_limite_calculo + 1))
+    pesos_totais = []
+    for m in todos_minutos_restantes:
+        peso = media_min_geral.loc[m] if m in media_min_geral.index else 1.0
+        pesos_totais.append(max(0.01, peso))
+    soma_pesos_totais = sum(pesos_totais) if sum(pesos_totais) > 0 else 1
+    acumulado_pred = []
+    acum = dist_acumulada_atual
+    for m, peso in zip(todos_minutos_restantes, pesos_totais):
+        acum += dist_restante * (peso / soma_pesos_totais)
+        if m in minutos_futuros:
+            acumulado_pred.append(acum)
+    return acumulado_pred, dist_final_prevista
+
+def gerar_atletas(n, features, minuto, seed=0):
+    """Features, acumulados e curvas de ritmo (m/min por minuto) plausíveis; alguns minutos sem histórico."""
+    rng = np.random.default_rng(seed)
+    atletas = []
+    for _ in range(n):
+        row = {f: float(rng.uniform(0, 10)) for f in features}
+        row.update({'Min_Num': minuto, 'Posicao_encoded': int(rng.integers(0, 5))})
+        minutos = np.sort(rng.choice(np.arange(1, 51), size=44, replace=False))
+        curva = pd.Series(rng.uniform(60, 140, len(minutos)), index=minutos)
+        atletas.append((row, float(rng.uniform(1000, 2500)), curva))
+    return atletas
+
+def cronometrar(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--periodo', type=int, default=1)
+    parser.add_argument('--minuto', type=int, default=20)
+    parser.add_argument('--ate', type=int, default=48, help="Fim do slider (além dos 45/50 min = acréscimos)")
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    modelo_dict = carregar_modelo_treinado(None, 'Total Distance', args.periodo)
+    if modelo_dict is None:
+        print("Nenhum modelo de Total Distance em Models/: rode o Source/ML/predictive.py")
+        return
+    atletas = gerar_atletas(args.atletas, modelo_dict['features'], args.minuto)
+    minutos_futuros = list(range(args.minuto + 1, args.ate + 1))
+
+    def por_chamada(funcao):
+        return [funcao(modelo_dict, row, minutos_futuros, atual, curva, args.periodo, args.minuto) for row, atual, curva in atletas]
+
+    def em_lote():
+        return projetar_lote_com_modelo_treinado(
+            modelo_dict, pd.DataFrame([row for row, _, _ in atletas]), minutos_futuros,
+            [atual for _, atual, _ in atletas], [curva for _, _, curva in atletas], args.periodo, [args.minuto] * len(atletas),
+        )
+
+    t_laco, r_laco = cronometrar(lambda: por_chamada(projetar_laco), args.repeticoes)
+    t_array, r_array = cronometrar(lambda: por_chamada(projetar_com_modelo_treinado), args.repeticoes)
+    t_lote, (curvas, totais) = cronometrar(em_lote, args.repeticoes)
+
+    for (curva_laco, total_laco), (curva_array, total_array), curva_lote, total_lote in zip(r_laco, r_array, curvas, totais):
+        assert len(curva_laco) == len(curva_array) == len(curva_lote)
+        np.testing.assert_allclose(curva_array, curva_laco, rtol=1e-9)
+        np.testing.assert_allclose(curva_lote, curva_laco, rtol=1e-6) # Lote: predict da matriz em float32
+        assert abs(total_array - total_laco) <= 1e-6 * abs(total_laco) and abs(total_lote - total_laco) <= 1e-6 * abs(total_laco)
+
+    n = len(atletas)
+    print(f"{n} atletas · {args.periodo}º T · corte no minuto {args.minuto}, projeção até {args.ate}\n")
+    print(f"{'Via (melhor de N)':<22}{'por atleta':>13}{'ganho':>9}")
+    print(f"{'laço':<22}{t_laco / n * 1e3:>10.3f} ms{1.0:>8.1f}x")
+    print(f"{'array':<22}{t_array / n * 1e3:>10.3f} ms{t_laco / t_array:>8.1f}x")
+    print(f"{'lote':<22}{t_lote / n * 1e3:>10.3f} ms{t_laco / t_lote:>8.1f}x")
+    print("\nAs três vias dão a mesma curva (incluindo minutos sem histórico na curva de ritmo)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+=============================================================================
+BENCHMARK — LEITURA DO WORKBOOK: python-calamine direto vs. pd.read_excel
+=============================================================================
+Compara, a partir dos mesmos bytes em memória:
+  read_excel      : pd.read_excel(engine='calamine', decimal=',', usecols=lambda)
+                    (converte todas as células de todas as colunas em Python)
+  calamine direto : data_loader._ler_planilha (só as colunas do config, por índice,
+                    convertidas coluna a coluna para arrays NumPy)
+  só calamine     : CalamineSheet.to_python, o piso que nenhum dos dois evita
+O workbook sintético é gravado em .xlsx (não há escritor de .xlsb); o workbook
+real tem muitas colunas que o app não usa, simuladas com --colunas-extra.
+Com --arquivo, mede um workbook real (ex.: o .xlsb do Data_Files).
+
+Uso: python Benchmarks/benchmark_leitura_excel.py [--jogos 10] [--atletas 18] [--colunas-extra 40] [--arquivo CAMINHO]
+=============================================================================
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import pandas as pd
+from openpyxl import Workbook
+from python_calamine import CalamineWorkbook
+from dados_sinteticos import gerar_base_bruta
+from Source.Dados.data_loader import _ler_planilha, _ler_planilha_pandas
+
+def gravar_workbook(df, caminho):
+    """openpyxl em modo write_only (o to_excel do pandas é várias vezes mais lento a gravar)."""
+    wb = Workbook(write_only=True)
+    folha = wb.create_sheet()
+    folha.append(list(df.columns))
+    for linha in df.itertuples(index=False):
+        folha.append([v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in linha])
+    wb.save(caminho)
+
+def cronometrar(funcao, dados, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(dados)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def so_calamine(dados):
+    return CalamineWorkbook.from_filelike(io.BytesIO(dados)).get_sheet_by_index(0).to_python(skip_empty_area=False)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jogos', type=int, default=10)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--colunas-extra', type=int, default=40)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--arquivo', default=None)
+    args = parser.parse_args()
+
+    if args.arquivo:
+        caminho = args.arquivo
+    else:
+        df = gerar_base_bruta(args.jogos, args.atletas)
+        for i in range(args.colunas_extra):
+            df[f'Extra {i}'] = df['Total Distance'] * (i + 1) if i % 2 else 'texto'
+        caminho = os.path.join(tempfile.mkdtemp(prefix='bench_leitura_'), 'workbook.xlsx')
+        inicio = time.perf_counter()
+        gravar_workbook(df, caminho)
+        print(f"Workbook sintético: {len(df)} linhas × {df.shape[1]} colunas gravado em {time.perf_counter() - inicio:.1f}s")
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    print(f"{os.path.basename(caminho)}: {len(dados) / 1e6:.1f} MB\n")
+
+    t_piso, _ = cronometrar(so_calamine, dados, args.repeticoes)
+    t_pandas, df_pandas = cronometrar(_ler_planilha_pandas, dados, args.repeticoes)
+    t_direto, df_direto = cronometrar(_ler_planilha, dados, args.repeticoes)
+    pd.testing.assert_frame_equal(df_direto, df_pandas, check_dtype=False) # Mesmo conteúdo (ints do pandas saem float64)
+
+    print(f"{'Leitor (melhor de N)':<22}{'tempo':>10}{'além do calamine':>19}{'ganho':>9}")
+    print(f"{'só calamine':<22}{t_piso:>9.2f}s{'—':>19}{'':>9}")
+    print(f"{'read_excel':<22}{t_pandas:>9.2f}s{(t_pandas - t_piso) * 1e3:>16.0f} ms{1.0:>8.1f}x")
+    print(f"{'calamine direto':<22}{t_direto:>9.2f}s{(t_direto - t_piso) * 1e3:>16.0f} ms{t_pandas / t_direto:>8.1f}x")
+    # O "além do calamine" do leitor direto pode sair negativo (ruído da medição): mostra-se a diferença, não uma razão
+    print(f"\nConversão depois do calamine: {(t_pandas - t_direto) * 1e3:.0f} ms a menos por leitura ({t_pandas / t_direto:.1f}x de ponta a ponta)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+=============================================================================
+BENCHMARK — MEMÓRIA RESIDENTE POR SESSÃO (cache_data vs. base partilhada)
+=============================================================================
+Simula N sessões abertas a segurar a base global como as páginas fazem:
+  ANTES : st.cache_data devolve uma cópia desserializada (pickle) por chamada
+          e a página ainda faz .copy() antes de trabalhar.
+  DEPOIS: st.cache_resource devolve a mesma referência; com copy-on-write a
+          página só paga pelas colunas que realmente altera.
+
+Uso: python Benchmarks/benchmark_memoria_sessao.py [--sessoes 10] [--jogos 30] [--atletas 18]
+=============================================================================
+"""
+
+import os
+import sys
+import gc
+import pickle
+import argparse
+import tracemalloc
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import pandas as pd
+from dados_sinteticos import gerar_base_bruta
+from Source.Dados.data_loader import _transformar_linhas, _juntar_geo, construir_tabela_geo
+
+def _rss_bytes():
+    """RSS do processo (Linux). Devolve None noutros sistemas."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+def _sessao_antes(df_base):
+    df_sessao = pickle.loads(pickle.dumps(df_base, protocol=pickle.HIGHEST_PROTOCOL)) # o que o cache_data entregava
+    df_pagina = df_sessao.copy()
+    df_pagina['Data'] = pd.to_datetime(df_pagina['Data'], errors='coerce')
+    return df_sessao, df_pagina
+
+def _sessao_depois(df_base):
+    df_sessao = df_base
+    df_pagina = df_sessao.assign(Data=pd.to_datetime(df_sessao['Data'], errors='coerce'))
+    return df_sessao, df_pagina
+
+def medir(cenario, df_base, n_sessoes):
+    gc.collect()
+    tracemalloc.start()
+    rss_inicio = _rss_bytes()
+    base_trace = tracemalloc.get_traced_memory()[0]
+
+    sessoes = [cenario(df_base) for _ in range(n_sessoes)]
+
+    retido = tracemalloc.get_traced_memory()[0] - base_trace
+    rss_fim = _rss_bytes()
+    tracemalloc.stop()
+    del sessoes
+    gc.collect()
+    rss = (rss_fim - rss_inicio) / n_sessoes if rss_inicio is not None else None
+    return retido / n_sessoes, rss
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessoes', type=int, default=10)
+    parser.add_argument('--jogos', type=int, default=30)
+    parser.add_argument('--atletas', type=int, default=18)
+    args = parser.parse_args()
+
+    pd.set_option('mode.copy_on_write', True) # Igual ao app.py
+    df_bruto = gerar_base_bruta(args.jogos, args.atletas)
+    df_base = _juntar_geo(_transformar_linhas(df_bruto), construir_tabela_geo(df_bruto))
+    tamanho_base = df_base.memory_usage(deep=True).sum()
+    print(f"Base: {len(df_base)} linhas, {tamanho_base / 1e6:.1f} MB | {args.sessoes} sessões\n")
+
+    print(f"{'Cenário':<28}{'Retido/sessão':>16}{'RSS/sessão':>14}{'× base':>9}")
+    for nome, cenario in [('ANTES (cache_data + copy)', _sessao_antes), ('DEPOIS (partilhada + CoW)', _sessao_depois)]:
+        retido, rss = medir(cenario, df_base, args.sessoes)
+        rss_txt = f"{rss / 1e6:.1f} MB" if rss is not None else "n/d"
+        print(f"{nome:<28}{retido / 1e6:>13.1f} MB{rss_txt:>14}{retido / tamanho_base:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+=============================================================================
+BENCHMARK — PICOS DE DEMANDA (1/3/5/10 min): somas acumuladas vs. rolling
+=============================================================================
+Compara, na mesma base processada, o cálculo dos recordes por atleta:
+  rolling        : sort + groupby(atleta, jogo, período).rolling(N).sum() por janela
+                   (o que o _calcular_recordes fazia, só para 5 min)
+  somas acum.    : data_loader._calcular_recordes (uma passagem NumPy para todas as janelas)
+Confere que os dois dão o mesmo máximo em todas as métricas e janelas.
+
+Uso: python Benchmarks/benchmark_picos.py [--jogos 40] [--atletas 18] [--repeticoes 3]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import numpy as np
+from dados_sinteticos import gerar_base_bruta
+from Source.Dados.data_loader import _processar_bruto, _calcular_recordes, MAPA_RECORDES, CHAVE_BLOCO, JANELAS_PICO, coluna_pico
+
+def cronometrar(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def recordes_rolling(df_proc, janela):
+    cols = [c for c in MAPA_RECORDES if c in df_proc.columns]
+    df_sorted = df_proc.sort_values(by=['Name', 'Data', 'Período', 'Min_Num'])
+    df_rolling = df_sorted.groupby(CHAVE_BLOCO, observed=True)[cols].rolling(window=janela, min_periods=1).sum().reset_index(drop=True)
+    df_rolling['Name'] = df_sorted['Name'].values
+    return df_rolling.groupby('Name', observed=True)[cols].max()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jogos', type=int, default=40)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    df = _processar_bruto(gerar_base_bruta(args.jogos, args.atletas))
+    print(f"Base: {len(df)} linhas, {len(MAPA_RECORDES)} métricas\n")
+
+    print(f"{'Janela (melhor de N)':<24}{'rolling':>12}")
+    t_rolling = 0.0
+    referencias = {}
+    for janela in JANELAS_PICO:
+        t, referencias[janela] = cronometrar(lambda: recordes_rolling(df, janela), args.repeticoes)
+        t_rolling += t
+        print(f"{f'{janela} min':<24}{t * 1e3:>9.1f} ms")
+    t_picos, df_recordes = cronometrar(lambda: _calcular_recordes(df), args.repeticoes)
+
+    df_recordes = df_recordes.set_index('Name')
+    for janela, ref in referencias.items():
+        for col in ref.columns:
+            np.testing.assert_allclose(df_recordes.loc[ref.index, coluna_pico(col, janela)], ref[col], rtol=1e-5)
+
+    print(f"\n{'Todas as janelas':<24}{'tempo':>12}{'ganho':>9}")
+    print(f"{'rolling (4 passagens)':<24}{t_rolling * 1e3:>9.1f} ms{1.0:>8.1f}x")
+    print(f"{'somas acumuladas':<24}{t_picos * 1e3:>9.1f} ms{t_rolling / t_picos:>8.1f}x")
+    print("\n✅ Mesmos recordes em todas as métricas e janelas")
+
+if __name__ == "__main__":
+    main()
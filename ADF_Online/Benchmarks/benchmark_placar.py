@@ -0,0 +1,62 @@
+"""
+=============================================================================
+BENCHMARK — CONTEXTO DO PLACAR (Diff_Gols / Resultado)
+=============================================================================
+ANTES : Series.apply(extrair_diff_gols) por linha + lambda do Resultado
+        (que chamava extrair_diff_gols mais duas vezes por linha).
+DEPOIS: contexto_placar — cada Placar distinto é interpretado uma vez e o
+        resultado volta às linhas pelos códigos do factorize.
+
+Uso: python Benchmarks/benchmark_placar.py [--linhas 1000000]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import numpy as np
+import pandas as pd
+from dados_sinteticos import gerar_base_bruta
+from Source.Dados.data_loader import extrair_diff_gols, contexto_placar
+
+def caminho_antigo(placar):
+    diff_gols = placar.apply(extrair_diff_gols)
+    resultado = placar.apply(
+        lambda p: 'V' if extrair_diff_gols(p) == 1
+                else ('D' if extrair_diff_gols(p) == -1 else 'E')
+    )
+    return diff_gols, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Placares reais da base sintética, repetidos até ao número de linhas pedido (com alguns vazios)
+    amostra = gerar_base_bruta(10, 18)['Placar'].to_numpy(dtype=object)
+    placar = pd.Series(np.resize(amostra, args.linhas), dtype=object)
+    placar.iloc[::997] = np.nan
+    print(f"{len(placar)} linhas, {placar.nunique()} placares distintos\n")
+
+    inicio = time.perf_counter()
+    diff_antigo, resultado_antigo = caminho_antigo(placar)
+    t_antigo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    diff_novo, resultado_novo = contexto_placar(placar)
+    t_novo = time.perf_counter() - inicio
+
+    assert (diff_antigo.to_numpy() == diff_novo).all(), "Diff_Gols diverge do caminho antigo"
+    assert (resultado_antigo.to_numpy() == resultado_novo).all(), "Resultado diverge do caminho antigo"
+
+    print(f"{'ANTES (apply por linha)':<28}{t_antigo * 1e3:>10.1f} ms")
+    print(f"{'DEPOIS (valores únicos)':<28}{t_novo * 1e3:>10.1f} ms   {t_antigo / t_novo:.0f}x mais rápido")
+
+if __name__ == "__main__":
+    main()
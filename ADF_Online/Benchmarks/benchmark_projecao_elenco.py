@@ -0,0 +1,104 @@
+"""
+=============================================================================
+BENCHMARK — PROJEÇÃO DO ELENCO: um atleta de cada vez vs. um predict por modelo
+=============================================================================
+Projeta todos os atletas de um jogo/período, nas seis métricas do METRICAS_PROJECAO,
+até ao fim do tempo regulamentar:
+  por atleta : executar_ml_ao_vivo para cada atleta × métrica (um DataFrame de
+               uma linha e um predict por chamada, como o Live Tracker faz hoje)
+  elenco     : ml_engine.projetar_elenco (jogo pelo índice de blocos, um lookup nas
+               features e nas curvas por minuto e uma matriz n_atletas × n_features por modelo)
+As duas vias recebem as tabelas que a ingestão publica (índice, features, curvas),
+calculadas uma vez fora da medição. Confere que as projeções, faixas e deltas coincidem.
+Usa os modelos do manifesto em Models/ (treinados pelo Source/ML/predictive.py).
+
+Uso: python Benchmarks/benchmark_projecao_elenco.py [--jogos 20] [--atletas 18] [--periodo 1] [--minuto 30]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+from dados_sinteticos import gerar_base_bruta
+import Source.Dados.config as config
+from Source.Dados.data_loader import _processar_bruto, construir_indice_blocos
+from Source.ML.features_historicas import construir_features_historicas, construir_curvas_minuto
+from Source.ML.ml_engine import executar_ml_ao_vivo, projetar_elenco
+
+# Campo do executar_ml_ao_vivo -> coluna do projetar_elenco
+CAMPOS = {
+    'carga_projetada': 'Projetado', 'delta_alvo_pct': 'Delta_Hist_pct',
+    'delta_projetado_pct': 'Delta_Proj_pct', 'delta_atleta_vs_time': 'Delta_Equipe_pct',
+}
+
+def por_atleta(df, jogo, periodo, minuto, publicadas):
+    """{(atleta, métrica): resultado do executar_ml_ao_vivo}, fatiando a base como o Live Tracker."""
+    minuto_final = 45 if periodo == 1 else 50
+    resultados = {}
+    df_periodo = df[df['Período'] == periodo]
+    for nome in df_periodo.loc[df_periodo['Data'] == jogo, 'Name'].unique():
+        df_atleta = df_periodo[df_periodo['Name'] == nome]
+        for metrica in config.METRICAS_PROJECAO:
+            cfg = config.METRICAS_CONFIG[metrica]
+            df_historico = df_atleta[df_atleta['Data'] != jogo].dropna(subset=[cfg['coluna_acumulada']]).copy()
+            df_atual = df_atleta[(df_atleta['Data'] == jogo) & (df_atleta['Interval'] <= minuto)]
+            resultados[(str(nome), metrica)] = executar_ml_ao_vivo(
+                df_historico, df_atual, df, cfg['coluna_distancia'], cfg['coluna_acumulada'], 'Interval', 'Data',
+                jogo, periodo, minuto_final, metrica, nome, DIRETORIO_ATUAL, publicadas['df_features'],
+                indice=publicadas['indice'], curvas_minuto=publicadas['curvas_minuto'],
+            )
+    return resultados
+
+def cronometrar(funcao, repeticoes, *args):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jogos', type=int, default=20)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--periodo', type=int, default=1)
+    parser.add_argument('--minuto', type=int, default=30)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    df = _processar_bruto(gerar_base_bruta(args.jogos, args.atletas))
+    jogo = df['Data'].dropna().max()
+    # O que a ingestão publica uma vez por versão dos dados
+    publicadas = {
+        'indice': construir_indice_blocos(df), 'df_features': construir_features_historicas(df),
+        'curvas_minuto': construir_curvas_minuto(df),
+    }
+    elenco = lambda: projetar_elenco(df, jogo, args.periodo, args.minuto, **publicadas)
+    elenco() # Carrega os modelos no registro fora da medição
+
+    t_atleta, resultados = cronometrar(por_atleta, args.repeticoes, df, jogo, args.periodo, args.minuto, publicadas)
+    t_elenco, df_elenco = cronometrar(elenco, args.repeticoes)
+
+    erro_max = 0.0
+    for linha in df_elenco.itertuples(index=False):
+        ml = resultados[(linha.Name, linha.Métrica)]
+        assert ml['modelo_usado'] == linha.Modelo, (ml['modelo_usado'], linha.Modelo)
+        for campo, coluna in CAMPOS.items():
+            erro_max = max(erro_max, abs(ml[campo] - getattr(linha, coluna)) / max(abs(ml[campo]), 1))
+    assert erro_max < 1e-4, f"Projeções diferentes (erro relativo {erro_max:.2e})"
+
+    n_atletas = df_elenco['Name'].nunique()
+    print(f"{n_atletas} atletas × {df_elenco['Métrica'].nunique()} métricas · {args.periodo}º T, minuto {args.minuto} · base com {len(df)} linhas\n")
+    print(f"{'Via (melhor de N)':<22}{'total':>10}{'por atleta':>13}{'ganho':>9}")
+    print(f"{'por atleta':<22}{t_atleta * 1e3:>7.0f} ms{t_atleta / n_atletas * 1e3:>10.1f} ms{1.0:>8.1f}x")
+    print(f"{'elenco':<22}{t_elenco * 1e3:>7.0f} ms{t_elenco / n_atletas * 1e3:>10.1f} ms{t_atleta / t_elenco:>8.1f}x")
+    print(f"\nMaior diferença relativa entre as vias: {erro_max:.1e} (arredondamento float32)")
+
+if __name__ == "__main__":
+    main()
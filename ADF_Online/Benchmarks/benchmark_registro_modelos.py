@@ -0,0 +1,70 @@
+"""
+=============================================================================
+BENCHMARK — MODELOS DO LIVE TRACKER: ler a cada chamada vs. registro em memória
+=============================================================================
+Simula o Live Tracker: a cada tick, cada sessão pede os modelos das seis abas
+(METRICAS_PROJECAO) de um período.
+  ler por chamada : lê o modelo do disco em todos os pedidos (o que o
+                    carregar_modelo_treinado fazia com os .pkl)
+  registro        : Source/ML/registro_modelos (uma carga por ficheiro; depois só um os.stat)
+Usa os modelos do manifesto em Models/ (treinados pelo Source/ML/predictive.py).
+
+Uso: python Benchmarks/benchmark_registro_modelos.py [--ticks 20] [--sessoes 3] [--periodo 1]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+RAIZ_PROJETO = os.path.abspath(os.path.join(DIRETORIO_ATUAL, '..'))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.append(RAIZ_PROJETO)
+
+import Source.Dados.config as config
+from Source.ML.registro_modelos import RegistroModelos, ESTATISTICAS_MODELOS, ler_manifesto_modelos, chave_modelo, _carregador_modelo
+
+def modelos_das_abas(periodo):
+    """(caminho, entrada do manifesto) dos modelos das seis abas do Live Tracker."""
+    entradas = ler_manifesto_modelos().get('modelos', {})
+    sufixos = [config.METRICAS_CONFIG[m]['modelo'] for m in config.METRICAS_PROJECAO]
+    return [
+        (os.path.join(config.DIRETORIO_MODELOS, entradas[chave]['arquivo']), entradas[chave])
+        for chave in (chave_modelo(s, periodo) for s in sufixos) if chave in entradas
+    ]
+
+def simular(obter, modelos, ticks, sessoes):
+    inicio = time.perf_counter()
+    for _ in range(ticks * sessoes):
+        for caminho, entrada in modelos:
+            obter(caminho, entrada)
+    return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticks', type=int, default=20)
+    parser.add_argument('--sessoes', type=int, default=3)
+    parser.add_argument('--periodo', type=int, default=1)
+    args = parser.parse_args()
+
+    modelos = modelos_das_abas(args.periodo)
+    if not modelos:
+        print(f"Nenhum modelo em {config.DIRETORIO_MODELOS}: rode o Source/ML/predictive.py")
+        return
+    pedidos = args.ticks * args.sessoes * len(modelos)
+    print(f"{len(modelos)} modelos × {args.ticks} ticks × {args.sessoes} sessões = {pedidos} pedidos\n")
+
+    t_disco = simular(lambda caminho, entrada: _carregador_modelo(entrada)(caminho), modelos, args.ticks, args.sessoes)
+    registro = RegistroModelos()
+    t_registro = simular(lambda caminho, entrada: registro.obter(caminho, carregar=_carregador_modelo(entrada)), modelos, args.ticks, args.sessoes)
+
+    print(f"{'Estratégia':<22}{'total':>10}{'por tick':>12}{'ganho':>9}")
+    print(f"{'ler por chamada':<22}{t_disco:>9.2f}s{t_disco / (args.ticks * args.sessoes) * 1e3:>9.1f} ms{1.0:>8.1f}x")
+    print(f"{'registro':<22}{t_registro:>9.2f}s{t_registro / (args.ticks * args.sessoes) * 1e3:>9.1f} ms{t_disco / t_registro:>8.1f}x")
+    print(f"\nCargas: {ESTATISTICAS_MODELOS['cargas']} ({ESTATISTICAS_MODELOS['segundos_total_carga'] * 1e3:.0f} ms) · "
+          f"acertos: {ESTATISTICAS_MODELOS['acertos']} · em memória: {ESTATISTICAS_MODELOS['megabytes']:.1f} MB")
+
+if __name__ == "__main__":
+    main()
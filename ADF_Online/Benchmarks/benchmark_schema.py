@@ -0,0 +1,70 @@
+"""
+=============================================================================
+BENCHMARK — ESQUEMA COMPACTO (categorias + float32) vs. object/float64
+=============================================================================
+Processa uma base sintética de várias temporadas com e sem o esquema do
+config (SCHEMA_*) e compara memória e tempo dos agrupamentos usados nas páginas.
+
+Uso: python Benchmarks/benchmark_schema.py [--temporadas 3] [--atletas 25] [--repeticoes 5]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import pandas as pd
+from dados_sinteticos import gerar_base_bruta
+from Source.Dados.data_loader import _transformar_linhas, _juntar_geo, construir_tabela_geo, _aplicar_schema
+
+JOGOS_POR_TEMPORADA = 60
+METRICAS = ['Total Distance', 'HIA', 'V5 Dist', 'Player Load']
+
+# Agrupamentos equivalentes aos da Home, Temporada e Relatório HIA
+AGRUPAMENTOS = {
+    'Name × Data (soma)': lambda df: df.groupby(['Name', 'Data'], observed=True)[METRICAS].sum(),
+    'Data_Display × Competição × Name': lambda df: df.groupby(['Data_Display', 'Competição', 'Name'], observed=True)[METRICAS].sum(),
+    'Placar (média HIA)': lambda df: df.groupby('Placar', observed=True)['HIA'].mean(),
+    'Interval × Name (jogo)': lambda df: df[df['Data'] == df['Data'].iloc[0]].groupby(['Interval', 'Name'], observed=True)['HIA'].sum(),
+}
+
+def cronometrar(funcao, df, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(df)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--temporadas', type=int, default=3)
+    parser.add_argument('--atletas', type=int, default=25)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    df_bruto = gerar_base_bruta(JOGOS_POR_TEMPORADA * args.temporadas, args.atletas)
+    df_antigo = _juntar_geo(_transformar_linhas(df_bruto), construir_tabela_geo(df_bruto))
+    inicio = time.perf_counter()
+    df_novo = _aplicar_schema(df_antigo.copy())
+    tempo_schema = time.perf_counter() - inicio
+
+    mem_antigo = df_antigo.memory_usage(deep=True).sum()
+    mem_novo = df_novo.memory_usage(deep=True).sum()
+    print(f"Base: {len(df_antigo)} linhas ({args.temporadas} temporadas) | esquema aplicado em {tempo_schema:.2f}s\n")
+    print(f"{'Memória':<36}{'object/float64':>16}{'esquema':>12}{'ganho':>9}")
+    print(f"{'Total (deep)':<36}{mem_antigo / 1e6:>13.1f} MB{mem_novo / 1e6:>9.1f} MB{mem_antigo / mem_novo:>8.1f}x\n")
+
+    print(f"{'Agrupamento (melhor de N)':<36}{'object/float64':>16}{'esquema':>12}{'ganho':>9}")
+    for nome, funcao in AGRUPAMENTOS.items():
+        t_antigo = cronometrar(funcao, df_antigo, args.repeticoes)
+        t_novo = cronometrar(funcao, df_novo, args.repeticoes)
+        print(f"{nome:<36}{t_antigo * 1e3:>13.1f} ms{t_novo * 1e3:>9.1f} ms{t_antigo / t_novo:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+=============================================================================
+BENCHMARK — TREINO DOS MODELOS: jobs em sequência vs. pool de processos
+=============================================================================
+Gera uma base sintética, monta os snapshots do Source/ML/predictive.py e treina
+os jobs métrica × período em pastas temporárias:
+  sequencial : um processo com todas as threads (como o script antigo, job a job)
+  pool       : um processo por job até ao nº de núcleos, threads = núcleos / processos
+  retomada   : o pool de novo na mesma pasta (todos os modelos já atuais: nada treina)
+Confere que as duas vias gravam modelos com as mesmas previsões.
+
+Uso: python Benchmarks/benchmark_treino_paralelo.py [--jogos 30] [--metricas Dist_Total V5_Dist] [--processos N]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+from dados_sinteticos import gerar_base_bruta
+import numpy as np
+from Source.Dados.data_loader import _processar_bruto
+from Source.ML.features_historicas import MAPA_METRICAS
+from Source.ML.predictive import preparar_snapshots, treinar_modelos
+from Source.ML.registro_modelos import ler_manifesto_modelos, _carregador_modelo
+
+def medir(rotulo, **kwargs):
+    inicio = time.perf_counter()
+    resumo = treinar_modelos(**kwargs)
+    return rotulo, time.perf_counter() - inicio, resumo
+
+def previsoes(diretorio, df_snapshots):
+    """Previsões de cada modelo gravado em `diretorio` sobre as primeiras linhas dos snapshots."""
+    saida = {}
+    for chave, entrada in ler_manifesto_modelos(diretorio)['modelos'].items():
+        modelo = _carregador_modelo(entrada)(os.path.join(diretorio, entrada['arquivo']))['modelo']
+        saida[chave] = modelo.inplace_predict(df_snapshots[entrada['features']].head(2000).to_numpy())
+    return saida
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jogos', type=int, default=30)
+    parser.add_argument('--metricas', nargs='+', choices=list(MAPA_METRICAS), default=list(MAPA_METRICAS))
+    parser.add_argument('--processos', type=int)
+    args = parser.parse_args()
+
+    df = _processar_bruto(gerar_base_bruta(args.jogos))
+    df_snapshots, versao = preparar_snapshots(df)
+    nucleos = os.cpu_count() or 1
+    print(f"\n{len(df_snapshots)} snapshots, {len(args.metricas) * 2} jobs, {nucleos} núcleo(s)")
+
+    with tempfile.TemporaryDirectory() as pasta_seq, tempfile.TemporaryDirectory() as pasta_pool:
+        comum = dict(df_snapshots=df_snapshots, versao_dados=versao, metricas=args.metricas)
+        medicoes = [
+            medir("sequencial", diretorio=pasta_seq, processos=1, threads=nucleos, **comum),
+            medir("pool", diretorio=pasta_pool, processos=args.processos, **comum),
+            medir("retomada", diretorio=pasta_pool, processos=args.processos, **comum),
+        ]
+        seq, pool = previsoes(pasta_seq, df_snapshots), previsoes(pasta_pool, df_snapshots)
+        assert seq.keys() == pool.keys()
+        diferenca = max(np.max(np.abs(seq[k] - pool[k])) for k in seq)
+
+    print(f"\n{'Via':<12} {'Relógio':>10} {'Soma jobs':>10} {'Treinados':>10} {'ganho':>7}")
+    base = medicoes[0][1]
+    for rotulo, segundos, resumo in medicoes:
+        treinados = int((resumo['Estado'] == 'treinado').sum())
+        print(f"{rotulo:<12} {segundos:>9.2f}s {resumo['Segundos'].sum():>9.2f}s {treinados:>10} {base / segundos:>6.1f}x")
+    print(f"\nMaior diferença entre as previsões sequencial × pool: {diferenca:.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+=============================================================================
+DADOS SINTÉTICOS PARA BENCHMARKS
+=============================================================================
+Gera um DataFrame com o mesmo formato do Excel bruto (config.COLUNAS_NECESSARIAS):
+uma linha por atleta/minuto/período, jogos alternando casa e fora.
+Serve para medir o pipeline sem depender do workbook real.
+=============================================================================
+"""
+
+import os
+import sys
+
+# ---------------------------------------------------------------------
+# HACK DE DIRETÓRIO: Garante que o Python encontre a pasta 'Source'
+# ---------------------------------------------------------------------
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+RAIZ_PROJETO = os.path.abspath(os.path.join(DIRETORIO_ATUAL, '..'))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.append(RAIZ_PROJETO)
+# ---------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+PLACARES = ['Empatando', 'Ganhando 1', 'Perdendo 1', 'Ganhando 2', 'Perdendo 2']
+MINUTOS_POR_PERIODO = {1: 45, 2: 50}
+
+def gerar_base_bruta(n_jogos=30, n_atletas=18, seed=0):
+    """Base bruta com n_jogos × n_atletas × 95 minutos (≈ 51 mil linhas com os valores padrão)."""
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range('2024-01-10', periods=n_jogos, freq='4D')
+    nomes = np.array([f'Atleta {i:02d}' for i in range(n_atletas)])
+
+    # Grelha jogo × período × atleta × minuto
+    blocos = []
+    for periodo, minutos in MINUTOS_POR_PERIODO.items():
+        jogo, atleta, minuto = np.meshgrid(
+            np.arange(n_jogos), np.arange(n_atletas), np.arange(1, minutos + 1), indexing='ij'
+        )
+        blocos.append(pd.DataFrame({
+            'jogo': jogo.ravel(), 'atleta': atleta.ravel(), 'Interval': minuto.ravel(), 'Período': periodo,
+        }))
+    grelha = pd.concat(blocos, ignore_index=True).sort_values(['jogo', 'Período', 'atleta', 'Interval'], ignore_index=True)
+    n = len(grelha)
+    jogo = grelha['jogo'].to_numpy()
+    casa = jogo % 2 == 0
+
+    df = pd.DataFrame({
+        'Name': nomes[grelha['atleta'].to_numpy()],
+        'Data': datas[jogo],
+        'Interval': grelha['Interval'].to_numpy(),
+        'Período': grelha['Período'].to_numpy(),
+        'Placar': np.array(PLACARES)[(grelha['Interval'].to_numpy() // 15 + jogo) % len(PLACARES)],
+        'Resultado': np.array(['V', 'E', 'D'])[jogo % 3],
+        'Adversário': np.char.add('Adversário ', (jogo % 20).astype(str)),
+        'Total Distance': rng.gamma(5, 20, n),
+        'V4 Dist': rng.gamma(1, 5, n),
+        'V5 Dist': rng.gamma(1, 2, n),
+        'V4 To8 Eff': rng.poisson(1, n),
+        'V5 To8 Eff': rng.poisson(0.5, n),
+        'V6 To8 Eff': rng.poisson(0.2, n),
+        'Acc3 Eff': rng.poisson(1, n),
+        'Dec3 Eff': rng.poisson(1, n),
+        'Player Load': rng.gamma(5, 2, n),
+        'Parte (15 min)': '0-15', 'Parte (5 min)': '0-5', 'Parte (3 min)': '0-3',
+        'Competição': np.char.add('Campeonato ', (jogo % 3).astype(str)),
+        'Metabolic Power': rng.gamma(5, 2, n),
+        # Coordenadas como texto com vírgula decimal, tal como chegam do Excel
+        'Latitude': np.where(casa, '-26,948597', '-23,550520'),
+        'Longitude': np.where(casa, '-48,674744', '-46,633308'),
+    })
+    return df
+
+if __name__ == "__main__":
+    df = gerar_base_bruta()
+    print(df.head())
+    print(f"{len(df)} linhas, {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
@@ -0,0 +1,227 @@
+"""
+=============================================================================
+PARIDADE DAS FEATURES — treino vs. inferência ao vivo (features_historicas)
+=============================================================================
+Confere, na base sintética, que os três caminhos produzem os mesmos vetores:
+  treino anterior : as transformações que o predictive.py fazia sobre o cubo
+                    (expanding/rolling por atleta × período), como referência
+  treino          : montar_vetores sobre todas as linhas (o predictive.py de agora)
+  ao vivo         : ml_engine.features_ao_vivo (um atleta) e montar_features_elenco
+                    (elenco), no minuto de corte de vários jogos/períodos
+Mostra também em quantas amostras as features que o executar_ml_ao_vivo calculava
+antes (somas brutas de todos os outros jogos, inclusive posteriores) diferiam das
+do treino, e o custo por chamada do cálculo antigo (groupbys) face ao lookup.
+Com duas temporadas (a primeira arquivada em partições numa pasta temporária),
+confere que a tabela publicada pela ingestão (construir_derivados, só a temporada
+atual em memória) é igual à do treino sobre a base completa nas chaves da atual.
+
+Uso: python Benchmarks/paridade_features.py [--jogos 20] [--atletas 18] [--amostras 40]
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import numpy as np
+import pandas as pd
+from dados_sinteticos import gerar_base_bruta
+import Source.Dados.config as config
+from Source.Dados.data_loader import (
+    _processar_bruto, construir_cubo_jogos, concatenar_bases, ordenar_base, carregar_temporadas,
+    listar_temporadas_arquivadas, CHAVE_CUBO,
+)
+import Source.Dados.particoes as particoes
+from Source.Dados.ingestao import construir_derivados
+from Source.Dados.positions import get_position
+from Source.ML.features_historicas import MAPA_METRICAS, POSICAO_ENCODE, construir_features_historicas, montar_vetores
+from Source.ML.ml_engine import features_ao_vivo, montar_features_elenco
+
+def features_modelo(metric_target, periodo):
+    """Lista de features do modelo metric_target/período (a mesma ordem do predictive.py)."""
+    features = [
+        'Min_Num', 'Dias_Descanso', 'N_Jogos', 'Carga_3Jogos_PL', 'Diff_Gols', 'Jogou_em_Casa',
+        f'{metric_target}_Acumulado_Agora', 'Posicao_encoded', 'Minutagem_Temporada',
+        f'Ritmo_{metric_target}', f'Media_Geral_{metric_target}', f'Trend_{metric_target}',
+    ]
+    return features + [f'Total_T1_{metric_target}'] if periodo == 2 else features
+
+TODAS_FEATURES = list(dict.fromkeys(f for mt in MAPA_METRICAS for p in (1, 2) for f in features_modelo(mt, p)))
+
+def treino_anterior(df):
+    """Snapshots de treino como o predictive.py os montava antes da tabela de features (referência)."""
+    df = df.copy()
+    df_min_temporada = (
+        df.groupby(['Name', 'Data', 'Período'], observed=True)['Interval'].max().reset_index().rename(columns={'Interval': '_min_jogo'})
+    )
+    df_min_temporada = df_min_temporada.sort_values(['Name', 'Data'])
+    df_min_temporada['Minutagem_Temporada'] = (
+        df_min_temporada.groupby('Name', observed=True)['_min_jogo'].transform(lambda x: x.expanding().sum().shift(1).fillna(0))
+    )
+    df = df.merge(df_min_temporada.drop(columns='_min_jogo'), on=['Name', 'Data', 'Período'], how='left')
+    df['Minutagem_Temporada'] = df['Minutagem_Temporada'].fillna(0)
+    df['Posicao_encoded'] = df['Name'].map(lambda n: POSICAO_ENCODE.get(get_position(n), -1)).astype('int8')
+
+    df_jogos = construir_cubo_jogos(df)[CHAVE_CUBO + list(MAPA_METRICAS.values()) + ['Minutos', 'Jogou_em_Casa']]
+    df_jogos = df_jogos.rename(columns={'Minutos': 'Minutos_Jogados'})
+    datas_unicas = df_jogos[['Name', 'Data']].drop_duplicates().sort_values(['Name', 'Data'])
+    datas_unicas['Dias_Descanso'] = datas_unicas.groupby('Name', observed=True)['Data'].diff().dt.days.fillna(7).clip(1, 30)
+    df_jogos = df_jogos.merge(datas_unicas, on=['Name', 'Data'], how='left')
+    df_jogos['Min_Divisor'] = df_jogos['Minutos_Jogados'].clip(lower=10)
+    df_jogos['Min_Periodo'] = np.where(df_jogos['Período'] == 1, 45, 50)
+    cols_target = []
+    for metric_target, metric_base in MAPA_METRICAS.items():
+        nome_target = f'TARGET_{metric_target}'
+        df_jogos[nome_target] = (df_jogos[metric_base] / df_jogos['Min_Divisor']) * df_jogos['Min_Periodo']
+        cols_target.append(nome_target)
+        df_jogos[f'Media_Geral_{metric_target}'] = df_jogos.groupby(['Name', 'Período'], observed=True)[nome_target].transform(lambda x: x.expanding().mean().shift(1))
+        df_jogos[f'Media_3J_{metric_target}'] = df_jogos.groupby(['Name', 'Período'], observed=True)[nome_target].transform(lambda x: x.rolling(3, min_periods=1).mean().shift(1))
+        df_jogos[f'Trend_{metric_target}'] = df_jogos[f'Media_3J_{metric_target}'] / (df_jogos[f'Media_Geral_{metric_target}'] + 1)
+    df_jogos['Carga_3Jogos_PL'] = df_jogos.groupby(['Name', 'Período'], observed=True)['Player Load'].transform(lambda x: x.rolling(3, min_periods=1).sum().shift(1))
+    df_jogos['N_Jogos'] = df_jogos.groupby(['Name', 'Período'], observed=True).cumcount()
+    # fillna(0) no frame inteiro falha com Name em category (esquema compacto): só nas colunas numéricas
+    df_jogos = df_jogos.fillna({c: 0 for c in df_jogos.select_dtypes('number').columns})
+
+    renames_t1 = {metric_base: f'Total_T1_{metric_target}' for metric_target, metric_base in MAPA_METRICAS.items()}
+    df_t1 = df_jogos[df_jogos['Período'] == 1][['Name', 'Data'] + list(renames_t1)].rename(columns=renames_t1)
+    cols_historico = ['Name', 'Data', 'Período', 'Dias_Descanso', 'Carga_3Jogos_PL', 'N_Jogos'] + \
+                     [c for c in df_jogos.columns if 'Media_Geral_' in c or 'Trend_' in c] + cols_target
+    for metric_target, metric_base in MAPA_METRICAS.items():
+        df[f'{metric_target}_Acumulado_Agora'] = df[config.COLUNAS_ACUMULADAS[metric_base]]
+        df[f'Ritmo_{metric_target}'] = df[config.COLUNAS_RITMO[metric_base]]
+    df_snapshots = df.merge(df_jogos[cols_historico], on=['Name', 'Data', 'Período'], how='left')
+    df_snapshots = df_snapshots.merge(df_t1, on=['Name', 'Data'], how='left')
+    for metric_target in MAPA_METRICAS:
+        df_snapshots[f'Total_T1_{metric_target}'] = df_snapshots[f'Total_T1_{metric_target}'].fillna(0)
+    return df_snapshots
+
+def ao_vivo_anterior(df, nome, jogo, periodo, minuto, coluna):
+    """Features históricas como o executar_ml_ao_vivo as calculava antes, numa métrica (referência)."""
+    df_atleta = df[(df['Name'] == nome) & (df['Período'] == periodo)]
+    df_historico = df_atleta[df_atleta['Data'] != jogo]
+    por_jogo = df_historico.groupby('Data', observed=True)[coluna].sum()
+    media = por_jogo.mean()
+    datas = [d for d in sorted(df_historico['Data'].unique()) if d < jogo]
+    df_t1 = df[(df['Name'] == nome) & (df['Data'] == jogo) & (df['Período'] == 1)]
+    return {
+        'Dias_Descanso': min((jogo - max(datas)).days, 30) if datas else 7,
+        'N_Jogos': df_historico['Data'].nunique(),
+        'Carga_3Jogos_PL': df_historico.groupby('Data', observed=True)['Player Load'].sum().tail(3).sum(),
+        'Minutagem_Temporada': df_historico.groupby('Data', observed=True)['Interval'].max().sum(),
+        'Media_Geral': media,
+        'Trend': por_jogo.tail(3).mean() / (media + 1) if media > 0 else 1.0,
+        'Total_T1': df_t1[coluna].sum() if periodo == 2 else 0,
+    }
+
+def paridade_temporadas(n_jogos, n_atletas):
+    """
+    Primeira metade dos jogos recuada um ano (temporada anterior, arquivada como na ingestão).
+    Devolve a tabela publicada, a do treino nas mesmas chaves e a que sairia só da temporada atual.
+    """
+    bruto = gerar_base_bruta(n_jogos, n_atletas)
+    datas = bruto['Data'].drop_duplicates().sort_values()
+    anteriores = bruto['Data'].isin(datas.iloc[:len(datas) // 2])
+    bruto.loc[anteriores, 'Data'] = bruto.loc[anteriores, 'Data'] - pd.DateOffset(years=1)
+    df = _processar_bruto(bruto)
+    temporada = particoes.temporada_de(df['Data'])
+    df_atual = ordenar_base(df[temporada == temporada.max()].reset_index(drop=True))
+
+    diretorio_original = config.DIRETORIO_PARTICOES
+    with tempfile.TemporaryDirectory() as pasta:
+        config.DIRETORIO_PARTICOES = pasta
+        try:
+            particoes.gravar_jogos(df[temporada < temporada.max()], {}, {})
+            # Treino: a base do carregar_base_completa (temporadas arquivadas + atual)
+            df_antigo, _ = carregar_temporadas(listar_temporadas_arquivadas())
+            treino = construir_features_historicas(ordenar_base(concatenar_bases([df_antigo, df_atual])))
+            publicada = construir_derivados(df_atual)['features']
+            inicio = time.perf_counter()
+            construir_derivados(df_atual) # Cubo do arquivo já em cache: custo por versão publicada
+            segundos = time.perf_counter() - inicio
+        finally:
+            config.DIRETORIO_PARTICOES = diretorio_original
+    esperada = treino[treino.index.get_level_values('Data').isin(publicada.index.get_level_values('Data'))]
+    return publicada, esperada, construir_features_historicas(df_atual), segundos
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jogos', type=int, default=20)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--amostras', type=int, default=40, help="Atletas × jogos × períodos sorteados para o caminho ao vivo")
+    args = parser.parse_args()
+
+    df = _processar_bruto(gerar_base_bruta(args.jogos, args.atletas))
+    inicio = time.perf_counter()
+    df_features = construir_features_historicas(df)
+    t_tabela = time.perf_counter() - inicio
+    print(f"Base: {len(df)} linhas · tabela de features: {len(df_features)} linhas × {df_features.shape[1]} colunas em {t_tabela * 1e3:.0f} ms\n")
+
+    # 1. Treino: tabela de features vs. transformações anteriores do predictive.py
+    referencia = treino_anterior(df)
+    treino = montar_vetores(df, df_features)
+    diferenca = np.abs(treino[TODAS_FEATURES].to_numpy(np.float64) - referencia[TODAS_FEATURES].to_numpy(np.float64))
+    escala = np.maximum(np.abs(referencia[TODAS_FEATURES].to_numpy(np.float64)), 1)
+    erro_treino = (diferenca / escala).max(axis=0)
+    alvos = [f'TARGET_{mt}' for mt in MAPA_METRICAS]
+    erro_alvos = np.abs(treino[alvos].to_numpy(np.float64) - referencia[alvos].to_numpy(np.float64)).max()
+    assert erro_treino.max() < 1e-9 and erro_alvos < 1e-9, dict(zip(TODAS_FEATURES, erro_treino))
+    print(f"✅ Treino: {len(treino)} vetores iguais à referência (maior erro relativo {erro_treino.max():.1e})")
+
+    # 2. Ao vivo: cada vetor tem de ser a linha do treino do mesmo atleta/jogo/período/minuto
+    rng = np.random.default_rng(0)
+    chaves = df[CHAVE_CUBO].drop_duplicates().to_numpy()
+    chaves = chaves[rng.choice(len(chaves), min(args.amostras, len(chaves)), replace=False)]
+    treino_por_linha = treino.set_index(pd.MultiIndex.from_arrays([df['Name'].astype(str), df['Data'], df['Período'], df['Interval']]))
+    t_antigo, t_lookup, desvios = 0.0, 0.0, {}
+    for nome, jogo, periodo in chaves:
+        df_jogo = df[(df['Name'] == nome) & (df['Data'] == jogo) & (df['Período'] == periodo)]
+        minuto = int(rng.integers(1, df_jogo['Interval'].max() + 1))
+        df_atual = df_jogo[df_jogo['Interval'] <= minuto]
+        if df_atual.empty:
+            continue
+        esperado = treino_por_linha.loc[(str(nome), jogo, periodo, df_atual['Interval'].iloc[-1])]
+
+        inicio = time.perf_counter()
+        vetor = features_ao_vivo(df_atual, df_features)
+        t_lookup += time.perf_counter() - inicio
+        assert all(vetor[f] == esperado[f] for f in TODAS_FEATURES), [f for f in TODAS_FEATURES if vetor[f] != esperado[f]]
+
+        elenco = montar_features_elenco(df, jogo, periodo, minuto, df_features).loc[str(nome)]
+        assert all(elenco[f] == esperado[f] for f in TODAS_FEATURES), [f for f in TODAS_FEATURES if elenco[f] != esperado[f]]
+
+        inicio = time.perf_counter()
+        antigo = ao_vivo_anterior(df, nome, jogo, periodo, minuto, 'Total Distance')
+        t_antigo += time.perf_counter() - inicio
+        for nome_feature, valor in antigo.items():
+            if nome_feature == 'Total_T1' and periodo == 1:
+                continue # Só os modelos do 2º tempo usam a herança do 1º
+            coluna = f'{nome_feature}_Dist_Total' if nome_feature in ('Media_Geral', 'Trend', 'Total_T1') else nome_feature
+            desvios.setdefault(coluna, []).append(abs(valor - esperado[coluna]) > 1e-6 * max(abs(esperado[coluna]), 1))
+    n = len(chaves)
+    print(f"✅ Ao vivo: {n} vetores (um atleta e elenco) iguais às linhas do treino, feature a feature\n")
+
+    print(f"{'Feature (Dist_Total)':<26}{'amostras em que o cálculo ao vivo anterior diferia do treino':>62}")
+    for coluna, valores in desvios.items():
+        print(f"{coluna:<26}{np.mean(valores) * 100:>61.0f}%")
+    print(f"\n{'Features ao vivo':<22}{'por chamada':>14}{'ganho':>9}")
+    print(f"{'groupbys (antes)':<22}{t_antigo / n * 1e3:>11.2f} ms{1.0:>8.1f}x")
+    print(f"{'lookup na tabela':<22}{t_lookup / n * 1e3:>11.2f} ms{t_antigo / t_lookup:>8.1f}x")
+
+    # 3. Duas temporadas: a tabela publicada usa o cubo arquivado como histórico, como o treino
+    publicada, esperada, so_atual, segundos = paridade_temporadas(args.jogos * 2, args.atletas)
+    pd.testing.assert_frame_equal(publicada, esperada, check_exact=True)
+    print(f"\n✅ Duas temporadas: tabela publicada ({len(publicada)} chaves da temporada atual) igual à do treino "
+          f"com a base completa; construir_derivados em {segundos * 1e3:.0f} ms")
+    print(f"\n{'Feature':<26}{'chaves em que só a temporada atual diferia do treino':>54}")
+    for coluna in ['N_Jogos', 'Minutagem_Temporada', 'Carga_3Jogos_PL', 'Dias_Descanso', 'Media_Geral_Dist_Total', 'Trend_Dist_Total']:
+        diferentes = ~np.isclose(so_atual[coluna].to_numpy(np.float64), esperada[coluna].to_numpy(np.float64), rtol=1e-6)
+        print(f"{coluna:<26}{diferentes.mean() * 100:>53.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+=============================================================================
+REPLAY DO FEED GPS — substitui o fornecedor na ingestão em fluxo
+=============================================================================
+Reproduz um jogo minuto a minuto (todas as linhas de um minuto juntas), como o
+feed ao vivo faria:
+  --modo socket   : envia NDJSON para 127.0.0.1:--porta (config.PORTA_FLUXO)
+  --modo ficheiro : acrescenta NDJSON (ou CSV, se o destino terminar em .csv) ao ficheiro
+O jogo vem da base sintética ou, com --excel, do último jogo de um workbook.
+Para ver o app a receber: MODO_FLUXO = 'socket' (ou 'ficheiro') no config.py.
+
+Com --medir, sobe um FluxoGPS neste processo e mede o caminho completo:
+linhas recebidas por segundo e atraso até o frame ficar completo. Depois repete
+o jogo minuto a minuto sobre a temporada histórica e mede uma versão do fluxo
+(o que a ingestão faz a cada INTERVALO_FLUXO_S): só as linhas novas + os derivados
+do jogo, contra reprocessar o jogo inteiro e refazer os derivados da base.
+
+Uso: python Benchmarks/replay_gps.py [--modo socket] [--velocidade 10] [--excel CAMINHO] [--medir]
+=============================================================================
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import socket
+import argparse
+import tempfile
+
+DIRETORIO_ATUAL = os.path.dirname(os.path.abspath(__file__))
+if DIRETORIO_ATUAL not in sys.path:
+    sys.path.append(DIRETORIO_ATUAL)
+
+import numpy as np
+import pandas as pd
+from dados_sinteticos import gerar_base_bruta
+import Source.Dados.config as config
+from Source.Dados.fluxo_gps import FluxoGPS, ESTADO_FLUXO
+from Source.Dados.janelas_vivo import JanelasVivo
+from Source.Dados.data_loader import _processar_bruto, concatenar_bases, ordenar_base
+from Source.Dados.ingestao import construir_derivados, construir_derivados_base, juntar_derivados
+
+def ler_jogo(excel=None, jogos=20, atletas=18):
+    """(histórico bruto, último jogo bruto): do workbook indicado ou da base sintética."""
+    if excel:
+        df = pd.read_excel(excel, engine='calamine', decimal=',', usecols=lambda c: c.strip() in config.COLUNAS_NECESSARIAS)
+        df.columns = df.columns.str.strip()
+    else:
+        df = gerar_base_bruta(jogos, atletas)
+    datas = pd.to_datetime(df['Data'], errors='coerce')
+    ultimo = datas == datas.max()
+    return df[~ultimo.to_numpy()], df[ultimo.to_numpy()]
+
+def minutos_do_jogo(df_jogo):
+    """Lista de minutos; cada minuto é a lista de linhas (dicts prontos para JSON) de todos os atletas."""
+    df = df_jogo.assign(Data=pd.to_datetime(df_jogo['Data']).dt.strftime('%Y-%m-%d'))
+    df = df.astype(object).where(df.notna(), None)
+    return [grupo.to_dict(orient='records') for _, grupo in df.groupby(['Período', 'Interval'], sort=True)]
+
+def _pausa(velocidade):
+    if velocidade > 0:
+        time.sleep(1 / velocidade)
+
+def enviar_socket(minutos, porta, velocidade):
+    with socket.create_connection(('127.0.0.1', porta)) as con:
+        for linhas in minutos:
+            con.sendall(''.join(json.dumps(l, ensure_ascii=False, default=str) + '\n' for l in linhas).encode('utf-8'))
+            _pausa(velocidade)
+
+def escrever_ficheiro(minutos, caminho, velocidade):
+    csv_ = caminho.lower().endswith('.csv')
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        escritor = None
+        for linhas in minutos:
+            if csv_:
+                if escritor is None:
+                    escritor = csv.DictWriter(f, fieldnames=list(linhas[0].keys()), delimiter=';')
+                    escritor.writeheader()
+                escritor.writerows(linhas)
+            else:
+                f.write(''.join(json.dumps(l, ensure_ascii=False, default=str) + '\n' for l in linhas))
+            f.flush()
+            _pausa(velocidade)
+
+def reproduzir(minutos, modo, porta, caminho, velocidade):
+    if modo == 'socket':
+        enviar_socket(minutos, porta, velocidade)
+    else:
+        escrever_ficheiro(minutos, caminho, velocidade)
+
+def medir(df_hist_bruto, minutos, modo, porta, caminho):
+    total = sum(len(linhas) for linhas in minutos)
+    fluxo = FluxoGPS().iniciar(modo, porta=porta, caminho=caminho)
+    time.sleep(0.2)
+    inicio = time.perf_counter()
+    reproduzir(minutos, modo, porta, caminho, velocidade=0)
+    enviado = time.perf_counter()
+    while ESTADO_FLUXO['linhas'] < total and time.perf_counter() - enviado < 30:
+        time.sleep(0.001)
+    recebido = time.perf_counter()
+    fluxo.parar()
+
+    print(f"{'Modo':<28}{modo}")
+    print(f"{'Linhas enviadas/recebidas':<28}{total} / {ESTADO_FLUXO['linhas']} ({ESTADO_FLUXO['descartadas']} descartadas)")
+    print(f"{'Recebidas por segundo':<28}{ESTADO_FLUXO['linhas'] / (recebido - inicio):,.0f}")
+    print(f"{'Atraso fim do envio→frame':<28}{(recebido - enviado) * 1e3:.1f} ms")
+    print(f"{'frame() do jogo':<28}{len(fluxo.frame())} linhas")
+    medir_versoes(_processar_bruto(df_hist_bruto), minutos)
+
+def medir_versoes(df_hist, minutos):
+    """Uma versão por minuto de jogo: incremental (FluxoGPS.carregar + juntar_derivados) × tudo de novo."""
+    fluxo, janelas, base = FluxoGPS(), JanelasVivo(), (None, None)
+    incremental, completo = [], []
+    for linhas in minutos:
+        for linha in linhas:
+            fluxo.adicionar(linha)
+        t = time.perf_counter()
+        carga = fluxo.carregar(df_hist, pd.DataFrame(), janelas)
+        if base[0] is not carga.df_hist: # Como a ingestão: uma vez por versão do Excel e jogo (fica fora da mediana)
+            base = (carga.df_hist, construir_derivados_base(carga.df_hist, carga.df_jogo['Data'].iat[0]))
+            t = None
+        juntar_derivados(base[1], carga.df_jogo, carga.inicio_jogo)
+        if t is not None:
+            incremental.append(time.perf_counter() - t)
+
+        t = time.perf_counter() # O caminho anterior: o jogo inteiro pelo pipeline, a base concatenada e os derivados dela
+        vivo = _processar_bruto(fluxo.frame())
+        df = concatenar_bases([df_hist[~df_hist['Data'].isin(vivo['Data'].unique())], vivo])
+        construir_derivados(ordenar_base(df) if vivo['Data'].min() <= df_hist['Data'].max() else df)
+        completo.append(time.perf_counter() - t)
+
+    assert len(df) == len(carga.df)
+    print(f"\nVersão do fluxo por minuto (mediana de {len(incremental)}, base com {len(carga.df)} linhas)")
+    print(f"{'Só o jogo (incremental)':<28}{np.median(incremental) * 1e3:.1f} ms")
+    print(f"{'Tudo de novo':<28}{np.median(completo) * 1e3:.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modo', choices=['socket', 'ficheiro'], default='socket')
+    parser.add_argument('--porta', type=int, default=config.PORTA_FLUXO)
+    parser.add_argument('--destino', default=config.ARQUIVO_FLUXO, help="Ficheiro do modo 'ficheiro' (.ndjson ou .csv)")
+    parser.add_argument('--velocidade', type=float, default=10, help="Minutos de jogo por segundo (0 = sem pausa)")
+    parser.add_argument('--excel', default=None, help="Workbook de onde tirar o último jogo (por omissão, base sintética)")
+    parser.add_argument('--jogos', type=int, default=20)
+    parser.add_argument('--atletas', type=int, default=18)
+    parser.add_argument('--medir', action='store_true')
+    args = parser.parse_args()
+
+    df_hist_bruto, df_jogo = ler_jogo(args.excel, args.jogos, args.atletas)
+    minutos = minutos_do_jogo(df_jogo)
+    if args.medir:
+        caminho = os.path.join(tempfile.mkdtemp(prefix='replay_gps_'), os.path.basename(args.destino))
+        medir(df_hist_bruto, minutos, args.modo, args.porta, caminho)
+        return
+    print(f"▶️ A reproduzir {len(minutos)} minutos ({len(df_jogo)} linhas) via {args.modo}...")
+    reproduzir(minutos, args.modo, args.porta, args.destino, args.velocidade)
+    print("✅ Jogo reproduzido")
+
+if __name__ == "__main__":
+    main()
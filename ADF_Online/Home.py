@@ -3,10 +3,13 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from streamlit_autorefresh import st_autorefresh
 
 import Source.Dados.config as config
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
+from Source.Dados.data_loader import ULTIMA_CARGA, ESTATISTICAS_CACHE, ESTATISTICAS_LEITURA
+from Source.Dados.base_analitica import ESTADO_BASE_ANALITICA
+from Source.Dados.fluxo_gps import ESTADO_FLUXO
+from Source.Dados.janelas_vivo import ESTADO_JANELAS
+from Source.ML.registro_modelos import ESTATISTICAS_MODELOS
 import Source.UI.components as ui
 import Source.UI.visual as visual
 
@@ -69,28 +72,26 @@ ui.renderizar_cabecalho(
 )
 
 # --------------------------------------------------
-# AUTO REFRESH
+# AUTO REFRESH (só quando a thread de ingestão publica dados novos)
 # --------------------------------------------------
-st_autorefresh(interval=5000, limit=None, key="home_refresh")
+ui.vigiar_versao_dados()
 
 # --------------------------------------------------
 # UTILS
 # --------------------------------------------------
 def _safe_dates(series):
-    dt = pd.to_datetime(series, errors="coerce")
-    return dt.dropna()
+    # Data já chega em datetime64 (esquema aplicado na ingestão): só descarta vazios
+    return series.dropna()
 
 # --------------------------------------------------
 # DATA LOAD
 # --------------------------------------------------
-hora_atualizacao = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-
 try:
-    df, df_recordes = load_global_data(hora_atualizacao)
+    # Snapshot partilhado publicado pela thread de ingestão (uma carga por processo, não por sessão)
+    snapshot = ui.sincronizar_dados()
+    df, hora_atualizacao = snapshot.df, snapshot.hora_mod
 
     if df is not None and not df.empty:
-        st.session_state["df_global"] = df
-        st.session_state["df_recordes"] = df_recordes
 
         # -----------------------------
         # CÁLCULO DE MÉTRICAS
@@ -101,11 +102,12 @@ try:
         
         window_start = (datetime.now() - timedelta(days=7)).date()
         atletas_ativos_7d = (
-            df.loc[pd.to_datetime(df["Data"], errors="coerce").dt.date >= window_start, "Name"].nunique()
+            df.loc[df["Data"] >= pd.Timestamp(window_start), "Name"].nunique()
             if "Name" in df.columns and "Data" in df.columns
             else 0
         )
         media_hia = float(df["HIA"].mean()) if "HIA" in df.columns else 0.0
+        carga_txt = f"{ULTIMA_CARGA['origem']} {ULTIMA_CARGA['segundos']:.2f}s" if ULTIMA_CARGA['origem'] else '—'
 
         # --------------------------------------------------
         # HERO BANNER (Destaque Principal)
@@ -123,6 +125,7 @@ try:
                 <div class="hero-chip">⚽ Último jogo: {last_game.strftime('%d/%m/%Y') if last_game else '—'}</div>
                 <div class="hero-chip">👥 Atletas ativos (7d): {atletas_ativos_7d}</div>
                 <div class="hero-chip">🔥 Média HIA: {media_hia:.1f}</div>
+                <div class="hero-chip">⚡ Carga: {carga_txt}</div>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -180,13 +183,15 @@ try:
                 with col_sel:
                     jogo_home = st.selectbox("Selecione o Jogo:", lista_jogos, key="sel_scatter_home")
                 
-                df_home_jogo = df[df['Data_Display'] == jogo_home]
+                # Fatia do cubo por jogo (atleta × período) em vez de agrupar a base minuto a minuto
+                df_cubo = snapshot.derivados['cubo']
+                df_home_jogo = df_cubo[df_cubo['Data_Display'] == jogo_home]
                 
-                df_home_agg  = df_home_jogo.groupby('Name').agg(
+                df_home_agg  = df_home_jogo.groupby('Name', observed=True).agg(
                     Distancia=('Total Distance', 'sum'),
                     HIA=('HIA', 'sum'),
                     Player_Load=('Player Load', 'sum'),
-                    Minutos=('Min_Num', 'max')
+                    Minutos=('Minutos', 'max')
                 ).reset_index()
 
                 media_dist_h = df_home_agg['Distancia'].mean()
@@ -240,6 +245,52 @@ try:
         else:
             st.info("Colunas insuficientes para o gráfico de dispersão.")
 
+        # --------------------------------------------------
+        # DEBUG: CACHE DA CAMADA DE PROCESSAMENTO
+        # --------------------------------------------------
+        with st.expander("🛠️ Debug — Cache de processamento"):
+            chamadas, falhas = ESTATISTICAS_CACHE['chamadas'], ESTATISTICAS_CACHE['falhas']
+            por_via = ESTATISTICAS_CACHE['falhas_por_via']
+            d1, d2, d3, d4 = st.columns(4)
+            d1.metric("Acertos (hit)", max(chamadas - falhas, 0))
+            d2.metric("Falhas (miss)", falhas)
+            d3.metric("Token de versão", f"{ESTATISTICAS_CACHE['segundos_token'] * 1e6:.0f} µs")
+            d4.metric("Hash por linha (incremental)", f"{ESTATISTICAS_CACHE['segundos_hash_por_linha'] * 1e3:.1f} ms")
+            st.caption(
+                f"Falhas por via: snapshot {por_via['snapshot']} · incremental {por_via['incremental']} · excel {por_via['excel']} "
+                f"({ESTATISTICAS_CACHE['processamentos']} processamento(s) completo(s))"
+            )
+            st.caption(f"Versão (mtime, tamanho, linhas): {ESTATISTICAS_CACHE['versao']} · Última carga: {carga_txt}")
+            if ESTATISTICAS_LEITURA['segundos_leitura'] is not None:
+                st.caption(
+                    f"Leitura do Excel em memória: {ESTATISTICAS_LEITURA['megabytes']:.1f} MB em {ESTATISTICAS_LEITURA['segundos_leitura']:.3f}s "
+                    f"({ESTATISTICAS_LEITURA['tentativas']} tentativa(s)) · parse {ESTATISTICAS_LEITURA['segundos_parse']:.2f}s"
+                )
+            segundos_atual = ESTADO_BASE_ANALITICA['segundos_atual']
+            gravacao_txt = f"{segundos_atual:.2f}s" if segundos_atual is not None else "—"
+            st.caption(f"Base analítica: {ESTADO_BASE_ANALITICA['motor']} · versão {ESTADO_BASE_ANALITICA['versao']} · última gravação {gravacao_txt}")
+            if ESTADO_FLUXO['modo']:
+                processamento = ESTADO_FLUXO['segundos_processamento']
+                processamento_txt = f"{processamento * 1e3:.0f} ms" if processamento is not None else "—"
+                st.caption(
+                    f"Fluxo ao vivo ({ESTADO_FLUXO['modo']}): jogo {ESTADO_FLUXO['jogo']} · {ESTADO_FLUXO['linhas']} linhas de "
+                    f"{ESTADO_FLUXO['atletas']} atletas · {ESTADO_FLUXO['descartadas']} descartadas · processamento {processamento_txt}"
+                )
+            if ESTATISTICAS_MODELOS['pedidos']:
+                carga_modelo = ESTATISTICAS_MODELOS['segundos_ultima_carga']
+                carga_modelo_txt = f"{carga_modelo * 1e3:.0f} ms" if carga_modelo is not None else "—"
+                st.caption(
+                    f"Modelos: {ESTATISTICAS_MODELOS['em_memoria']} em memória ({ESTATISTICAS_MODELOS['megabytes']:.1f} MB) · "
+                    f"{ESTATISTICAS_MODELOS['acertos']}/{ESTATISTICAS_MODELOS['pedidos']} pedidos sem abrir ficheiro · "
+                    f"{ESTATISTICAS_MODELOS['cargas']} cargas, {ESTATISTICAS_MODELOS['recargas']} recargas, {ESTATISTICAS_MODELOS['despejos']} despejos · "
+                    f"última carga {carga_modelo_txt} (total {ESTATISTICAS_MODELOS['segundos_total_carga']:.2f}s)"
+                )
+            if ESTADO_JANELAS['jogo'] is not None:
+                st.caption(
+                    f"Janelas ao vivo: jogo {ESTADO_JANELAS['jogo']:%d/%m/%Y} · {ESTADO_JANELAS['linhas']} minutos empurrados · "
+                    f"{ESTADO_JANELAS['reconstrucoes']} reconstruções · última atualização {ESTADO_JANELAS['segundos'] * 1e3:.1f} ms"
+                )
+
     else:
         st.warning("Ficheiro Excel vazio.")
 
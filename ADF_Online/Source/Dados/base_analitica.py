@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import sqlite3
+import pandas as pd
+import streamlit as st
+import Source.Dados.config as config
+import Source.Dados.particoes as particoes
+from Source.Dados.data_loader import construir_cubo_jogos, concatenar_bases
+from Source.Dados.snapshot_store import _gravar_atomico, _escrever_json
+
+# DuckDB (colunar, vetorizado) quando instalado. Sem ele, cai para o SQLite da
+# biblioteca padrão, que só guarda o cubo (gravar a base minuto a minuto a cada
+# versão seria lento demais).
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# ---------------------------------------------------------
+# BASE ANALÍTICA EMBUTIDA (ficheiro local, sem servidor)
+# ---------------------------------------------------------
+# A ingestão grava cada versão publicada em Data_Files/_analitico/:
+#   atual.<motor>   -> só o cubo da temporada atual (regravado a cada versão, troca atómica)
+#   arquivo.<motor> -> cubo e minutos das temporadas arquivadas (só muda com as partições)
+# As consultas veem as vistas `minutos` (só temporadas arquivadas) e `cubo` (as
+# duas origens juntas), com a coluna Temporada, e ficam em cache por (consulta,
+# parâmetros, versão).
+#
+# Os minutos da temporada atual não são regravados a cada versão: já estão em
+# memória no snapshot publicado (e mudam a cada minuto no fluxo ao vivo). Quem
+# junta temporadas (página Temporada) agrega a atual em pandas a partir do
+# snapshot da sessão e só empurra as anteriores para o motor. As páginas de
+# Comparação e Individual (percentis) ficam só na temporada atual em memória e
+# não usam a base analítica: fatiar o cubo da sessão é mais rápido que a consulta
+# e mostra os mesmos dados que o resto do app durante o fluxo ao vivo.
+
+MOTOR = 'duckdb' if duckdb is not None else 'sqlite'
+TABELAS_MOTOR = ('minutos', 'cubo') if MOTOR == 'duckdb' else ('cubo',)
+
+ESTADO_BASE_ANALITICA = {
+    'motor': MOTOR, 'versao': None, 'versao_arquivo': None,
+    'segundos_atual': None, 'segundos_arquivo': None,
+}
+
+def _caminho(nome):
+    return os.path.join(config.DIRETORIO_BASE_ANALITICA, f"{nome}.{MOTOR}")
+
+def disponivel():
+    return config.USAR_BASE_ANALITICA and ESTADO_BASE_ANALITICA['versao'] is not None
+
+def _para_sql(df):
+    """Categorias viram texto e ganha a coluna Temporada (filtro portátil entre motores)."""
+    colunas = {c: df[c].astype(object).where(df[c].notna(), None) for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+    colunas['Temporada'] = particoes.temporada_de(df['Data']).astype('Int16')
+    return df.assign(**colunas)
+
+def _gravar(caminho, partes):
+    """
+    Grava um iterável de {tabela: DataFrame} num ficheiro temporário e troca de uma vez.
+    Cada parte acrescenta linhas às suas tabelas (a primeira cria-as); só as tabelas do motor entram.
+    Leitores já abertos continuam a ver o ficheiro antigo até fecharem a ligação.
+    """
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + '.tmp'
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    con = duckdb.connect(temporario) if MOTOR == 'duckdb' else sqlite3.connect(temporario)
+    criadas = set()
+    try:
+        for tabelas in partes:
+            for nome in TABELAS_MOTOR:
+                parte = tabelas.get(nome)
+                if parte is None or parte.empty:
+                    continue
+                parte = _para_sql(parte)
+                if MOTOR == 'duckdb':
+                    con.register('parte', parte)
+                    con.execute(f'INSERT INTO "{nome}" BY NAME SELECT * FROM parte' if nome in criadas else f'CREATE TABLE "{nome}" AS SELECT * FROM parte')
+                    con.unregister('parte')
+                else:
+                    parte.to_sql(nome, con, if_exists='append', index=False, chunksize=10_000)
+                criadas.add(nome)
+        if MOTOR == 'sqlite':
+            for nome in criadas:
+                con.execute(f'CREATE INDEX "idx_{nome}" ON "{nome}" ("Temporada", "Name", "Data")')
+        con.commit()
+    finally:
+        con.close()
+    os.replace(temporario, caminho)
+
+def _partes_arquivo():
+    """
+    Temporadas arquivadas, uma de cada vez (a memória não cresce com o número de temporadas):
+    cada temporada é lida das partições uma só vez e dá o cubo e as linhas minuto a minuto.
+    """
+    for temporada in particoes.listar_temporadas():
+        df_temporada = concatenar_bases(particoes.ler_particoes({temporada}))
+        yield {'cubo': construir_cubo_jogos(df_temporada), 'minutos': df_temporada}
+
+def _versao_arquivo_gravada():
+    """Versão das partições que gerou o ficheiro de arquivo em disco (sobrevive a reinícios do app)."""
+    if not os.path.exists(_caminho('arquivo')):
+        return None
+    try:
+        with open(_caminho('arquivo') + '.json', 'r', encoding='utf-8') as f:
+            return json.load(f).get('versao_particoes')
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def publicar(versao, df_cubo):
+    """
+    Grava a versão publicada pela ingestão: o cubo da temporada atual a cada versão e o
+    ficheiro de arquivo só quando as partições mudam.
+    """
+    if not config.USAR_BASE_ANALITICA:
+        return
+    versao_arquivo = particoes.versao_particoes()
+    if versao_arquivo != _versao_arquivo_gravada():
+        inicio = time.perf_counter()
+        _gravar(_caminho('arquivo'), _partes_arquivo())
+        _gravar_atomico(_caminho('arquivo') + '.json', lambda p: _escrever_json(p, {'versao_particoes': versao_arquivo}))
+        ESTADO_BASE_ANALITICA['segundos_arquivo'] = time.perf_counter() - inicio
+    ESTADO_BASE_ANALITICA['versao_arquivo'] = versao_arquivo
+
+    inicio = time.perf_counter()
+    _gravar(_caminho('atual'), [{'cubo': df_cubo}])
+    ESTADO_BASE_ANALITICA.update({'versao': (versao, versao_arquivo), 'segundos_atual': time.perf_counter() - inicio})
+
+def _colunas(con, esquema, tabela):
+    if MOTOR == 'duckdb':
+        linhas = con.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_catalog = ? AND table_name = ? ORDER BY ordinal_position",
+            [esquema, tabela],
+        ).fetchall()
+    else:
+        linhas = [(linha[1],) for linha in con.execute(f'PRAGMA "{esquema}".table_info("{tabela}")').fetchall()]
+    return [linha[0] for linha in linhas]
+
+def _conectar():
+    """Ligação em memória com os dois ficheiros anexados só para leitura e as vistas `minutos` e `cubo`."""
+    if MOTOR == 'duckdb':
+        con = duckdb.connect()
+        anexar = lambda caminho, nome: con.execute(f"ATTACH '{caminho}' AS {nome} (READ_ONLY)")
+    else:
+        con = sqlite3.connect('file::memory:', uri=True)
+        anexar = lambda caminho, nome: con.execute(f"ATTACH DATABASE 'file:{caminho}?mode=ro' AS {nome}")
+    origens = [nome for nome in ('atual', 'arquivo') if os.path.exists(_caminho(nome))]
+    for nome in origens:
+        anexar(_caminho(nome).replace("'", "''"), nome)
+
+    for tabela in TABELAS_MOTOR:
+        colunas_por_origem = [_colunas(con, nome, tabela) for nome in origens]
+        colunas_por_origem = [(nome, cols) for nome, cols in zip(origens, colunas_por_origem) if cols]
+        if not colunas_por_origem:
+            continue
+        # Só as colunas comuns às duas origens (o arquivo pode ser de uma versão com menos colunas)
+        comuns = [c for c in colunas_por_origem[0][1] if all(c in cols for _, cols in colunas_por_origem)]
+        lista = ', '.join(f'"{c}"' for c in comuns)
+        uniao = ' UNION ALL '.join(f'SELECT {lista} FROM {nome}."{tabela}"' for nome, _ in colunas_por_origem)
+        con.execute(f'CREATE TEMP VIEW "{tabela}" AS {uniao}')
+    return con
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _consultar(sql, parametros, versao):
+    con = _conectar()
+    try:
+        if MOTOR == 'duckdb':
+            df = con.execute(sql, list(parametros)).df()
+        else:
+            df = pd.read_sql_query(sql, con, params=list(parametros))
+    finally:
+        con.close()
+    if 'Data' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Data']):
+        df['Data'] = pd.to_datetime(df['Data'], errors='coerce') # SQLite devolve datas como texto
+    return df
+
+def consultar(sql, parametros=()):
+    """
+    Executa SQL (placeholders `?`) sobre as vistas `minutos` e `cubo`.
+    Devolve None se a base analítica estiver desligada ou ainda não tiver sido publicada.
+    """
+    if not disponivel():
+        return None
+    return _consultar(sql, tuple(parametros), ESTADO_BASE_ANALITICA['versao'])
+
+def _identificador(nome):
+    return '"' + str(nome).replace('"', '""') + '"'
+
+def agregar(tabela, chaves, metricas, funcao='SUM', temporadas=None, competicoes=None):
+    """
+    GROUP BY empurrado para o motor: `funcao`(métricas) por `chaves`, com filtros opcionais
+    de temporada e competição. Devolve None se a base analítica não estiver disponível.
+    """
+    if tabela not in TABELAS_MOTOR or funcao.upper() not in ('SUM', 'AVG', 'MIN', 'MAX', 'COUNT'):
+        return None
+    lista_chaves = ', '.join(_identificador(c) for c in chaves)
+    lista_metricas = ', '.join(f'{funcao}({_identificador(c)}) AS {_identificador(c)}' for c in metricas)
+    # Como o groupby do pandas: linhas com chave nula ficam de fora
+    filtros, parametros = [f'{_identificador(c)} IS NOT NULL' for c in chaves], []
+    if temporadas:
+        filtros.append(f'"Temporada" IN ({", ".join("?" * len(temporadas))})')
+        parametros += [int(t) for t in temporadas]
+    if competicoes:
+        filtros.append(f'"Competição" IN ({", ".join("?" * len(competicoes))})')
+        parametros += [str(c) for c in competicoes]
+    onde = f" WHERE {' AND '.join(filtros)}" if filtros else ''
+    colunas = ', '.join(parte for parte in (lista_chaves, lista_metricas) if parte)
+    sql = f'SELECT {colunas} FROM "{tabela}"{onde} GROUP BY {lista_chaves} ORDER BY {lista_chaves}'
+    return consultar(sql, parametros)
@@ -9,11 +9,55 @@ DIR_ATUAL = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(os.path.dirname(DIR_ATUAL))
 
 ARQUIVO_ORIGINAL = os.path.join(BASE_DIR, 'Data_Files', 'ADF OnLine 2024.xlsb')
-ARQUIVO_TEMP = os.path.join(BASE_DIR, 'Data_Files', 'ADF_TEMP_HOME.xlsb')
+
+# Leitura do workbook para memória: repete se o tamanho/mtime mudar durante a leitura (Excel a gravar)
+TENTATIVAS_LEITURA_EXCEL = 5
+ESPERA_LEITURA_EXCEL_S = 0.2
+
+# Snapshot colunar (Arrow IPC) da base já processada, ao lado dos dados brutos
+DIRETORIO_SNAPSHOT = os.path.join(BASE_DIR, 'Data_Files', '_snapshot')
+
+# Armazenamento particionado (temporada → competição → jogo) das temporadas anteriores
+DIRETORIO_PARTICOES = os.path.join(BASE_DIR, 'Data_Files', 'particoes')
+
+# Base analítica embutida (DuckDB, ou SQLite sem ele) gravada pela ingestão; consultas SQL das páginas
+USAR_BASE_ANALITICA = True
+DIRETORIO_BASE_ANALITICA = os.path.join(BASE_DIR, 'Data_Files', '_analitico')
+
+# Temporada mantida em memória (ano civil dos jogos); None = a mais recente presente no Excel
+TEMPORADA_ATUAL = None
+
+# Incrementar sempre que o formato de saída do _process_data mudar (invalida os snapshots antigos)
+VERSAO_PROCESSAMENTO = 6
+
+# Intervalo (s) de segurança da thread de ingestão (a deteção normal é por eventos do sistema de ficheiros)
+INTERVALO_INGESTAO_S = 5
+
+# Silêncio (s) exigido depois do último evento de escrita antes de reprocessar o Excel
+DEBOUNCE_EXCEL_S = 0.3
+
+# Frequência (s) com que cada sessão consulta a versão publicada dos dados (polling via fragmento run_every)
+INTERVALO_VIGIA_PAGINAS_S = 0.5
+
+# Ingestão em fluxo do jogo ao vivo (linhas por atleta/minuto, sem esperar que o Excel seja gravado)
+# None = só Excel; 'socket' = NDJSON em 127.0.0.1:PORTA_FLUXO; 'ficheiro' = segue ARQUIVO_FLUXO (NDJSON ou CSV)
+MODO_FLUXO = None
+PORTA_FLUXO = 5055
+ARQUIVO_FLUXO = os.path.join(BASE_DIR, 'Data_Files', 'fluxo_gps.ndjson')
+# Linhas guardadas por atleta (buffer circular pré-alocado; chega para um jogo com prorrogação a 1 linha/min)
+CAPACIDADE_BUFFER_ATLETA = 600
+# Intervalo mínimo (s) entre duas versões publicadas a partir do fluxo (linhas em rajada viram uma só versão)
+INTERVALO_FLUXO_S = 0.5
 
 # Adicionando o caminho oficial da pasta de modelos
 DIRETORIO_MODELOS = os.path.join(BASE_DIR, 'Models')
 
+# Registro de modelos em memória (Source/ML/registro_modelos.py): acima disto saem os menos usados (LRU)
+MAX_MODELOS_EM_MEMORIA = 16
+MEMORIA_MAX_MODELOS_MB = 256
+# Manifesto (em DIRETORIO_MODELOS) dos modelos gravados pelo Source/ML/predictive.py
+ARQUIVO_MANIFESTO_MODELOS = 'manifesto_modelos.json'
+
 # Adiciona Logo:
 CAMINHO_LOGO = os.path.join(BASE_DIR, 'Assets', 'BarraFC.png')
 
@@ -43,17 +87,44 @@ COLS_METRICAS_PREENCHER_ZERO = [c for c in COLUNAS_NECESSARIAS if c not in COLS_
 # ESTA É A VARIÁVEL QUE ESTAVA FALTANDO PARA O RELATÓRIO HIA FUNCIONAR:
 COLS_COMPONENTES_HIA = ['V4 To8 Eff', 'V5 To8 Eff', 'V6 To8 Eff', 'Acc3 Eff', 'Dec3 Eff', 'Acc4 Eff', 'Dec4 Eff']
 
+# ==========================================
+# 2.1 ESQUEMA DA BASE PROCESSADA (aplicado uma única vez na ingestão)
+# ==========================================
+# Rótulos repetidos em milhares de linhas viram 'category'; métricas em float32.
+# Latitude/Longitude ficam em float64 (precisão das coordenadas).
+SCHEMA_DATAS = ['Data']
+SCHEMA_CATEGORIAS = [
+    'Name', 'Competição', 'Adversário', 'Placar', 'Resultado', 'Data_Display',
+    'Parte (15 min)', 'Parte (5 min)', 'Parte (3 min)',
+]
+# Inteiros pequenos; se a coluna tiver vazios ou decimais, fica em float32
+SCHEMA_INTEIROS = {'Interval': 'int16', 'Período': 'int16', 'Min_Num': 'int16', 'Diff_Gols': 'int8', 'Jogou_em_Casa': 'int8'}
+SCHEMA_FLOAT32 = [
+    c for c in COLS_METRICAS_PREENCHER_ZERO if c not in SCHEMA_INTEIROS and c not in ('Latitude', 'Longitude')
+] + ['HIA', 'Distancia_Viagem_km']
+
 # ==========================================
 # 3. DICIONÁRIO DO LIVE TRACKER / ML
 # ==========================================
+# "modelo": nome do alvo no predictive.py; o manifesto guarda-o como chave_modelo(modelo, período), ex. Dist_Total_T1
 METRICAS_CONFIG = {
-    "Total Distance": {"coluna_distancia": "Total Distance", "coluna_acumulada": "Dist Acumulada", "titulo_grafico": "Projeção de Distância Total", "arquivo_modelo": "modelo_Dist_Total.pkl", "unidade": " m"},
-    "V4 Dist": {"coluna_distancia": "V4 Dist", "coluna_acumulada": "V4 Dist Acumulada", "titulo_grafico": "Projeção de V4 Dist", "arquivo_modelo": "modelo_V4_Dist.pkl", "unidade": " m"},
-    "V5 Dist": {"coluna_distancia": "V5 Dist", "coluna_acumulada": "V5 Dist Acumulada", "titulo_grafico": "Projeção de Sprints (V5 Dist)", "arquivo_modelo": "modelo_V5_Dist.pkl", "unidade": " m"},
-    "V4 Eff": {"coluna_distancia": "V4 To8 Eff", "coluna_acumulada": "V4 Eff Acumulada", "titulo_grafico": "Projeção de Ações V4+", "arquivo_modelo": "modelo_V4_Eff.pkl", "unidade": ""},
-    "V5 Eff": {"coluna_distancia": "V5 To8 Eff", "coluna_acumulada": "V5 Eff Acumulada", "titulo_grafico": "Projeção de Ações V5+ (Sprints)", "arquivo_modelo": "modelo_V5_Eff.pkl", "unidade": ""},
-    "HIA": {"coluna_distancia": "HIA", "coluna_acumulada": "HIA Acumulada", "titulo_grafico": "Projeção de HIA", "arquivo_modelo": "modelo_HIA_Total.pkl", "unidade": ""}
+    "Total Distance": {"coluna_distancia": "Total Distance", "coluna_acumulada": "Dist Acumulada", "titulo_grafico": "Projeção de Distância Total", "modelo": "Dist_Total", "unidade": " m"},
+    "V4 Dist": {"coluna_distancia": "V4 Dist", "coluna_acumulada": "V4 Dist Acumulada", "titulo_grafico": "Projeção de V4 Dist", "modelo": "V4_Dist", "unidade": " m"},
+    "V5 Dist": {"coluna_distancia": "V5 Dist", "coluna_acumulada": "V5 Dist Acumulada", "titulo_grafico": "Projeção de Sprints (V5 Dist)", "modelo": "V5_Dist", "unidade": " m"},
+    "V4 Eff": {"coluna_distancia": "V4 To8 Eff", "coluna_acumulada": "V4 Eff Acumulada", "titulo_grafico": "Projeção de Ações V4+", "modelo": "V4_Eff", "unidade": ""},
+    "V5 Eff": {"coluna_distancia": "V5 To8 Eff", "coluna_acumulada": "V5 Eff Acumulada", "titulo_grafico": "Projeção de Ações V5+ (Sprints)", "modelo": "V5_Eff", "unidade": ""},
+    "HIA": {"coluna_distancia": "HIA", "coluna_acumulada": "HIA Acumulada", "titulo_grafico": "Projeção de HIA", "modelo": "HIA_Total", "unidade": ""},
+    # Só acumulado e ritmo (KPI do Live Tracker e feature do ML): sem aba de projeção
+    "Player Load": {"coluna_distancia": "Player Load", "coluna_acumulada": "Player Load Acumulada", "titulo_grafico": "Projeção de Player Load", "modelo": "Load_Total", "unidade": "", "projecao": False},
 }
+# Métricas com aba/projeção no Live Tracker (e no quadro do elenco)
+METRICAS_PROJECAO = [metrica for metrica, cfg in METRICAS_CONFIG.items() if cfg.get("projecao", True)]
+
+# Acumulados por minuto (atleta/jogo/período) calculados uma vez na ingestão, para todas as métricas do METRICAS_CONFIG.
+COLUNAS_ACUMULADAS = {cfg["coluna_distancia"]: cfg["coluna_acumulada"] for cfg in METRICAS_CONFIG.values()}
+# Ritmo (pacing) = acumulado / minuto atual
+COLUNAS_RITMO = {base: f"Ritmo {base}" for base in COLUNAS_ACUMULADAS}
+SCHEMA_FLOAT32 += list(COLUNAS_ACUMULADAS.values()) + list(COLUNAS_RITMO.values())
 
 # ==========================================
 # 4. PALETAS DE CORES (PADRONIZAÇÃO VISUAL)
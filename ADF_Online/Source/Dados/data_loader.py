@@ -1,16 +1,52 @@
 import pandas as pd
 import numpy as np
+from pandas.api.types import union_categoricals
+import io
 import os
-import shutil
+import time
+import datetime
+import hashlib
+import threading
+from operator import itemgetter
+from python_calamine import CalamineWorkbook
 import Source.Dados.config as config
+import Source.Dados.snapshot_store as snapshot_store
+import Source.Dados.particoes as particoes
+from Source.Dados.positions import get_position
 import streamlit as st
 
+# Origem e duração da última carga efetiva (snapshot em disco ou Excel)
+ULTIMA_CARGA = {'origem': None, 'segundos': None, 'linhas': 0}
+
+# Estatísticas do cache da base (painel de debug da Home): 'chamadas' conta cada pedido à
+# load_global_data, 'falhas' cada execução do corpo do _carregar_base (qualquer via) e
+# 'falhas_por_via' separa snapshot / incremental / excel; acertos = chamadas - falhas
+ESTATISTICAS_CACHE = {
+    'chamadas': 0, 'falhas': 0, 'falhas_por_via': {'snapshot': 0, 'incremental': 0, 'excel': 0},
+    'processamentos': 0, 'versao': None, 'segundos_token': 0.0, 'segundos_hash_por_linha': 0.0,
+}
+
+# Última leitura do workbook para memória (painel de debug da Home)
+ESTATISTICAS_LEITURA = {'megabytes': None, 'segundos_leitura': None, 'segundos_parse': None, 'tentativas': 0}
+
 def extrair_diff_gols(placar):
     s = str(placar).strip().lower()
     if any(x in s for x in ['vencendo', 'vitoria', 'vitória', 'ganhando', 'v']): return 1
     if any(x in s for x in ['perdendo', 'derrota', 'd']): return -1
     return 0
 
+def contexto_placar(placar):
+    """
+    Diff_Gols e Resultado de uma vez, interpretando cada texto distinto de Placar só uma vez.
+    Há poucos placares diferentes: o resultado por valor único volta às linhas pelos códigos do factorize.
+    """
+    codigos, unicos = pd.factorize(placar, use_na_sentinel=True)
+    # Posição extra no fim para o código -1 (vazio), com a mesma regra do extrair_diff_gols
+    diff_unicos = np.array([extrair_diff_gols(p) for p in unicos] + [extrair_diff_gols(np.nan)], dtype='int8')
+    diff_gols = diff_unicos[codigos]
+    resultado = np.array(['E', 'V', 'D'])[diff_gols] # 0 -> E, 1 -> V, -1 -> D
+    return diff_gols, resultado
+
 def obter_hora_modificacao(caminho_ficheiro):
     try:
         return os.path.getmtime(caminho_ficheiro)
@@ -20,95 +56,698 @@ def obter_hora_modificacao(caminho_ficheiro):
 # ---------------------------------------------------------
 # CAMADA 1: LEITURA BRUTA (Extremamente rápida)
 # ---------------------------------------------------------
-@st.cache_data(show_spinner="📥 Lendo Excel bruto...", max_entries=2)
-def _read_raw_excel(hora_mod):
-    """Lê o arquivo bruto. Só roda de novo se a hora_mod mudar."""
-    shutil.copy2(config.ARQUIVO_ORIGINAL, config.ARQUIVO_TEMP)
+# As camadas usam st.cache_resource: o DataFrame fica UMA vez no processo e todos
+# recebem a mesma referência (st.cache_data serializava e devolvia uma cópia a
+# cada chamada). Contrato: ninguém escreve nestes objetos. Com copy-on-write
+# ativo (app.py), filtros e colunas novas nas páginas geram objetos próprios.
+def _ler_bytes_estaveis(caminho):
+    """
+    Lê o workbook inteiro para memória numa só passagem. A leitura só vale se tamanho e
+    mtime forem os mesmos antes e depois e o ficheiro estiver parado há ESPERA_LEITURA_EXCEL_S
+    (escritas em curso não mudam o mtime a tempo de se notar); senão espera e repete.
+    Devolve (bytes, mtime, tentativas).
+    """
+    for tentativa in range(1, config.TENTATIVAS_LEITURA_EXCEL + 1):
+        antes = os.stat(caminho)
+        try:
+            with open(caminho, 'rb') as f:
+                dados = f.read()
+        except PermissionError: # Windows: o Excel bloqueia o ficheiro enquanto grava
+            dados = None
+        depois = os.stat(caminho)
+        estavel = dados is not None and len(dados) == antes.st_size and (antes.st_size, antes.st_mtime_ns) == (depois.st_size, depois.st_mtime_ns)
+        recente = 0 <= time.time() - depois.st_mtime < config.ESPERA_LEITURA_EXCEL_S # Relógio de rede adiantado: não dá para julgar
+        if estavel and not recente:
+            return dados, depois.st_mtime, tentativa
+        time.sleep(config.ESPERA_LEITURA_EXCEL_S * tentativa)
+    raise OSError(f"O Excel continuou a mudar durante {config.TENTATIVAS_LEITURA_EXCEL} tentativas de leitura")
+
+def _numero_texto(valor):
+    """float de um texto com vírgula decimal ('-26,94'), ou None se não for número."""
+    try:
+        return float(valor.replace(',', '.'))
+    except ValueError:
+        return None
+
+def _coluna_tipada(valores):
+    """
+    Uma coluna do calamine (sequência de células) para array tipado, com as mesmas regras do
+    read_excel(decimal=','): números -> float64, datas -> datetime64, textos numéricos com
+    vírgula -> float64, resto texto. Células vazias ('') viram NaN/NaT.
+    """
+    try:
+        return np.array(valores, dtype=np.float64) # Caso comum: métrica só com números
+    except (TypeError, ValueError):
+        pass
+    coluna = np.array(valores, dtype=object)
+    if '' in valores: # A comparação célula a célula só é paga quando há vazios
+        coluna[coluna == ''] = np.nan
+    primeiro = next((v for v in valores if v != ''), None)
+    if primeiro is None:
+        return coluna.astype(np.float64)
+    if isinstance(primeiro, (datetime.date, datetime.datetime)):
+        return pd.to_datetime(coluna, errors='coerce').to_numpy()
+    if isinstance(primeiro, str) and _numero_texto(primeiro) is None:
+        return coluna # Texto (nomes, placar...): não vale a pena tentar converter
+    numeros = pd.to_numeric(pd.Series(coluna).map(lambda v: v.replace(',', '.') if isinstance(v, str) else v), errors='coerce')
+    if numeros.notna().sum() == pd.notna(coluna).sum():
+        return numeros.to_numpy()
+    return coluna
+
+def _ler_planilha(dados):
+    """
+    Primeira folha do workbook direto pelo python-calamine, sem o read_excel do pandas
+    (que converte todas as células de todas as colunas em Python e chama o usecols por cabeçalho).
+    As colunas do config.COLUNAS_NECESSARIAS são resolvidas pelo índice no cabeçalho uma vez;
+    só essas são extraídas e convertidas, coluna a coluna, para arrays NumPy.
+    """
+    folha = CalamineWorkbook.from_filelike(io.BytesIO(dados)).get_sheet_by_index(0)
+    linhas = folha.to_python(skip_empty_area=False)
+    if not linhas:
+        return pd.DataFrame()
+    cabecalho = [str(c).strip() for c in linhas[0]]
+    indices = {}
+    for i, nome in enumerate(cabecalho):
+        if nome in config.COLUNAS_NECESSARIAS and nome not in indices:
+            indices[nome] = i
+    if not indices:
+        return pd.DataFrame()
+
+    corpo = linhas[1:]
+    if len(indices) > 1 and corpo:
+        colunas = zip(*map(itemgetter(*indices.values()), corpo)) # Transposição feita em C
+    else:
+        colunas = [[linha[i] for linha in corpo] for i in indices.values()]
+    df = pd.DataFrame({nome: _coluna_tipada(list(valores)) for nome, valores in zip(indices, colunas)})
+    return df.dropna(how='all').reset_index(drop=True) # Linhas em branco (como o skip_blank_lines do pandas)
+
+def _ler_planilha_pandas(dados):
+    """Leitura antiga pelo read_excel (reserva se o leitor direto falhar num workbook inesperado)."""
     df = pd.read_excel(
-        config.ARQUIVO_TEMP, 
+        io.BytesIO(dados),
         engine='calamine', decimal=',',
         usecols=lambda c: c.strip() in config.COLUNAS_NECESSARIAS
     )
     df.columns = df.columns.str.strip()
     return df
 
+@st.cache_resource(show_spinner="📥 Lendo Excel bruto...", max_entries=2)
+def _read_raw_excel(hora_mod):
+    """
+    Lê o arquivo bruto a partir de uma cópia consistente em memória. Só roda de novo se a hora_mod mudar.
+    Devolve (df, chave) — a chave do snapshot sai dos mesmos bytes que foram lidos.
+    """
+    inicio = time.perf_counter()
+    dados, mtime, tentativas = _ler_bytes_estaveis(config.ARQUIVO_ORIGINAL)
+    lido = time.perf_counter()
+    try:
+        df = _ler_planilha(dados)
+    except Exception as e:
+        print(f"⚠️ Leitor direto do calamine falhou ({e}); a usar o read_excel")
+        df = _ler_planilha_pandas(dados)
+    ESTATISTICAS_LEITURA.update({
+        'megabytes': len(dados) / 1e6, 'segundos_leitura': lido - inicio,
+        'segundos_parse': time.perf_counter() - lido, 'tentativas': tentativas,
+    })
+    print(f"📥 Excel lido em memória: {len(dados) / 1e6:.1f} MB em {lido - inicio:.3f}s ({tentativas} tentativa(s)), parse em {ESTATISTICAS_LEITURA['segundos_parse']:.2f}s")
+    return df, snapshot_store.chave_de_conteudo(dados, mtime)
+
 # ---------------------------------------------------------
 # CAMADA 2: PROCESSAMENTO PESADO (Haversine, HIA, Recordes)
 # ---------------------------------------------------------
-@st.cache_data(show_spinner="⚙️ Processando métricas de GPS...", max_entries=2)
-def _process_data(df):
-    """Aplica toda a matemática. Fica em cache com base no DataFrame bruto de entrada."""
-    df_proc = df.copy() # Garante que não mutamos o cache anterior
-
-    for col in ['Latitude', 'Longitude']: 
-        if col in df_proc.columns: 
-            sujeira_limpa = df_proc[col].astype(str).str.replace(' ', '', regex=False).str.replace(',', '.', regex=False)
-            sujeira_limpa = sujeira_limpa.replace(['nan', 'NaN', 'None', ''], np.nan)
-            df_proc[col] = pd.to_numeric(sujeira_limpa, errors='coerce') 
+MAPA_RECORDES = {
+    'Total Distance': 'Dist_Total', 'Player Load': 'Load_Total',
+    'V4 Dist': 'V4_Dist', 'V5 Dist': 'V5_Dist',
+    'V4 To8 Eff': 'V4_Eff', 'V5 To8 Eff': 'V5_Eff', 'HIA': 'HIA_Total'
+}
+CHAVE_BLOCO = ['Name', 'Data', 'Período']
 
-    if 'Latitude' in df_proc.columns and 'Longitude' in df_proc.columns:
-        lat1, lon1 = np.radians(config.LATITUDE_CASA), np.radians(config.LONGITUDE_CASA)
-        lat2, lon2 = np.radians(df_proc['Latitude']), np.radians(df_proc['Longitude'])
-        
-        dlat, dlon = lat2 - lat1, lon2 - lon1
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
-        df_proc['Distancia_Viagem_km'] = 6371.0 * c
-        
-        df_proc.loc[df_proc['Distancia_Viagem_km'] <= config.RAIO_CASA_KM, 'Status_Local'] = 1
-        df_proc.loc[df_proc['Distancia_Viagem_km'] > config.RAIO_CASA_KM, 'Status_Local'] = 0
-        df_proc['Jogou_em_Casa'] = df_proc.groupby('Data')['Status_Local'].transform('min').fillna(1)
-    else:
-        df_proc['Jogou_em_Casa'] = 1
+def _transformar_linhas(df):
+    """Transformações linha a linha (não dependem de outras linhas): podem rodar só nas linhas novas."""
+    # Coordenadas brutas saem: voltam por jogo via tabela geográfica (_juntar_geo)
+    df_proc = df.drop(columns=['Latitude', 'Longitude'], errors='ignore') # Cópia: não mutamos o cache anterior
+    df_proc['Data'] = pd.to_datetime(df_proc['Data'], errors='coerce')
 
-    df_proc[config.COLS_METRICAS_PREENCHER_ZERO] = df_proc[config.COLS_METRICAS_PREENCHER_ZERO].fillna(0)
+    cols_zero = [c for c in config.COLS_METRICAS_PREENCHER_ZERO if c not in COLS_GEO]
+    df_proc[cols_zero] = df_proc[cols_zero].fillna(0)
     df_proc['HIA'] = (
         df_proc.get('V4 To8 Eff', 0) + df_proc.get('V5 To8 Eff', 0) + 
         df_proc.get('V6 To8 Eff', 0) + df_proc.get('Acc3 Eff', 0) + df_proc.get('Dec3 Eff', 0)
     )
 
     if 'Placar' in df_proc.columns:
-        df_proc['Diff_Gols'] = df_proc['Placar'].apply(extrair_diff_gols)
+        diff_gols, resultado = contexto_placar(df_proc['Placar'])
     else:
-        df_proc['Diff_Gols'] = 0
+        diff_gols, resultado = 0, 'E'
+    df_proc['Diff_Gols'] = diff_gols
 
     # Garante que Resultado existe para o ml_engine
     if 'Resultado' not in df_proc.columns:
-        df_proc['Resultado'] = df_proc['Placar'].apply(
-            lambda p: 'V' if extrair_diff_gols(p) == 1 
-                    else ('D' if extrair_diff_gols(p) == -1 else 'E')
-        ) if 'Placar' in df_proc.columns else 'E'
+        df_proc['Resultado'] = resultado
         
-    df_proc['Data_Display'] = pd.to_datetime(df_proc['Data'], errors='coerce').dt.strftime('%d/%m/%Y') + ' ' + df_proc['Adversário'].astype(str)
+    df_proc['Data_Display'] = df_proc['Data'].dt.strftime('%d/%m/%Y') + ' ' + df_proc['Adversário'].astype(str)
     
     nome_coluna_tempo = 'Interval (min)' if 'Interval (min)' in df_proc.columns else 'Interval'
     df_proc['Min_Num'] = pd.to_numeric(df_proc[nome_coluna_tempo], errors='coerce').fillna(0)
+    return df_proc
+
+# ---------------------------------------------------------
+# TABELA GEOGRÁFICA POR JOGO (uma linha por Data)
+# ---------------------------------------------------------
+# A localização só muda de jogo para jogo: limpar textos e calcular haversine
+# por minuto de GPS era repetir o mesmo trabalho milhares de vezes.
+COLS_GEO = ['Latitude', 'Longitude', 'Distancia_Viagem_km', 'Jogou_em_Casa']
+
+def _limpar_coordenada(serie):
+    """'-26,948 597' -> -26.948597 (vírgula decimal e espaços do Excel)."""
+    sujeira_limpa = serie.astype(str).str.replace(' ', '', regex=False).str.replace(',', '.', regex=False)
+    sujeira_limpa = sujeira_limpa.replace(['nan', 'NaN', 'None', ''], np.nan)
+    return pd.to_numeric(sujeira_limpa, errors='coerce')
+
+def distancia_casa_km(latitude, longitude):
+    """Haversine até à arena (config.LATITUDE_CASA / LONGITUDE_CASA). Aceita escalares ou arrays."""
+    lat1, lon1 = np.radians(config.LATITUDE_CASA), np.radians(config.LONGITUDE_CASA)
+    lat2, lon2 = np.radians(latitude), np.radians(longitude)
+
+    dlat, dlon = lat2 - lat1, lon2 - lon1
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
+
+def construir_tabela_geo(df_raw):
+    """
+    Uma linha por jogo a partir das coordenadas brutas. Só os pares (Data, Latitude, Longitude)
+    distintos são limpos e medidos — poucos por jogo, em vez de um por minuto.
+    - Latitude/Longitude: leitura válida mais frequente do jogo (coordenada representativa)
+    - Distancia_Viagem_km: distância dessa coordenada à arena
+    - Jogou_em_Casa: 0 se alguma leitura válida está fora do RAIO_CASA_KM; 1 caso contrário (ou sem leituras)
+    """
+    vazia = pd.DataFrame(columns=COLS_GEO, index=pd.DatetimeIndex([], name='Data'), dtype=float)
+    if not {'Data', 'Latitude', 'Longitude'}.issubset(df_raw.columns):
+        return vazia
+
+    pares = df_raw.groupby(['Data', 'Latitude', 'Longitude'], dropna=False, observed=True).size().reset_index(name='Leituras')
+    pares = pd.DataFrame({
+        'Data': pd.to_datetime(pares['Data'], errors='coerce'),
+        'Latitude': _limpar_coordenada(pares['Latitude']),
+        'Longitude': _limpar_coordenada(pares['Longitude']),
+        'Leituras': pares['Leituras'],
+    }).dropna(subset=['Data'])
+    if pares.empty:
+        return vazia
+    pares['Distancia_Leitura'] = distancia_casa_km(pares['Latitude'], pares['Longitude'])
+    validos = pares.dropna(subset=['Distancia_Leitura'])
+
+    tabela = (
+        validos.sort_values('Leituras', ascending=False, kind='stable')
+        .drop_duplicates(subset=['Data'])
+        .set_index('Data')[['Latitude', 'Longitude']]
+        .reindex(pd.DatetimeIndex(pares['Data'].unique(), name='Data')) # Jogos sem nenhuma leitura válida
+    )
+    tabela['Distancia_Max'] = validos.groupby('Data')['Distancia_Leitura'].max()
+    tabela['Distancia_Viagem_km'] = distancia_casa_km(tabela['Latitude'], tabela['Longitude'])
+    tabela['Jogou_em_Casa'] = np.where(tabela['Distancia_Max'] > config.RAIO_CASA_KM, 0, 1)
+    return tabela[COLS_GEO]
+
+def extrair_tabela_geo(df_proc):
+    """Tabela geográfica a partir da base já processada (as colunas COLS_GEO são constantes por jogo)."""
+    if df_proc.empty or not set(COLS_GEO).issubset(df_proc.columns):
+        return pd.DataFrame(columns=COLS_GEO, index=pd.DatetimeIndex([], name='Data'), dtype=float)
+    return df_proc.drop_duplicates(subset=['Data']).dropna(subset=['Data']).set_index('Data')[COLS_GEO].sort_index()
+
+def _juntar_geo(df_proc, tabela_geo, mascara=None):
+    """Leva a tabela geográfica às linhas pelo jogo (Data). Com `mascara`, só às linhas indicadas."""
+    datas = df_proc['Data'] if mascara is None else df_proc.loc[mascara, 'Data']
+    posicoes = tabela_geo.index.get_indexer(datas)
+    encontrado = posicoes >= 0
+    for col in COLS_GEO:
+        valores = np.full(len(posicoes), 1.0 if col == 'Jogou_em_Casa' else np.nan)
+        valores[encontrado] = tabela_geo[col].to_numpy(dtype=float)[posicoes[encontrado]]
+        if mascara is None:
+            df_proc[col] = valores
+        else:
+            # Mantém o dtype do esquema já aplicado (float32/int8) nas linhas antigas
+            df_proc.loc[mascara, col] = valores.astype(df_proc[col].dtype, copy=False)
+    return df_proc
+
+def _aplicar_schema(df_proc):
+    """Converte para o esquema compacto do config (categorias, float32, inteiros pequenos, Data em datetime64)."""
+    tipos = {}
+    for col in config.SCHEMA_DATAS:
+        if col in df_proc.columns and not pd.api.types.is_datetime64_any_dtype(df_proc[col]):
+            df_proc[col] = pd.to_datetime(df_proc[col], errors='coerce')
+    for col in config.SCHEMA_CATEGORIAS:
+        if col in df_proc.columns and not isinstance(df_proc[col].dtype, pd.CategoricalDtype):
+            serie = df_proc[col]
+            if serie.dtype == object: # Números e textos misturados: tudo texto (uma categoria Arrow só tem um tipo)
+                serie = serie.where(serie.isna(), serie.astype(str))
+            df_proc[col] = serie.astype('category')
+    for col, tipo in config.SCHEMA_INTEIROS.items():
+        if col in df_proc.columns:
+            valores = pd.to_numeric(df_proc[col], errors='coerce')
+            inteiro = valores.notna().all() and (valores % 1 == 0).all()
+            tipos[col] = tipo if inteiro else 'float32'
+            df_proc[col] = valores
+    tipos.update({col: 'float32' for col in config.SCHEMA_FLOAT32 if col in df_proc.columns})
+    return df_proc.astype(tipos)
+
+def concatenar_bases(partes):
+    """Concatena mantendo as colunas categóricas (une as categorias em vez de cair para object)."""
+    partes = [p for p in partes if p is not None and not p.empty]
+    if not partes:
+        return pd.DataFrame()
+    for col in config.SCHEMA_CATEGORIAS:
+        if all(col in p.columns and isinstance(p[col].dtype, pd.CategoricalDtype) for p in partes):
+            # União só das categorias (não das colunas inteiras): custa o nº de categorias, não o de linhas
+            uniao = union_categoricals([pd.Categorical(p[col].cat.categories) for p in partes], sort_categories=True).categories
+            # Só recodifica as partes que não têm já essas categorias (a temporada, quando só o jogo ao vivo cresce)
+            partes = [
+                p if p[col].cat.categories.equals(uniao) else p.assign(**{col: p[col].cat.set_categories(uniao)})
+                for p in partes
+            ]
+    return pd.concat(partes, ignore_index=True)
+
+def _concatenar(df_antigo, df_novo):
+    return concatenar_bases([df_antigo, df_novo])
+
+def _calcular_acumulados(df_proc, mascara=None):
+    """
+    Acumulados por bloco (atleta/jogo/período) na ordem dos minutos e o ritmo de cada um,
+    para as colunas de config.COLUNAS_ACUMULADAS. Com `mascara`, só os blocos indicados são refeitos.
+    """
+    bases = [c for c in config.COLUNAS_ACUMULADAS if c in df_proc.columns]
+    alvo = df_proc if mascara is None else df_proc[mascara]
+    ordenado = alvo[CHAVE_BLOCO + ['Min_Num'] + bases].sort_values('Min_Num', kind='stable')
+    acumulados = ordenado.groupby(CHAVE_BLOCO, observed=True, sort=False)[bases].cumsum().reindex(alvo.index)
+    minutos = alvo['Min_Num'].clip(lower=1)
+
+    novas = {}
+    for base in bases:
+        novas[config.COLUNAS_ACUMULADAS[base]] = acumulados[base]
+        novas[config.COLUNAS_RITMO[base]] = acumulados[base] / minutos
+    if mascara is None:
+        return df_proc.assign(**novas)
+    for col, valores in novas.items():
+        df_proc.loc[mascara, col] = valores.to_numpy()
+    return df_proc
+
+def _token_versao(chave, df_raw):
+    """Versão barata do bruto: (mtime, tamanho, linhas). Substitui o hash do DataFrame inteiro como chave do cache."""
+    return (chave['mtime'], chave['tamanho'], len(df_raw)) if chave else (None, None, len(df_raw))
+
+@st.cache_resource(show_spinner="⚙️ Processando métricas de GPS...", max_entries=2)
+def _process_data(versao, _df):
+    """
+    Aplica toda a matemática. A chave do cache é só `versao` (ver _token_versao):
+    o underscore em `_df` diz ao Streamlit para não fazer hash do DataFrame bruto.
+    """
+    ESTATISTICAS_CACHE['processamentos'] += 1
+    df_proc = _processar_bruto(_df)
+    return df_proc, _calcular_recordes(df_proc)
+
+def _processar_bruto(df_raw):
+    """Pipeline completo de linhas brutas até à base publicada (sem cache nem recordes)."""
+    df_proc = _juntar_geo(_transformar_linhas(df_raw), construir_tabela_geo(df_raw))
+    return ordenar_base(_calcular_acumulados(_aplicar_schema(df_proc)))
+
+# ---------------------------------------------------------
+# PICOS DE DEMANDA (PIOR CENÁRIO) — JANELAS DE 1, 3, 5 E 10 MINUTOS
+# ---------------------------------------------------------
+# Uma só passagem vetorizada: com as linhas agrupadas por bloco (atleta/jogo/período)
+# e ordenadas pelo minuto, a soma móvel de N linhas é S[i + 1] - S[max(i - N + 1, início do bloco)],
+# com S a soma acumulada. No início do bloco a janela é parcial (como rolling(min_periods=1)).
+# O máximo por bloco sai de um np.maximum.reduceat; atleta e posição são máximos desses blocos.
+JANELAS_PICO = (1, 3, 5, 10)
+
+def coluna_pico(coluna, janela):
+    """Nome da coluna de recorde: coluna_pico('Total Distance', 5) -> 'Recorde_5min_Dist_Total'."""
+    return f"Recorde_{janela}min_{MAPA_RECORDES[coluna]}"
+
+def calcular_picos(df_proc, janelas=JANELAS_PICO):
+    """Pico de cada métrica do MAPA_RECORDES em cada janela, com uma linha por bloco atleta × jogo × período."""
+    cols_calc = [c for c in MAPA_RECORDES if c in df_proc.columns]
+    if df_proc.empty or not cols_calc:
+        return pd.DataFrame(columns=CHAVE_BLOCO)
+    blocos = df_proc.groupby(CHAVE_BLOCO, observed=True, sort=False).ngroup().to_numpy()
+    validas = np.flatnonzero(blocos >= 0) # Chave com vazio fica fora (como no groupby)
+    ordem = validas[np.lexsort((df_proc['Min_Num'].to_numpy()[validas], blocos[validas]))]
+    blocos = blocos[ordem]
+    valores = np.nan_to_num(df_proc[cols_calc].to_numpy(dtype=np.float64)[ordem])
+
+    novo_bloco = np.r_[True, blocos[1:] != blocos[:-1]]
+    inicios = np.flatnonzero(novo_bloco)
+    inicio_da_linha = inicios[np.cumsum(novo_bloco) - 1]
+    acumulado = np.vstack([np.zeros((1, len(cols_calc))), np.cumsum(valores, axis=0)])
+    posicao = np.arange(len(blocos))
+
+    picos = {}
+    for janela in janelas:
+        desde = np.maximum(posicao - janela + 1, inicio_da_linha)
+        maximos = np.maximum.reduceat(acumulado[posicao + 1] - acumulado[desde], inicios, axis=0)
+        for j, col in enumerate(cols_calc):
+            picos[coluna_pico(col, janela)] = maximos[:, j]
+    chaves = df_proc[CHAVE_BLOCO].iloc[ordem[inicios]].reset_index(drop=True)
+    return pd.concat([chaves, pd.DataFrame(picos)], axis=1)
+
+def _calcular_recordes(df_proc):
+    """Recordes por atleta: maior soma móvel de cada janela do JANELAS_PICO em cada métrica do MAPA_RECORDES."""
+    df_picos = calcular_picos(df_proc)
+    if df_picos.empty:
+        return pd.DataFrame()
+    cols_picos = [c for c in df_picos.columns if c not in CHAVE_BLOCO]
+    return df_picos.groupby('Name', observed=True)[cols_picos].max().reset_index()
 
-    # Cálculo de recordes
-    df_sorted = df_proc.sort_values(by=['Name', 'Data', 'Período', 'Min_Num']).copy()
-    mapa_recordes = {
-        'Total Distance': 'Dist_Total', 'Player Load': 'Load_Total',
-        'V4 Dist': 'V4_Dist', 'V5 Dist': 'V5_Dist',
-        'V4 To8 Eff': 'V4_Eff', 'V5 To8 Eff': 'V5_Eff', 'HIA': 'HIA_Total'
+def picos_por_posicao(df_recordes):
+    """Recordes por posição (máximo dos atletas de cada posição do positions.py; sem posição fica de fora)."""
+    if df_recordes.empty:
+        return pd.DataFrame()
+    posicao = df_recordes['Name'].astype(str).map(get_position).rename('Posição')
+    return df_recordes.drop(columns='Name').groupby(posicao).max().reset_index()
+
+def pico_recorde(df_recordes, nome, coluna, janela=5):
+    """Recorde do atleta numa métrica (coluna bruta, ex.: 'Total Distance') e janela em minutos; 0 sem registo."""
+    if df_recordes is None or df_recordes.empty or coluna not in MAPA_RECORDES:
+        return 0.0
+    col = coluna_pico(coluna, janela)
+    if col not in df_recordes.columns:
+        return 0.0
+    valores = df_recordes.loc[df_recordes['Name'] == nome, col].to_numpy()
+    return float(valores[0]) if len(valores) else 0.0
+
+def tabela_picos(df_recordes, coluna, nomes=None):
+    """
+    Tabela de pior cenário de uma métrica: uma linha por atleta (ou só `nomes`), com a posição
+    e uma coluna por janela ('1 min', '3 min', ...). Base do expander do Live Tracker.
+    """
+    janelas = [j for j in JANELAS_PICO if coluna in MAPA_RECORDES and coluna_pico(coluna, j) in df_recordes.columns]
+    if df_recordes.empty or not janelas:
+        return pd.DataFrame()
+    df = df_recordes if nomes is None else df_recordes[df_recordes['Name'].isin(nomes)]
+    tabela = pd.DataFrame({'Atleta': df['Name'].astype(str).to_numpy()})
+    tabela['Posição'] = tabela['Atleta'].map(get_position)
+    for janela in janelas:
+        tabela[f"{janela} min"] = df[coluna_pico(coluna, janela)].to_numpy()
+    return tabela.sort_values(f"{janelas[-1]} min", ascending=False, ignore_index=True)
+
+# ---------------------------------------------------------
+# BASE ORDENADA + ÍNDICE DE BLOCOS (Data × Período × Name)
+# ---------------------------------------------------------
+# A base sai ordenada por (Data, Período, Name, Interval): cada jogo, período e
+# atleta ocupa um intervalo contínuo de linhas. O índice guarda [inicio, fim)
+# de cada bloco num MultiIndex ordenado; as fatias saem por busca binária
+# (views com copy-on-write) em vez de máscaras booleanas sobre a temporada.
+CHAVE_ORDENACAO = ['Data', 'Período', 'Name', 'Interval']
+CHAVE_INDICE = ['Data', 'Período', 'Name']
+
+def ordenar_base(df_proc):
+    """Ordena por CHAVE_ORDENACAO (vazios no fim) e renumera o índice de 0 a n-1."""
+    return df_proc.sort_values(CHAVE_ORDENACAO, na_position='last', ignore_index=True)
+
+def construir_indice_blocos(df_ord):
+    """Tabela [inicio, fim) de cada bloco Data × Período × Name da base já ordenada por ordenar_base."""
+    if df_ord.empty:
+        return pd.DataFrame({'inicio': [], 'fim': []}, dtype='int64',
+                            index=pd.MultiIndex.from_arrays([[], [], []], names=CHAVE_INDICE))
+    ids = df_ord.groupby(CHAVE_INDICE, observed=True, sort=False).ngroup().to_numpy()
+    inicio = np.flatnonzero(np.diff(ids, prepend=-2) != 0)
+    fim = np.append(inicio[1:], len(ids))
+    validos = ids[inicio] >= 0 # Linhas sem Data/Período/Name ficam fora do índice
+    inicio, fim = inicio[validos], fim[validos]
+    chaves = pd.MultiIndex.from_frame(df_ord[CHAVE_INDICE].iloc[inicio])
+    return pd.DataFrame({'inicio': inicio, 'fim': fim}, index=chaves).sort_index()
+
+def _fatia(df, indice, chave):
+    """Fatia contínua de `df` que cobre `chave` (prefixo de CHAVE_INDICE); vazia se não existir."""
+    try:
+        loc = indice.index.get_loc(chave)
+    except (KeyError, TypeError):
+        return df.iloc[0:0]
+    inicio = np.atleast_1d(indice['inicio'].to_numpy()[loc])
+    fim = np.atleast_1d(indice['fim'].to_numpy()[loc])
+    if inicio.size == 0:
+        return df.iloc[0:0]
+    return df.iloc[inicio.min():fim.max()]
+
+def get_game(df, indice, data, periodo=None):
+    """Todas as linhas de um jogo (ou só de um período dele)."""
+    return _fatia(df, indice, data if periodo is None else (data, periodo))
+
+def get_athlete_period(df, indice, nome, data, periodo):
+    """Minuto a minuto de um atleta num jogo/período, já em ordem de Interval."""
+    return _fatia(df, indice, (data, periodo, nome))
+
+def get_minutes(df, indice, nome, data, periodo, ate=None, desde=None):
+    """Como get_athlete_period, recortado a desde <= Interval <= ate (busca binária dentro do bloco)."""
+    bloco = get_athlete_period(df, indice, nome, data, periodo)
+    minutos = bloco['Interval'].to_numpy()
+    inicio = 0 if desde is None else np.searchsorted(minutos, desde, side='left')
+    fim = len(minutos) if ate is None else np.searchsorted(minutos, ate, side='right')
+    return bloco.iloc[inicio:fim]
+
+# ---------------------------------------------------------
+# CUBO DE RESUMO POR JOGO (Name × Data × Período)
+# ---------------------------------------------------------
+# Os totais por atleta/jogo que quase todas as páginas e o treino do modelo
+# refaziam sobre a base minuto a minuto. Calculado uma vez por versão dos dados.
+CHAVE_CUBO = ['Name', 'Data', 'Período']
+COLS_ATRIBUTOS_CUBO = ['Data_Display', 'Competição', 'Adversário', 'Jogou_em_Casa', 'Distancia_Viagem_km']
+COLS_SOMA_CUBO = list(dict.fromkeys(
+    ['Total Distance', 'V4 Dist', 'V5 Dist', 'Player Load', 'HIA'] + config.COLS_COMPONENTES_HIA
+))
+COLS_TAXA_CUBO = ['Total Distance', 'V4 Dist', 'V5 Dist', 'Player Load', 'HIA', 'AccDec_Total']
+
+def construir_cubo_jogos(df_proc):
+    """
+    Uma linha por atleta/jogo/período com:
+    - somas das métricas e das componentes do HIA (+ AccDec_Total = Acc3 + Dec3)
+    - Minutos (maior Min_Num do período) e Minutos_Registrados (minutos distintos com dados)
+    - taxas por minuto (<métrica>_por_min)
+    - atributos do jogo (Data_Display, Competição, Adversário, casa/fora, distância de viagem)
+    """
+    if df_proc.empty:
+        return pd.DataFrame(columns=CHAVE_CUBO)
+    somas = [c for c in COLS_SOMA_CUBO if c in df_proc.columns]
+    atributos = [c for c in COLS_ATRIBUTOS_CUBO if c in df_proc.columns]
+
+    grupo = df_proc.groupby(CHAVE_CUBO, observed=True, sort=True)
+    cubo = grupo[somas].sum()
+    cubo[atributos] = grupo[atributos].first()
+    cubo['Minutos'] = grupo['Min_Num'].max()
+    cubo['Minutos_Registrados'] = grupo['Interval'].nunique().astype('int16')
+    if 'Acc3 Eff' in cubo.columns and 'Dec3 Eff' in cubo.columns:
+        cubo['AccDec_Total'] = cubo['Acc3 Eff'] + cubo['Dec3 Eff']
+
+    divisor = cubo['Minutos'].clip(lower=1)
+    for col in COLS_TAXA_CUBO:
+        if col in cubo.columns:
+            cubo[f'{col}_por_min'] = (cubo[col] / divisor).astype('float32')
+    return cubo.reset_index()
+
+# ---------------------------------------------------------
+# INGESTÃO INCREMENTAL (o xlsb só cresce no fim durante o jogo)
+# ---------------------------------------------------------
+# Guarda quantas linhas brutas já foram processadas e a impressão digital delas.
+# Se o prefixo continuar igual, só as linhas novas passam pelas transformações;
+# qualquer edição nas linhas antigas força a reconstrução completa.
+# A thread de ingestão e o cache das páginas (_carregar_base) usam o mesmo estado:
+# ler, processar e guardar acontecem sob _LOCK_INCREMENTAL, uma carga de cada vez.
+_ESTADO_INCREMENTAL = {'linhas': 0, 'colunas': None, 'hash': None, 'df_proc': None, 'df_recordes': None, 'geo': None}
+_LOCK_INCREMENTAL = threading.Lock()
+
+def _hash_linhas(hashes):
+    return hashlib.blake2b(np.ascontiguousarray(hashes).tobytes(), digest_size=16).hexdigest()
+
+def _hashes_por_linha(df_raw):
+    return pd.util.hash_pandas_object(df_raw, index=False).to_numpy()
+
+def _guardar_estado(linhas, colunas, hash_bruto, df_proc, df_recordes, tabela_geo=None):
+    # Sem tabela_geo, é extraída da base na primeira carga incremental
+    _ESTADO_INCREMENTAL.update({
+        'linhas': linhas, 'colunas': list(colunas), 'hash': hash_bruto,
+        'df_proc': df_proc, 'df_recordes': df_recordes, 'geo': tabela_geo,
+    })
+
+def _processar_incremental(df_raw, hashes):
+    """
+    Processa só as linhas acrescentadas desde a última carga.
+    Devolve (df_proc, df_recordes, tabela_geo, n_novas) ou None se não for possível.
+    """
+    estado = _ESTADO_INCREMENTAL
+    n_antigo = estado['linhas']
+    if estado['df_proc'] is None or n_antigo == 0 or len(df_raw) < n_antigo:
+        return None
+    if list(df_raw.columns) != estado['colunas'] or _hash_linhas(hashes[:n_antigo]) != estado['hash']:
+        return None # Linhas antigas editadas (ou colunas mudaram): reconstrução completa
+    if len(df_raw) == n_antigo:
+        return estado['df_proc'], estado['df_recordes'], estado['geo'], 0
+
+    df_novas = _aplicar_schema(_transformar_linhas(df_raw.iloc[n_antigo:]))
+    df_proc = _concatenar(estado['df_proc'], df_novas)
+
+    # Tabela geográfica: só os jogos tocados pelas linhas novas são refeitos (com todas as leituras deles)
+    datas_novas = pd.DatetimeIndex(df_novas['Data'].dropna().unique())
+    tabela_antiga = estado['geo'] if estado['geo'] is not None else extrair_tabela_geo(estado['df_proc'])
+    df_raw_jogos = df_raw[pd.to_datetime(df_raw['Data'], errors='coerce').isin(datas_novas)]
+    tabela_geo = pd.concat([tabela_antiga.drop(index=datas_novas, errors='ignore'), construir_tabela_geo(df_raw_jogos)]).sort_index()
+    df_proc = _aplicar_schema(_juntar_geo(df_proc, tabela_geo, mascara=df_proc['Data'].isin(datas_novas).to_numpy()))
+
+    # Blocos (atleta/jogo/período) tocados pelas linhas novas: só neles os acumulados mudam
+    blocos = pd.MultiIndex.from_frame(df_novas[CHAVE_BLOCO].drop_duplicates())
+    mascara = pd.MultiIndex.from_frame(df_proc[CHAVE_BLOCO]).isin(blocos)
+    df_proc = _calcular_acumulados(df_proc, mascara=mascara)
+
+    # As janelas antigas não mudam: o recorde novo é o máximo entre o anterior e os blocos afetados
+    df_recordes = (
+        pd.concat([estado['df_recordes'], _calcular_recordes(df_proc[mascara])], ignore_index=True)
+        .groupby('Name', observed=True).max().reset_index()
+    )
+    return ordenar_base(df_proc), df_recordes, tabela_geo, len(df_novas)
+
+# ---------------------------------------------------------
+# TEMPORADAS ANTERIORES (armazenamento particionado, ver particoes.py)
+# ---------------------------------------------------------
+# Só a temporada atual fica na base em memória. Os jogos das anteriores são
+# processados uma vez, gravados por temporada/competição/jogo e lidos de volta
+# apenas quando uma página (Temporada) ou o treino os pedem.
+def _separar_temporada_atual(df_raw, hashes):
+    """
+    Arquiva os jogos de outras temporadas que mudaram desde a última vez e devolve
+    só as linhas brutas da temporada atual (com os hashes correspondentes).
+    """
+    temporadas = particoes.temporada_de(df_raw['Data'])
+    atual = config.TEMPORADA_ATUAL if config.TEMPORADA_ATUAL is not None else temporadas.max()
+    outras = (temporadas.notna() & (temporadas != atual)).to_numpy() # Sem data válida: fica na atual
+    if not outras.any():
+        return df_raw, hashes
+    _arquivar_jogos(df_raw[outras], hashes[outras])
+    return df_raw[~outras].reset_index(drop=True), hashes[~outras]
+
+def _arquivar_jogos(df_raw, hashes):
+    """Processa e grava só os jogos cuja assinatura bruta não bate com o manifesto das partições."""
+    assinaturas = particoes.assinaturas_por_jogo(df_raw['Data'], hashes)
+    pendentes = particoes.jogos_desatualizados(assinaturas, particoes.ler_manifesto())
+    if not pendentes:
+        return
+    inicio = time.perf_counter()
+    datas = pd.to_datetime(df_raw['Data'], errors='coerce')
+    df_proc = _processar_bruto(df_raw[datas.isin(pd.to_datetime(pendentes)).to_numpy()])
+    recordes = {
+        data.strftime('%Y-%m-%d'): _calcular_recordes(df_jogo)
+        for data, df_jogo in df_proc.groupby('Data', observed=True)
     }
-    cols_calc = [c for c in mapa_recordes.keys() if c in df_sorted.columns]
-    df_rolling = df_sorted.groupby(['Name', 'Data', 'Período'])[cols_calc].rolling(window=5, min_periods=1).sum().reset_index(drop=True)
-    df_rolling['Name'] = df_sorted['Name'].values
-    
-    df_recordes = df_rolling.groupby('Name')[cols_calc].max().reset_index()
-    df_recordes = df_recordes.rename(columns={col: f"Recorde_5min_{mapa_recordes[col]}" for col in cols_calc})
+    particoes.gravar_jogos(df_proc, assinaturas, recordes)
+    print(f"🗄️ {len(pendentes)} jogo(s) de temporadas anteriores arquivado(s) em {time.perf_counter() - inicio:.2f}s")
+
+def _juntar_recordes(df_recordes):
+    """Recordes da temporada atual + os dos jogos arquivados (máximo por atleta)."""
+    arquivados = particoes.recordes_arquivados()
+    if arquivados.empty:
+        return df_recordes
+    if df_recordes.empty:
+        return arquivados
+    juntos = pd.concat([df_recordes.assign(Name=df_recordes['Name'].astype(str)), arquivados], ignore_index=True)
+    return juntos.groupby('Name').max().reset_index()
+
+def listar_temporadas_arquivadas():
+    return particoes.listar_temporadas()
+
+@st.cache_resource(show_spinner="📦 Carregando temporadas anteriores...", max_entries=4)
+def _carregar_temporadas(temporadas, competicoes, versao_particoes):
+    df = concatenar_bases(particoes.ler_particoes(set(temporadas), set(competicoes)))
+    if df.empty:
+        return df, pd.DataFrame(columns=CHAVE_CUBO)
+    df = ordenar_base(df)
+    return df, construir_cubo_jogos(df)
+
+def carregar_temporadas(temporadas, competicoes=None):
+    """
+    Base e cubo de temporadas arquivadas, lidas do disco só quando pedidas.
+    Em cache por (temporadas, competições, versão das partições).
+    """
+    return _carregar_temporadas(
+        tuple(sorted(temporadas)), tuple(sorted(competicoes or [])), particoes.versao_particoes()
+    )
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _cubo_arquivado(versao_particoes):
+    cubos = [construir_cubo_jogos(concatenar_bases(particoes.ler_particoes({t}))) for t in particoes.listar_temporadas()]
+    return concatenar_bases(cubos)
+
+def carregar_cubo_arquivado():
+    """
+    Cubo atleta × jogo × período de todas as temporadas arquivadas, lido uma temporada de cada vez
+    (a base minuto a minuto delas não fica em memória). Em cache por versão das partições; vazio sem partições.
+    """
+    return _cubo_arquivado(particoes.versao_particoes())
+
+# ---------------------------------------------------------
+# CAMADA 3: SNAPSHOT EM DISCO (Arrow IPC, carga completa rápida)
+# ---------------------------------------------------------
+def _registrar_carga(via, origem, inicio, df):
+    ESTATISTICAS_CACHE['falhas'] += 1
+    ESTATISTICAS_CACHE['falhas_por_via'][via] += 1
+    segundos = time.perf_counter() - inicio
+    ULTIMA_CARGA.update({'origem': origem, 'segundos': segundos, 'linhas': len(df)})
+    print(f"⏱️ Base carregada via {origem} em {segundos:.3f}s ({len(df)} linhas)")
+
+@st.cache_resource(show_spinner="📦 Carregando base processada...", max_entries=2)
+def _carregar_base(hora_mod):
+    """
+    Ordem de preferência:
+    1. Snapshot em disco, se a chave do workbook não mudou.
+    2. Incremental, se o Excel só ganhou linhas no fim.
+    3. Reconstrução completa a partir do Excel.
+    """
+    with _LOCK_INCREMENTAL: # Estado incremental partilhado com a thread de ingestão
+        inicio = time.perf_counter()
+        snapshot = snapshot_store.carregar_snapshot(config.ARQUIVO_ORIGINAL)
+        if snapshot is not None and snapshot[2].get('temporada_config') != config.TEMPORADA_ATUAL:
+            snapshot = None # Outra temporada configurada: a separação tem de ser refeita
+        if snapshot is not None:
+            df_proc, df_recordes, manifesto = snapshot
+            if manifesto.get('hash_bruto'):
+                _guardar_estado(manifesto['linhas_brutas'], manifesto['colunas_brutas'], manifesto['hash_bruto'], df_proc, df_recordes)
+            _registrar_carga('snapshot', 'snapshot', inicio, df_proc)
+            return df_proc, _juntar_recordes(df_recordes)
+
+        # Chave e dados saem da mesma leitura: o snapshot gravado corresponde exatamente aos bytes processados
+        df_raw, chave = _read_raw_excel(hora_mod)
+        inicio_hash = time.perf_counter()
+        hashes = _hashes_por_linha(df_raw)
+        ESTATISTICAS_CACHE['segundos_hash_por_linha'] = time.perf_counter() - inicio_hash
+        df_raw, hashes = _separar_temporada_atual(df_raw, hashes)
+
+        tabela_geo = None
+        incremental = _processar_incremental(df_raw, hashes)
+        if incremental is not None:
+            df_proc, df_recordes, tabela_geo, n_novas = incremental
+            _registrar_carga('incremental', f'excel incremental (+{n_novas} linhas)', inicio, df_proc)
+        else:
+            inicio_token = time.perf_counter()
+            versao = _token_versao(chave, df_raw)
+            ESTATISTICAS_CACHE.update({'versao': versao, 'segundos_token': time.perf_counter() - inicio_token})
+            df_proc, df_recordes = _process_data(versao, df_raw)
+            _registrar_carga('excel', 'excel', inicio, df_proc)
+
+        hash_bruto = _hash_linhas(hashes)
+        _guardar_estado(len(df_raw), df_raw.columns, hash_bruto, df_proc, df_recordes, tabela_geo)
 
-    return df_proc, df_recordes
+        try:
+            snapshot_store.salvar_snapshot(chave, df_proc, df_recordes, extras={
+                'linhas_brutas': int(len(df_raw)), 'colunas_brutas': list(df_raw.columns), 'hash_bruto': hash_bruto,
+                'temporada_config': config.TEMPORADA_ATUAL,
+            })
+        except Exception as e:
+            print(f"⚠️ Não foi possível gravar o snapshot: {e}")
+        return df_proc, _juntar_recordes(df_recordes)
 
 # ---------------------------------------------------------
 # FUNÇÃO PRINCIPAL EXPORTADA
 # ---------------------------------------------------------
 def load_global_data(hora_mod):
+    ESTATISTICAS_CACHE['chamadas'] += 1 # Fora do cache: conta acertos e falhas
     try:
-        # A leitura bruta decide se precisa ir ao Excel ou se pega do cache
-        df_raw = _read_raw_excel(hora_mod)
-        # O processamento faz a matemática (também baseada em cache)
-        return _process_data(df_raw)
+        # Snapshot em disco quando o workbook não mudou; leitura + processamento do Excel caso contrário
+        return _carregar_base(hora_mod)
     except Exception as e:
         mensagem = f"Erro ao carregar dados: {e}"
         if st.runtime.exists():
@@ -117,3 +756,11 @@ def load_global_data(hora_mod):
             print(f"❌ {mensagem}")
         return pd.DataFrame(), pd.DataFrame()
 
+def carregar_base_completa(hora_mod):
+    """Temporada atual + todas as temporadas arquivadas (treino dos modelos)."""
+    df_atual, df_recordes = load_global_data(hora_mod)
+    temporadas = listar_temporadas_arquivadas()
+    if not temporadas:
+        return df_atual, df_recordes
+    df_antigo, _ = carregar_temporadas(temporadas)
+    return ordenar_base(concatenar_bases([df_antigo, df_atual])), df_recordes
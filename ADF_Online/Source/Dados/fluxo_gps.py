@@ -0,0 +1,306 @@
+import os
+import csv
+import json
+import time
+import threading
+import socketserver
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+import Source.Dados.config as config
+from Source.Dados.data_loader import (
+    _transformar_linhas, _juntar_geo, construir_tabela_geo, _aplicar_schema, _calcular_acumulados, _calcular_recordes,
+    concatenar_bases, ordenar_base, CHAVE_BLOCO,
+)
+
+# ---------------------------------------------------------
+# INGESTÃO EM FLUXO (JOGO AO VIVO)
+# ---------------------------------------------------------
+# Em dia de jogo as linhas chegam por atleta e por minuto (ou mais fino) sem
+# esperar que alguém grave o Excel:
+#   'socket'   -> NDJSON (um objeto JSON por linha) em 127.0.0.1:PORTA_FLUXO
+#   'ficheiro' -> ARQUIVO_FLUXO a crescer (NDJSON, ou CSV com cabeçalho)
+# Cada atleta tem um buffer circular pré-alocado. A cada versão, a thread de
+# ingestão tira dos buffers só as linhas que ainda não viu, passa-as pelo pipeline
+# do Excel e refaz apenas os blocos (atleta × período) em que elas caem, como a
+# ingestão incremental do Excel. O jogo processado fica guardado e entra na base
+# histórica entre duas fatias dela: as páginas recebem o mesmo (df, df_recordes).
+
+# Colunas brutas guardadas nos buffers (o Name é a chave do buffer)
+COLS_NUMERICAS_FLUXO = [c for c in dict.fromkeys(config.COLS_METRICAS_PREENCHER_ZERO) if c not in ('Latitude', 'Longitude')]
+COLS_TEXTO_FLUXO = [c for c in dict.fromkeys(config.COLUNAS_NECESSARIAS) if c not in COLS_NUMERICAS_FLUXO and c != 'Name']
+
+ESTADO_FLUXO = {
+    'modo': None, 'linhas': 0, 'descartadas': 0, 'atletas': 0, 'jogo': None,
+    'ultima_linha_em': None, 'segundos_processamento': None, 'linhas_processadas': 0,
+}
+
+class CargaFluxo(NamedTuple):
+    df: pd.DataFrame          # Base histórica + jogo ao vivo, ordenada (o que as páginas recebem)
+    df_recordes: pd.DataFrame
+    df_jogo: pd.DataFrame     # Só o jogo ao vivo, processado
+    inicio_jogo: int          # Linha do df onde começa o jogo ao vivo
+    # Base histórica sem o jogo ao vivo: o mesmo objeto enquanto o Excel e o jogo não mudam
+    # (a ingestão guarda os derivados dela). None se a base tiver jogos depois do ao vivo.
+    df_hist: pd.DataFrame
+
+def _numero(valor):
+    """Número do feed (aceita vírgula decimal, como no Excel); vazio ou inválido vira NaN."""
+    if valor is None or valor == '':
+        return np.nan
+    if isinstance(valor, str):
+        valor = valor.strip().replace(',', '.')
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return np.nan
+
+class BufferAtleta:
+    """Buffer circular pré-alocado com as linhas de um atleta; quando enche, a mais antiga é sobrescrita."""
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.numeros = np.full((capacidade, len(COLS_NUMERICAS_FLUXO)), np.nan)
+        self.textos = np.empty((capacidade, len(COLS_TEXTO_FLUXO)), dtype=object)
+        self.total = 0 # Linhas recebidas desde o início do jogo (a posição é total % capacidade)
+
+    def __len__(self):
+        return min(self.total, self.capacidade)
+
+    def adicionar(self, linha):
+        i = self.total % self.capacidade
+        self.numeros[i] = [_numero(linha.get(c)) for c in COLS_NUMERICAS_FLUXO]
+        self.textos[i] = [linha.get(c) for c in COLS_TEXTO_FLUXO]
+        self.total += 1
+
+    def posicoes(self):
+        """Posições ocupadas, da linha mais antiga para a mais recente."""
+        return np.arange(self.total - len(self), self.total) % self.capacidade
+
+class _TratadorSocket(socketserver.StreamRequestHandler):
+    def handle(self):
+        for bruto in self.rfile:
+            self.server.fluxo.receber(bruto.decode('utf-8', errors='replace'))
+
+class _ServidorSocket(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class FluxoGPS:
+    """
+    Estado do jogo ao vivo recebido em fluxo. `ao_receber` é chamado a cada linha aceite
+    (a ingestão só marca que há dados novos; o processamento fica para a thread dela).
+    """
+
+    def __init__(self, ao_receber=None, capacidade=None):
+        self.ao_receber = ao_receber
+        self.capacidade = capacidade or config.CAPACIDADE_BUFFER_ATLETA
+        self._buffers = {}
+        self._jogo = None
+        self._versao = 0
+        self._processadas = {} # Por atleta: buffer.total já processado (as linhas seguintes são as novas)
+        self._jogo_processado = None
+        self._df_jogo = pd.DataFrame()
+        self._separacao = (None, None, None) # (df_hist, jogo, fatias): refeita só quando o Excel ou o jogo mudam
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._servidor = None
+        self.modo = None
+
+    @property
+    def versao(self):
+        return self._versao
+
+    # --- Entrada ---------------------------------------------------------
+    def iniciar(self, modo, porta=None, caminho=None):
+        self.modo = modo
+        if modo == 'socket':
+            try:
+                self._servidor = _ServidorSocket(('127.0.0.1', porta or config.PORTA_FLUXO), _TratadorSocket)
+            except OSError as e:
+                print(f"⚠️ Fluxo GPS: porta {porta or config.PORTA_FLUXO} indisponível ({e})")
+                return self
+            self._servidor.fluxo = self
+            threading.Thread(target=self._servidor.serve_forever, name='adf-fluxo-socket', daemon=True).start()
+        elif modo == 'ficheiro':
+            threading.Thread(
+                target=self._seguir_ficheiro, args=(caminho or config.ARQUIVO_FLUXO,), name='adf-fluxo-ficheiro', daemon=True
+            ).start()
+        ESTADO_FLUXO['modo'] = modo
+        return self
+
+    def parar(self):
+        self._parar.set()
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+
+    def receber(self, texto):
+        """Uma linha NDJSON do feed."""
+        texto = texto.strip()
+        if not texto:
+            return
+        try:
+            linha = json.loads(texto)
+        except json.JSONDecodeError:
+            linha = None
+        if not isinstance(linha, dict):
+            ESTADO_FLUXO['descartadas'] += 1
+            return
+        self.adicionar(linha)
+
+    def adicionar(self, linha):
+        """Guarda uma linha (dict com as colunas brutas do Excel) no buffer do atleta."""
+        nome = linha.get('Name')
+        if not nome:
+            ESTADO_FLUXO['descartadas'] += 1
+            return
+        jogo = str(linha.get('Data'))
+        with self._lock:
+            if jogo != self._jogo: # Primeira linha de outro jogo: os buffers recomeçam
+                self._buffers, self._processadas = {}, {}
+                self._jogo = jogo
+            buffer = self._buffers.get(nome)
+            if buffer is None:
+                buffer = self._buffers[nome] = BufferAtleta(self.capacidade)
+            buffer.adicionar(linha)
+            self._versao += 1
+            ESTADO_FLUXO.update({'linhas': ESTADO_FLUXO['linhas'] + 1, 'atletas': len(self._buffers), 'jogo': jogo})
+        ESTADO_FLUXO['ultima_linha_em'] = time.time()
+        if self.ao_receber is not None:
+            self.ao_receber()
+
+    def _seguir_ficheiro(self, caminho, intervalo_s=0.2):
+        """Lê o que for sendo acrescentado ao ficheiro (recomeça do zero se ele for truncado ou recriado)."""
+        csv_ = caminho.lower().endswith('.csv')
+        posicao, resto, cabecalho, separador = 0, b'', None, ','
+        while not self._parar.is_set():
+            try:
+                tamanho = os.path.getsize(caminho)
+            except FileNotFoundError:
+                tamanho = None
+            if tamanho is None or tamanho == posicao:
+                self._parar.wait(intervalo_s)
+                continue
+            if tamanho < posicao:
+                posicao, resto, cabecalho = 0, b'', None
+            with open(caminho, 'rb') as f:
+                f.seek(posicao)
+                bloco = f.read()
+            posicao += len(bloco)
+            *completas, resto = (resto + bloco).split(b'\n') # A última pode estar a meio de ser escrita
+            for bruto in completas:
+                texto = bruto.decode('utf-8-sig', errors='replace').strip()
+                if not csv_:
+                    self.receber(texto)
+                elif cabecalho is None:
+                    separador = ';' if texto.count(';') > texto.count(',') else ','
+                    cabecalho = [c.strip() for c in next(csv.reader([texto], delimiter=separador))]
+                elif texto:
+                    self.adicionar(dict(zip(cabecalho, next(csv.reader([texto], delimiter=separador)))))
+
+    # --- Saída -----------------------------------------------------------
+    @staticmethod
+    def _montar(partes):
+        """Frame bruto (colunas do Excel) a partir de [(nome, números, textos)] tirados dos buffers."""
+        if not partes:
+            return pd.DataFrame()
+        df = pd.DataFrame(np.concatenate([numeros for _, numeros, _ in partes]), columns=COLS_NUMERICAS_FLUXO)
+        textos = np.concatenate([t for _, _, t in partes])
+        for j, col in enumerate(COLS_TEXTO_FLUXO):
+            df[col] = textos[:, j]
+        df.insert(0, 'Name', np.repeat([nome for nome, _, _ in partes], [len(n) for _, n, _ in partes]))
+        return df
+
+    def frame(self):
+        """Linhas brutas do jogo ao vivo, no mesmo formato do Excel (uma linha por atleta/período/minuto)."""
+        with self._lock:
+            partes = [(nome, b.numeros[b.posicoes()], b.textos[b.posicoes()]) for nome, b in self._buffers.items()]
+        df = self._montar(partes)
+        if df.empty:
+            return df
+        # Reenvios do feed (mesmo atleta/período/minuto): fica a última leitura
+        return df.drop_duplicates(subset=['Name', 'Período', 'Interval'], keep='last', ignore_index=True)
+
+    def _linhas_novas(self):
+        """(jogo, frame bruto) só com as linhas chegadas desde a última chamada; marca-as como processadas."""
+        with self._lock:
+            partes = []
+            for nome, b in self._buffers.items():
+                # Se o buffer já deu a volta, as mais antigas por processar perderam-se: ficam as que restam
+                posicoes = np.arange(max(self._processadas.get(nome, 0), b.total - len(b)), b.total) % b.capacidade
+                if posicoes.size:
+                    partes.append((nome, b.numeros[posicoes], b.textos[posicoes]))
+                self._processadas[nome] = b.total
+            jogo = self._jogo
+        return jogo, self._montar(partes)
+
+    def _atualizar_jogo(self):
+        """
+        Leva as linhas novas ao jogo processado: pipeline do Excel só nelas e acumulados
+        refeitos só nos blocos (atleta/jogo/período) em que caem. Devolve o nº de linhas novas.
+        """
+        jogo, df_bruto = self._linhas_novas()
+        if jogo != self._jogo_processado:
+            self._jogo_processado, self._df_jogo = jogo, pd.DataFrame()
+        if df_bruto.empty:
+            return 0
+        df_novas = _aplicar_schema(_juntar_geo(_transformar_linhas(df_bruto), construir_tabela_geo(df_bruto)))
+        intocados = self._df_jogo
+        if not intocados.empty:
+            blocos = pd.MultiIndex.from_frame(df_novas[CHAVE_BLOCO].drop_duplicates())
+            tocados = pd.MultiIndex.from_frame(intocados[CHAVE_BLOCO]).isin(blocos)
+            df_novas = concatenar_bases([intocados[tocados], df_novas])
+            intocados = intocados[~tocados]
+        # Reenvios do feed (mesmo atleta/período/minuto): fica a última leitura
+        refeitos = df_novas.drop_duplicates(subset=['Name', 'Período', 'Interval'], keep='last', ignore_index=True)
+        self._df_jogo = ordenar_base(concatenar_bases([intocados, _calcular_acumulados(refeitos)]))
+        return len(df_bruto)
+
+    def _separar(self, df_hist, data):
+        """
+        (antes, depois, base sem o jogo) da base histórica ordenada: o jogo ao vivo entra entre as
+        duas fatias, achadas por busca binária na Data (o mesmo jogo vindo do Excel fica de fora).
+        Guardado até o df_hist ou o jogo mudarem.
+        """
+        guardado_hist, guardado_jogo, fatias = self._separacao
+        if guardado_hist is df_hist and guardado_jogo == data:
+            return fatias
+        if df_hist.empty:
+            fatias = (df_hist, df_hist, df_hist)
+        else:
+            datas = df_hist['Data'].to_numpy()
+            validas = np.searchsorted(np.isnat(datas), True) # Datas vazias ficam no fim
+            alvo = pd.Timestamp(data).to_datetime64()
+            i = np.searchsorted(datas[:validas], alvo, side='left')
+            j = np.searchsorted(datas[:validas], alvo, side='right')
+            antes, depois = df_hist.iloc[:i], df_hist.iloc[j:]
+            # Com jogos depois do ao vivo (replay de um jogo antigo) os derivados deles dependem dele
+            fatias = (antes, depois, concatenar_bases([antes, depois]) if j == validas and not pd.isna(data) else None)
+        self._separacao = (df_hist, data, fatias)
+        return fatias
+
+    def carregar(self, df_hist, df_recordes, janelas=None):
+        """
+        Base histórica + jogo ao vivo, no formato de load_global_data, como CargaFluxo.
+        Só as linhas chegadas desde a última chamada são processadas; o jogo ao vivo substitui
+        o mesmo jogo vindo do Excel e a base entra inteira, sem reordenar nem reprocessar.
+        Com `janelas` (JanelasVivo), os recordes do jogo ao vivo saem do estado incremental dele.
+        """
+        inicio = time.perf_counter()
+        novas = self._atualizar_jogo()
+        df_jogo = self._df_jogo
+        if df_jogo.empty:
+            return CargaFluxo(df_hist, df_recordes, df_jogo.iloc[0:0], len(df_hist), None)
+        antes, depois, df_sem_jogo = self._separar(df_hist, df_jogo['Data'].iat[0])
+        df = concatenar_bases([antes, df_jogo, depois])
+        if janelas is not None:
+            janelas.atualizar(df_jogo)
+            recordes_vivo = janelas.recordes()
+        else:
+            recordes_vivo = _calcular_recordes(df_jogo)
+        recordes = [r.assign(Name=r['Name'].astype(str)) for r in (df_recordes, recordes_vivo) if not r.empty]
+        df_recordes = pd.concat(recordes, ignore_index=True).groupby('Name').max().reset_index()
+        ESTADO_FLUXO['segundos_processamento'] = time.perf_counter() - inicio
+        ESTADO_FLUXO['linhas_processadas'] += novas
+        return CargaFluxo(df, df_recordes, df_jogo, len(antes), df_sem_jogo)
@@ -0,0 +1,213 @@
+import time
+import threading
+from types import MappingProxyType
+from typing import NamedTuple
+import pandas as pd
+import streamlit as st
+import Source.Dados.config as config
+from Source.Dados.data_loader import (
+    load_global_data, obter_hora_modificacao, extrair_tabela_geo, construir_cubo_jogos, construir_indice_blocos,
+    carregar_cubo_arquivado, concatenar_bases, CHAVE_CUBO,
+)
+from Source.Dados.monitor_arquivo import MonitorArquivo
+from Source.Dados.fluxo_gps import FluxoGPS
+from Source.Dados.janelas_vivo import JanelasVivo
+import Source.Dados.base_analitica as base_analitica
+from Source.ML.features_historicas import (
+    construir_features_historicas, construir_curvas_minuto, somar_curvas, features_proximo_jogo, features_jogo_ao_vivo,
+)
+
+# ---------------------------------------------------------
+# SERVIÇO DE INGESTÃO EM SEGUNDO PLANO (UM POR PROCESSO)
+# ---------------------------------------------------------
+# Uma única thread processa os dados quando o monitor do Excel avisa que o
+# ficheiro mudou (inotify + debounce). Cada carga nova vira um snapshot
+# numerado e imutável; as páginas só comparam o número da versão.
+# Com config.MODO_FLUXO, as linhas do jogo ao vivo chegam pelo FluxoGPS e
+# entram na mesma publicação (o Excel continua a ser a base histórica). Os
+# derivados da base histórica ficam guardados por versão do Excel e jogo ao vivo;
+# a cada versão do fluxo só os do jogo são refeitos e juntados a eles.
+
+class SnapshotDados(NamedTuple):
+    versao: int
+    hora_mod: float
+    df: pd.DataFrame
+    df_recordes: pd.DataFrame
+    derivados: MappingProxyType
+    criado_em: float
+
+SNAPSHOT_VAZIO = SnapshotDados(0, 0, pd.DataFrame(), pd.DataFrame(), MappingProxyType({}), 0.0)
+
+def _tabela_jogos(df):
+    return (
+        df[['Data', 'Data_Display', 'Competição', 'Adversário']]
+        .drop_duplicates(subset=['Data'])
+        .sort_values(by='Data', ascending=False)
+        .reset_index(drop=True)
+    )
+
+def construir_derivados(df):
+    """Tabelas pequenas derivadas da base, calculadas uma vez por versão."""
+    if df.empty:
+        return {}
+    cubo = construir_cubo_jogos(df)
+    return {
+        'jogos': _tabela_jogos(df),
+        'geo': extrair_tabela_geo(df),                 # Por jogo: coordenada, distância de viagem e casa/fora
+        'cubo': cubo,                                  # Atleta × jogo × período: as páginas fatiam-no em vez de agrupar a base
+        'indice': construir_indice_blocos(df),         # [inicio, fim) dos blocos da base ordenada (get_game / get_minutes)
+        # Features históricas do ML (as do treino, com as temporadas arquivadas no histórico): a inferência só faz lookup
+        'features': construir_features_historicas(df, cubo, carregar_cubo_arquivado()),
+        'curvas': construir_curvas_minuto(df),         # Somas por minuto: referências dos deltas do Live Tracker sem agrupar a base
+    }
+
+def construir_derivados_base(df_hist, data_jogo):
+    """
+    Derivados da base histórica sem o jogo ao vivo (CargaFluxo.df_hist), uma vez por versão do
+    Excel e por jogo ao vivo, mais as features históricas do jogo ao vivo ainda vazio.
+    """
+    derivados = construir_derivados(df_hist)
+    derivados['features_proximo'] = features_proximo_jogo(df_hist, derivados['cubo'], carregar_cubo_arquivado(), data_jogo)
+    return derivados
+
+def juntar_derivados(base, df_jogo, inicio_jogo):
+    """
+    Derivados da base + jogo ao vivo a partir dos da base (construir_derivados_base): só o jogo
+    é agregado. O jogo é o último da base, por isso os blocos dela não mudam de posição.
+    """
+    cubo_jogo = construir_cubo_jogos(df_jogo)
+    indice_jogo = construir_indice_blocos(df_jogo) + inicio_jogo
+    return {
+        'jogos': concatenar_bases([_tabela_jogos(df_jogo), base['jogos']]),
+        'geo': pd.concat([base['geo'], extrair_tabela_geo(df_jogo)]).sort_index(),
+        'cubo': concatenar_bases([base['cubo'], cubo_jogo]).sort_values(CHAVE_CUBO, ignore_index=True),
+        'indice': pd.concat([base['indice'], indice_jogo]).sort_index(),
+        'features': pd.concat([base['features'], features_jogo_ao_vivo(base['features_proximo'], df_jogo, cubo_jogo)]).sort_index(),
+        'curvas': somar_curvas(base['curvas'], construir_curvas_minuto(df_jogo)),
+    }
+
+class ServicoIngestao:
+    def __init__(self, intervalo_s):
+        # Rede de segurança: mesmo sem eventos, verifica o mtime a cada `intervalo_s`
+        self.intervalo_s = intervalo_s
+        self._snapshot = SNAPSHOT_VAZIO
+        self._lock = threading.Lock()
+        self._pronto = threading.Event()
+        self._mudou = threading.Event()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='adf-ingestao', daemon=True)
+        self.monitor = MonitorArquivo(
+            config.ARQUIVO_ORIGINAL, self.avisar_mudanca,
+            debounce_s=config.DEBOUNCE_EXCEL_S, intervalo_polling_s=intervalo_s,
+        )
+        self.fluxo = FluxoGPS(self.avisar_mudanca) if config.MODO_FLUXO else None
+        self.janelas = JanelasVivo() # Estado incremental das janelas móveis do jogo mais recente
+        self._versao_fluxo = 0
+        self._ultima_verificacao = 0.0
+        self._base_excel = (None, pd.DataFrame(), pd.DataFrame()) # (hora_mod, df, df_recordes) da base histórica
+        self._derivados_base = (None, None) # (CargaFluxo.df_hist, construir_derivados_base dela)
+
+    def iniciar(self):
+        if not self._thread.is_alive():
+            self.monitor.iniciar()
+            if self.fluxo is not None:
+                self.fluxo.iniciar(config.MODO_FLUXO)
+            self._thread.start()
+        return self
+
+    def parar(self):
+        self.monitor.parar()
+        if self.fluxo is not None:
+            self.fluxo.parar()
+        self._parar.set()
+        self._mudou.set()
+
+    def avisar_mudanca(self):
+        self._mudou.set()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                self.verificar()
+            except Exception as e:
+                print(f"❌ Ingestão falhou: {e}")
+            finally:
+                self._pronto.set() # Mesmo em erro, as páginas não ficam bloqueadas à espera
+            # Acorda logo que o monitor avisa; o timeout só cobre eventos perdidos
+            self._mudou.wait(self.intervalo_s * 6)
+            self._mudou.clear()
+            if self.fluxo is not None:
+                # Linhas do fluxo em rajada: no máximo uma versão a cada INTERVALO_FLUXO_S
+                self._parar.wait(max(config.INTERVALO_FLUXO_S - (time.monotonic() - self._ultima_verificacao), 0))
+
+    def verificar(self):
+        """Processa e publica uma versão nova apenas se o Excel (ou o fluxo ao vivo) mudou."""
+        self._ultima_verificacao = time.monotonic()
+        hora_mod = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
+        versao_fluxo = self.fluxo.versao if self.fluxo is not None else 0
+        if self._snapshot.versao > 0 and hora_mod == self._snapshot.hora_mod and versao_fluxo == self._versao_fluxo:
+            return False
+
+        if self.fluxo is None:
+            df, df_recordes = load_global_data(hora_mod)
+            self.janelas.atualizar(df)
+            derivados = construir_derivados(df)
+        else:
+            if hora_mod != self._base_excel[0]:
+                # Sem Excel (só o feed ao vivo) não há base histórica para carregar
+                self._base_excel = (hora_mod, *(load_global_data(hora_mod) if hora_mod else (pd.DataFrame(), pd.DataFrame())))
+            carga = self.fluxo.carregar(self._base_excel[1], self._base_excel[2], self.janelas)
+            self._versao_fluxo = versao_fluxo
+            df, df_recordes = carga.df, carga.df_recordes
+            derivados = self._derivados_fluxo(carga)
+        if df.empty:
+            return False # Mantém a última versão boa
+        self._publicar(hora_mod, df, df_recordes, derivados)
+        return True
+
+    def _derivados_fluxo(self, carga):
+        """Derivados de uma versão do fluxo: os da base histórica só são refeitos quando o Excel ou o jogo mudam."""
+        if carga.df_hist is None or carga.df_hist.empty or carga.df_jogo.empty:
+            # Jogo ao vivo antes de outros da base, só o feed (a base é o jogo) ou ainda sem linhas: tudo de uma vez
+            return construir_derivados(carga.df)
+        if self._derivados_base[0] is not carga.df_hist:
+            self._derivados_base = (carga.df_hist, construir_derivados_base(carga.df_hist, carga.df_jogo['Data'].iat[0]))
+        return juntar_derivados(self._derivados_base[1], carga.df_jogo, carga.inicio_jogo)
+
+    def _publicar(self, hora_mod, df, df_recordes, derivados):
+        # Janelas móveis do jogo ao vivo: já atualizadas em verificar (só os minutos novos)
+        derivados = MappingProxyType({
+            **derivados, 'janelas_vivo': self.janelas.tabela, 'jogo_vivo': self.janelas.jogo,
+        })
+        anterior = self._snapshot
+        with self._lock:
+            self._snapshot = SnapshotDados(
+                self._snapshot.versao + 1, hora_mod, df, df_recordes, derivados, time.time()
+            )
+        self._pronto.set()
+        if anterior.versao > 0 and hora_mod == anterior.hora_mod:
+            return # Só o jogo ao vivo mudou: a base analítica acompanha o Excel, não cada minuto do fluxo
+        # Depois de publicar: as páginas não esperam pela gravação da base analítica
+        try:
+            base_analitica.publicar(self._snapshot.versao, derivados.get('cubo', pd.DataFrame()))
+        except Exception as e:
+            print(f"⚠️ Base analítica não atualizada: {e}")
+
+    def snapshot(self, timeout=None):
+        self._pronto.wait(timeout)
+        return self._snapshot
+
+    @property
+    def versao(self):
+        return self._snapshot.versao
+
+@st.cache_resource(show_spinner=False)
+def obter_servico():
+    """Singleton do processo: todas as sessões e páginas partilham a mesma thread."""
+    return ServicoIngestao(config.INTERVALO_INGESTAO_S).iniciar()
+
+def obter_snapshot(timeout=60):
+    return obter_servico().snapshot(timeout)
+
+def versao_atual():
+    return obter_servico().versao
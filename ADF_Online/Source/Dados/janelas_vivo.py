@@ -0,0 +1,168 @@
+import time
+import numpy as np
+import pandas as pd
+import Source.Dados.config as config
+from Source.Dados.data_loader import MAPA_RECORDES, JANELAS_PICO, coluna_pico
+
+# ---------------------------------------------------------
+# JANELAS MÓVEIS DO JOGO AO VIVO (ESTADO INCREMENTAL)
+# ---------------------------------------------------------
+# Por atleta × período do jogo mais recente, um rastreador guarda a soma atual de
+# cada janela do JANELAS_PICO, o pico de cada janela, o total e o minuto da última
+# ação de alta intensidade (HIA > 0). Cada minuto novo atualiza o estado em tempo
+# constante: entra o minuto novo e sai, de cada janela, o que ficou N linhas para
+# trás (buffer circular das últimas max(JANELAS_PICO) linhas).
+# A ingestão só empurra os minutos que o rastreador ainda não viu; se o que ele já
+# viu mudou (minuto reenviado pelo feed, correção no Excel), só esse atleta/período
+# é refeito. As páginas leem a tabela publicada em vez de refatiar a base.
+
+METRICAS_JANELA = list(MAPA_RECORDES)
+
+ESTADO_JANELAS = {'jogo': None, 'linhas': 0, 'reconstrucoes': 0, 'segundos': None}
+
+def coluna_janela(coluna, janela):
+    """Soma atual da janela: coluna_janela('Total Distance', 5) -> 'Janela_5min_Dist_Total'."""
+    return f"Janela_{janela}min_{MAPA_RECORDES[coluna]}"
+
+def coluna_total(coluna):
+    return f"Total_{MAPA_RECORDES[coluna]}"
+
+class RastreadorAtleta:
+    """Somas móveis, picos e total de um atleta num período, atualizados minuto a minuto."""
+
+    def __init__(self, janelas=JANELAS_PICO, n_metricas=len(METRICAS_JANELA)):
+        self.janelas = np.asarray(janelas)
+        self.capacidade = int(self.janelas.max())
+        self.ultimas = np.zeros((self.capacidade, n_metricas)) # Buffer circular das últimas linhas
+        self.somas = np.zeros((len(self.janelas), n_metricas))
+        self.picos = np.zeros((len(self.janelas), n_metricas))
+        self.total = np.zeros(n_metricas)
+        self.linhas = 0
+        self.minuto = None
+        self.minuto_hia = None
+
+    def adicionar(self, minuto, valores, hia):
+        i = self.linhas
+        # Sai de cada janela a linha i - N (nada enquanto a janela ainda não encheu)
+        saem = self.ultimas[(i - self.janelas) % self.capacidade] * (i >= self.janelas)[:, None]
+        self.somas += valores - saem
+        np.maximum(self.picos, self.somas, out=self.picos)
+        self.ultimas[i % self.capacidade] = valores
+        self.total += valores
+        self.linhas += 1
+        self.minuto = minuto
+        if hia > 0:
+            self.minuto_hia = minuto
+
+class JanelasVivo:
+    """Rastreadores do jogo mais recente da base, um por atleta × período."""
+
+    def __init__(self, janelas=JANELAS_PICO):
+        self.janelas = tuple(janelas)
+        self.jogo = None
+        self._rastreadores = {}
+        self._tabela = pd.DataFrame()
+
+    @property
+    def tabela(self):
+        """Estado publicado: uma linha por atleta × período do jogo ao vivo (ver _montar_tabela)."""
+        return self._tabela
+
+    def atualizar(self, df):
+        """
+        Empurra os minutos novos do jogo mais recente de `df` (ordenado por ordenar_base)
+        e devolve a tabela do estado. Custo por versão: os minutos novos, não o jogo inteiro.
+        """
+        inicio = time.perf_counter()
+        df_jogo = _ultimo_jogo(df)
+        if df_jogo.empty:
+            return self._tabela
+        jogo = df_jogo['Data'].iat[0]
+        if jogo != self.jogo:
+            self.jogo, self._rastreadores = jogo, {}
+
+        valores = np.nan_to_num(df_jogo.reindex(columns=METRICAS_JANELA).to_numpy(dtype=np.float64))
+        acumulados = df_jogo.reindex(columns=[config.COLUNAS_ACUMULADAS.get(c) for c in METRICAS_JANELA]).to_numpy(dtype=np.float64)
+        minutos = df_jogo['Interval'].to_numpy()
+        hia = valores[:, METRICAS_JANELA.index('HIA')] if 'HIA' in df_jogo.columns else np.zeros(len(df_jogo))
+
+        blocos = df_jogo.groupby(['Período', 'Name'], observed=True, sort=False).ngroup().to_numpy()
+        inicios = np.flatnonzero(np.diff(blocos, prepend=-2) != 0)
+        fins = np.append(inicios[1:], len(blocos))
+        nomes, periodos = df_jogo['Name'].to_numpy(), df_jogo['Período'].to_numpy()
+        linhas_novas = 0
+        for a, b in zip(inicios, fins):
+            if blocos[a] < 0:
+                continue
+            chave = (nomes[a], periodos[a])
+            rastreador = self._rastreadores.get(chave)
+            if rastreador is not None and not _prefixo_igual(rastreador, a, b, minutos, acumulados):
+                rastreador = None
+                ESTADO_JANELAS['reconstrucoes'] += 1
+            if rastreador is None:
+                rastreador = self._rastreadores[chave] = RastreadorAtleta(self.janelas)
+            for i in range(a + rastreador.linhas, b):
+                rastreador.adicionar(minutos[i], valores[i], hia[i])
+                linhas_novas += 1
+
+        self._tabela = self._montar_tabela()
+        ESTADO_JANELAS.update({
+            'jogo': jogo, 'linhas': ESTADO_JANELAS['linhas'] + linhas_novas, 'segundos': time.perf_counter() - inicio,
+        })
+        return self._tabela
+
+    def _montar_tabela(self):
+        """Uma linha por atleta × período: minuto atual, minutos sem HIA, somas das janelas, picos e totais."""
+        chaves = list(self._rastreadores)
+        rastreadores = list(self._rastreadores.values())
+        if not rastreadores:
+            return pd.DataFrame()
+        tabela = {
+            'Name': [nome for nome, _ in chaves], 'Período': [periodo for _, periodo in chaves],
+            'Minuto': [r.minuto for r in rastreadores],
+            'Min_Desde_HIA': [r.minuto - r.minuto_hia if r.minuto_hia is not None else np.nan for r in rastreadores],
+        }
+        somas = np.stack([r.somas for r in rastreadores])
+        picos = np.stack([r.picos for r in rastreadores])
+        totais = np.stack([r.total for r in rastreadores])
+        for j, coluna in enumerate(METRICAS_JANELA):
+            for k, janela in enumerate(self.janelas):
+                tabela[coluna_janela(coluna, janela)] = somas[:, k, j]
+                tabela[coluna_pico(coluna, janela)] = picos[:, k, j]
+            tabela[coluna_total(coluna)] = totais[:, j]
+        return pd.DataFrame(tabela)
+
+    def recordes(self):
+        """Picos do jogo ao vivo por atleta (máximo dos períodos), no formato de df_recordes."""
+        if self._tabela.empty:
+            return pd.DataFrame()
+        cols = [coluna_pico(c, j) for c in METRICAS_JANELA for j in self.janelas]
+        return self._tabela.groupby('Name')[cols].max().reset_index()
+
+def _ultimo_jogo(df):
+    """Linhas do jogo mais recente de uma base ordenada por Data (vazios no fim): duas buscas binárias."""
+    if df.empty:
+        return df
+    datas = df['Data'].to_numpy()
+    validas = np.searchsorted(np.isnat(datas), True) # Datas vazias ficam no fim
+    if validas == 0:
+        return df.iloc[0:0]
+    jogo = datas[validas - 1]
+    return df.iloc[np.searchsorted(datas[:validas], jogo, side='left'):validas]
+
+def _prefixo_igual(rastreador, inicio, fim, minutos, acumulados):
+    """As linhas que o rastreador já viu continuam iguais? (minuto e acumulados da última delas)"""
+    if rastreador.linhas == 0:
+        return True
+    i = inicio + rastreador.linhas - 1
+    if i >= fim or minutos[i] != rastreador.minuto:
+        return False
+    conhecidos = ~np.isnan(acumulados[i])
+    return np.allclose(acumulados[i][conhecidos], rastreador.total[conhecidos], rtol=1e-4, atol=1e-2)
+
+def estado_atleta(df_janelas, nome, periodo):
+    """Linha do estado ao vivo de um atleta/período (Series) ou None se ele não estiver no jogo ao vivo."""
+    if df_janelas is None or df_janelas.empty:
+        return None
+    linha = df_janelas[(df_janelas['Name'] == nome) & (df_janelas['Período'] == periodo)]
+    return linha.iloc[0] if not linha.empty else None
@@ -0,0 +1,97 @@
+import os
+import time
+import threading
+
+# watchdog usa inotify no Linux (FSEvents no macOS, ReadDirectoryChangesW no Windows).
+# Sem ele, cai para verificação periódica do mtime.
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# ---------------------------------------------------------
+# MONITOR DO EXCEL (eventos do sistema de ficheiros + debounce)
+# ---------------------------------------------------------
+# O Excel grava em várias etapas (ficheiro temporário, rename, escritas parciais).
+# Cada evento reinicia o debounce; quando os eventos param, o monitor ainda
+# espera o tamanho/mtime estabilizarem antes de avisar que há dados novos.
+
+def _assinatura(caminho):
+    try:
+        info = os.stat(caminho)
+        return (info.st_size, info.st_mtime)
+    except FileNotFoundError:
+        return None
+
+class _TratadorEventos(FileSystemEventHandler):
+    def __init__(self, monitor):
+        self.monitor = monitor
+
+    def on_any_event(self, event):
+        caminhos = {getattr(event, 'src_path', None), getattr(event, 'dest_path', None)}
+        if self.monitor.caminho in {os.path.abspath(c) for c in caminhos if c}:
+            self.monitor.agendar()
+
+class MonitorArquivo:
+    def __init__(self, caminho, ao_mudar, debounce_s=0.3, estabilidade_s=0.15, intervalo_polling_s=5):
+        self.caminho = os.path.abspath(caminho)
+        self.ao_mudar = ao_mudar
+        self.debounce_s = debounce_s
+        self.estabilidade_s = estabilidade_s
+        self.intervalo_polling_s = intervalo_polling_s
+        self._timer = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._observer = None
+        self.modo = None
+
+    def iniciar(self):
+        pasta = os.path.dirname(self.caminho)
+        if Observer is not None and os.path.isdir(pasta):
+            self._observer = Observer()
+            self._observer.schedule(_TratadorEventos(self), pasta, recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+            self.modo = 'eventos'
+        else:
+            threading.Thread(target=self._loop_polling, name='adf-monitor-polling', daemon=True).start()
+            self.modo = 'polling'
+        return self
+
+    def parar(self):
+        self._parar.set()
+        if self._observer is not None:
+            self._observer.stop()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def agendar(self):
+        """Cada evento reinicia a contagem: só dispara depois de `debounce_s` sem eventos."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_s, self._confirmar_estavel)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _confirmar_estavel(self):
+        antes = _assinatura(self.caminho)
+        time.sleep(self.estabilidade_s)
+        depois = _assinatura(self.caminho)
+        if antes is None and depois is None:
+            return # Ficheiro removido: o próximo evento de criação volta a agendar
+        if antes != depois:
+            self.agendar() # Ainda a ser escrito (ou momentaneamente ausente no rename)
+            return
+        self.ao_mudar()
+
+    def _loop_polling(self):
+        ultima = _assinatura(self.caminho)
+        while not self._parar.wait(self.intervalo_polling_s):
+            atual = _assinatura(self.caminho)
+            if atual != ultima:
+                ultima = atual
+                self.agendar()
@@ -0,0 +1,133 @@
+import os
+import re
+import json
+import time
+import unicodedata
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import Source.Dados.config as config
+from Source.Dados.snapshot_store import _gravar_atomico, _escrever_json, _preparar_para_arrow
+
+# ---------------------------------------------------------
+# ARMAZENAMENTO PARTICIONADO (temporada → competição → jogo)
+# ---------------------------------------------------------
+# Jogos de temporadas anteriores saem da base em memória e ficam em
+#   Data_Files/particoes/<temporada>/<competição>/<AAAA-MM-DD>.arrow
+# (base já processada de um jogo, Arrow sem compressão). O manifesto guarda,
+# por jogo, a assinatura das linhas brutas que o geraram e os recordes dele
+# (picos de todas as janelas do JANELAS_PICO): só jogos com assinatura nova são reprocessados.
+# Jogos que deixam de existir no Excel continuam arquivados, por isso as
+# temporadas antigas podem ser retiradas do workbook depois de arquivadas.
+
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+def _caminho(*partes):
+    return os.path.join(config.DIRETORIO_PARTICOES, *partes)
+
+def _nome_pasta(texto):
+    """Nome de pasta seguro para a competição (sem acentos, espaços ou barras)."""
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Za-z0-9]+', '_', texto).strip('_') or 'Sem_Competicao'
+
+def temporada_de(datas):
+    """Temporada de cada data (ano civil do jogo). Aceita Series ou DatetimeIndex."""
+    datas = pd.to_datetime(datas, errors='coerce')
+    return datas.dt.year if isinstance(datas, pd.Series) else datas.year
+
+def ler_manifesto():
+    """Manifesto atual; vazio se não existir ou for de outra versão do processamento (força regravar)."""
+    try:
+        with open(_caminho(ARQUIVO_MANIFESTO), 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifesto = None
+    if manifesto is None or manifesto.get('versao_processamento') != config.VERSAO_PROCESSAMENTO:
+        return {'versao_processamento': config.VERSAO_PROCESSAMENTO, 'atualizado_em': 0.0, 'jogos': {}}
+    return manifesto
+
+def assinaturas_por_jogo(datas, hashes):
+    """Assinatura '<linhas>:<soma dos hashes>' das linhas brutas de cada jogo (chave: data ISO)."""
+    grupos = pd.Series(hashes, dtype='uint64').groupby(pd.to_datetime(datas, errors='coerce').to_numpy())
+    resumo = pd.DataFrame({'linhas': grupos.size(), 'soma': grupos.sum()})
+    return {
+        data.strftime('%Y-%m-%d'): f"{linhas}:{soma}"
+        for data, linhas, soma in zip(resumo.index, resumo['linhas'], resumo['soma'])
+    }
+
+def jogos_desatualizados(assinaturas, manifesto):
+    """Datas ISO cujo conteúdo bruto mudou (ou que ainda não foram arquivadas)."""
+    jogos = manifesto['jogos']
+    return [data for data, assinatura in assinaturas.items() if jogos.get(data, {}).get('assinatura') != assinatura]
+
+def gravar_jogos(df_proc, assinaturas, recordes_por_jogo):
+    """
+    Grava um ficheiro por jogo de `df_proc` (base processada) e atualiza o manifesto no fim.
+    `recordes_por_jogo`: {data ISO: DataFrame de recordes desse jogo (todas as janelas do JANELAS_PICO)}.
+    """
+    if df_proc.empty:
+        return None
+    manifesto = ler_manifesto()
+    opcoes = {'compression': 'uncompressed'}
+    for data, df_jogo in df_proc.groupby('Data', observed=True, sort=True):
+        chave = data.strftime('%Y-%m-%d')
+        competicao = df_jogo['Competição'].dropna()
+        relativo = os.path.join(
+            str(data.year), _nome_pasta(competicao.iloc[0] if not competicao.empty else ''), f"{chave}.arrow"
+        )
+        os.makedirs(os.path.dirname(_caminho(relativo)), exist_ok=True)
+        _gravar_atomico(_caminho(relativo), lambda p: feather.write_feather(_preparar_para_arrow(df_jogo.reset_index(drop=True)), p, **opcoes))
+
+        anterior = manifesto['jogos'].get(chave, {}).get('arquivo')
+        if anterior and anterior != relativo: # Competição renomeada: o jogo mudou de pasta
+            try:
+                os.remove(_caminho(anterior))
+            except FileNotFoundError:
+                pass
+        recordes = recordes_por_jogo.get(chave)
+        manifesto['jogos'][chave] = {
+            'arquivo': relativo,
+            'temporada': int(data.year),
+            'competicao': str(competicao.iloc[0]) if not competicao.empty else None,
+            'linhas': int(len(df_jogo)),
+            'assinatura': assinaturas.get(chave),
+            'recordes': recordes.to_dict(orient='records') if recordes is not None else [],
+        }
+    manifesto['atualizado_em'] = time.time()
+    _gravar_atomico(_caminho(ARQUIVO_MANIFESTO), lambda p: _escrever_json(p, manifesto))
+    return manifesto
+
+def listar_temporadas(manifesto=None):
+    manifesto = manifesto or ler_manifesto()
+    return sorted({jogo['temporada'] for jogo in manifesto['jogos'].values()})
+
+def versao_particoes(manifesto=None):
+    """Muda sempre que algum jogo é regravado (serve de chave de cache)."""
+    manifesto = manifesto or ler_manifesto()
+    return manifesto['atualizado_em']
+
+def ler_particoes(temporadas=None, competicoes=None):
+    """Lista de DataFrames (um por jogo) das temporadas/competições pedidas, lidos por inteiro para memória."""
+    partes = []
+    for jogo in ler_manifesto()['jogos'].values():
+        if temporadas is not None and jogo['temporada'] not in temporadas:
+            continue
+        if competicoes and jogo['competicao'] not in competicoes:
+            continue
+        try:
+            partes.append(feather.read_table(_caminho(jogo['arquivo']), memory_map=True).to_pandas())
+        except (FileNotFoundError, pa.ArrowInvalid, OSError) as e:
+            print(f"⚠️ Partição ilegível ({jogo['arquivo']}): {e}")
+    return partes
+
+def recordes_arquivados(temporadas=None, manifesto=None):
+    """Maior recorde por atleta (cada janela e métrica) entre os jogos arquivados."""
+    manifesto = manifesto or ler_manifesto()
+    linhas = [
+        recorde for jogo in manifesto['jogos'].values()
+        if temporadas is None or jogo['temporada'] in temporadas
+        for recorde in jogo['recordes']
+    ]
+    if not linhas:
+        return pd.DataFrame()
+    return pd.DataFrame(linhas).groupby('Name').max().reset_index()
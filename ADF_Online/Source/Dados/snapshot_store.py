@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import hashlib
+import pyarrow as pa
+import pyarrow.feather as feather
+import Source.Dados.config as config
+
+# ---------------------------------------------------------
+# SNAPSHOT COLUNAR DA BASE PROCESSADA (Arrow IPC / Feather v2)
+# ---------------------------------------------------------
+# Guarda a última saída boa do _process_data (base + recordes) em disco,
+# sem compressão: o ficheiro é mapeado e convertido para pandas numa só
+# cópia (carga completa em memória, sem descomprimir nem reprocessar).
+# A chave é (mtime, tamanho, hash do conteúdo) do workbook original.
+
+ARQUIVO_MANIFESTO = 'manifesto.json'
+ARQUIVO_DADOS = 'dados.arrow'
+ARQUIVO_RECORDES = 'recordes.arrow'
+
+def _caminho(nome):
+    return os.path.join(config.DIRETORIO_SNAPSHOT, nome)
+
+def calcular_hash_conteudo(caminho_ficheiro, tamanho_bloco=1 << 20):
+    """Hash BLAKE2b do ficheiro inteiro, lido em blocos de 1 MB."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho_ficheiro, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+def chave_de_conteudo(dados, mtime):
+    """Mesma chave do obter_chave(com_hash=True), a partir dos bytes já lidos para memória."""
+    return {'mtime': mtime, 'tamanho': len(dados), 'hash': hashlib.blake2b(dados, digest_size=16).hexdigest()}
+
+def obter_chave(caminho_ficheiro, com_hash=False):
+    """Chave barata (mtime + tamanho). O hash do conteúdo só é calculado quando pedido."""
+    try:
+        info = os.stat(caminho_ficheiro)
+        chave = {'mtime': info.st_mtime, 'tamanho': info.st_size}
+        if com_hash:
+            chave['hash'] = calcular_hash_conteudo(caminho_ficheiro)
+    except FileNotFoundError:
+        return None
+    return chave
+
+def ler_manifesto():
+    try:
+        with open(_caminho(ARQUIVO_MANIFESTO), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _gravar_atomico(caminho, escrever):
+    """Escreve num ficheiro temporário e troca de uma vez (nunca deixa um snapshot meio escrito)."""
+    temporario = caminho + '.tmp'
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+def _preparar_para_arrow(df):
+    """Colunas object com tipos misturados (ex.: números e textos) não cabem numa coluna Arrow: vão para string."""
+    df_out = df
+    for col in df.columns[df.dtypes == object]:
+        tipos = df[col].dropna().map(type).unique()
+        if len(tipos) > 1:
+            if df_out is df:
+                df_out = df.copy()
+            df_out[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df_out
+
+def carregar_snapshot(caminho_origem):
+    """
+    Devolve (df, df_recordes, manifesto) se o snapshot em disco corresponde ao workbook atual, senão None.
+    1. mtime + tamanho iguais ao manifesto -> aceita sem ler o workbook.
+    2. Só o mtime mudou (ficheiro regravado sem alterações) -> confirma pelo hash do conteúdo.
+    O DataFrame devolvido é uma cópia completa em memória (to_pandas), não fica ligado ao ficheiro.
+    """
+    manifesto = ler_manifesto()
+    chave = obter_chave(caminho_origem)
+    if manifesto is None or chave is None:
+        return None
+    if manifesto.get('versao_processamento') != config.VERSAO_PROCESSAMENTO:
+        return None
+    if manifesto.get('tamanho') != chave['tamanho']:
+        return None
+
+    if manifesto.get('mtime') != chave['mtime']:
+        if manifesto.get('hash') != calcular_hash_conteudo(caminho_origem):
+            return None
+        # Mesmo conteúdo com outro mtime: atualiza o manifesto para a próxima verificação ser barata
+        manifesto['mtime'] = chave['mtime']
+        _gravar_atomico(_caminho(ARQUIVO_MANIFESTO), lambda p: _escrever_json(p, manifesto))
+
+    try:
+        df = feather.read_table(_caminho(ARQUIVO_DADOS), memory_map=True).to_pandas()
+        df_recordes = feather.read_table(_caminho(ARQUIVO_RECORDES), memory_map=True).to_pandas()
+    except (FileNotFoundError, pa.ArrowInvalid, OSError):
+        return None
+    return df, df_recordes, manifesto
+
+def _escrever_json(caminho, dados):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+
+def salvar_snapshot(chave, df, df_recordes, extras=None):
+    """
+    Grava base + recordes e, por último, o manifesto.
+    A chave tem de vir de chave_de_conteudo() sobre os mesmos bytes que foram processados
+    (o _read_raw_excel devolve os dois juntos): uma chave tirada do ficheiro em disco noutro
+    momento pode corresponder a um conteúdo diferente do que gerou a base.
+    """
+    if chave is None or df.empty:
+        return None
+    os.makedirs(config.DIRETORIO_SNAPSHOT, exist_ok=True)
+
+    manifesto = {
+        **chave,
+        'versao_processamento': config.VERSAO_PROCESSAMENTO,
+        'linhas': int(len(df)),
+        'criado_em': time.time(),
+        **(extras or {}),
+    }
+    # Invalida o manifesto anterior antes de trocar os dados
+    try:
+        os.remove(_caminho(ARQUIVO_MANIFESTO))
+    except FileNotFoundError:
+        pass
+    opcoes = {'compression': 'uncompressed'}
+    _gravar_atomico(_caminho(ARQUIVO_DADOS), lambda p: feather.write_feather(_preparar_para_arrow(df), p, **opcoes))
+    _gravar_atomico(_caminho(ARQUIVO_RECORDES), lambda p: feather.write_feather(_preparar_para_arrow(df_recordes), p, **opcoes))
+    _gravar_atomico(_caminho(ARQUIVO_MANIFESTO), lambda p: _escrever_json(p, manifesto))
+    return manifesto
@@ -0,0 +1,302 @@
+"""
+=====================================================================
+FEATURES HISTÓRICAS (UM SÓ CÁLCULO PARA TREINO E INFERÊNCIA)
+=====================================================================
+Uma linha por atleta × jogo × período com as features "de antes do jogo" que os
+modelos usam: média e tendência do alvo EQ45/50 nos jogos anteriores, carga dos
+últimos 3 jogos, dias de descanso, nº de jogos, minutagem da temporada, posição
+e herança do 1º tempo, mais os alvos TARGET_* do treino.
+Sai do cubo de jogos uma vez por versão dos dados (construir_derivados da
+ingestão, com o cubo das temporadas arquivadas como histórico): o predictive.py
+treina com ela sobre a base completa e o ml_engine faz só um lookup pela
+chave (Name, Data, Período). As features do minuto (acumulados, ritmo, placar,
+casa/fora) vêm da própria linha da base, pela mesma montar_vetores nos dois lados.
+As curvas por minuto (construir_curvas_minuto) são as referências dos deltas do
+Live Tracker, publicadas da mesma forma.
+=====================================================================
+"""
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+import Source.Dados.config as config
+from Source.Dados.positions import get_position
+from Source.Dados.data_loader import construir_cubo_jogos, concatenar_bases, CHAVE_CUBO
+
+POSICAO_ENCODE = {"GOL": 0, "ZAG": 1, "LAT": 2, "MEI": 3, "ATA": 4}
+
+MAPA_METRICAS = {
+    'Dist_Total': 'Total Distance',
+    'Load_Total': 'Player Load',
+    'V4_Dist':    'V4 Dist',
+    'V5_Dist':    'V5 Dist',
+    'V4_Eff':     'V4 To8 Eff',
+    'V5_Eff':     'V5 To8 Eff',
+    'HIA_Total':  'HIA'
+}
+
+# Minutos de referência do alvo equivalente (EQ45 / EQ50) e mínimo de minutos jogados no divisor
+MINUTOS_PERIODO = {1: 45, 2: 50}
+MIN_DIVISOR_ALVO = 10
+
+def _anteriores(grupo, valores, n=None):
+    """
+    Soma e contagem dos jogos anteriores do mesmo grupo (todos, ou só os últimos `n`),
+    a partir da soma acumulada: o mesmo que expanding()/rolling(n).shift(1), sem lambdas por grupo.
+    """
+    valores = valores.astype('float64') # Soma acumulada em float64 (as métricas do cubo vêm em float32)
+    acumulado = valores.groupby(grupo, observed=True).cumsum()
+    antes = acumulado - valores
+    contagem = valores.groupby(grupo, observed=True).cumcount()
+    if n is not None:
+        antes = antes - acumulado.groupby(grupo, observed=True).shift(n + 1).fillna(0) # Tira o que ficou antes dos n últimos
+        antes = antes.where(contagem > 0, 0.0)
+        contagem = np.minimum(contagem, n)
+    return antes, contagem
+
+def construir_features_historicas(df, cubo=None, cubo_arquivado=None):
+    """
+    Features históricas por atleta × jogo × período (índice Name/Data/Período, Name em str).
+    Só usam jogos anteriores à chave, por isso a linha do jogo ao vivo já serve para a inferência.
+    `cubo`: o construir_cubo_jogos(df) já calculado (derivados da ingestão), se houver.
+    `cubo_arquivado`: cubo das temporadas arquivadas (data_loader.carregar_cubo_arquivado). Entra no
+    histórico, como no treino com a base completa, e a tabela devolvida fica só com os jogos de `df`.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    cubo = construir_cubo_jogos(df) if cubo is None else cubo
+    datas_df = None
+    if cubo_arquivado is not None and not cubo_arquivado.empty:
+        datas_df = pd.DatetimeIndex(cubo['Data'].unique())
+        cubo = concatenar_bases([cubo_arquivado[~cubo_arquivado['Data'].isin(datas_df)], cubo])
+    jogos = cubo[CHAVE_CUBO + list(MAPA_METRICAS.values()) + ['Minutos']].reset_index(drop=True)
+    jogos['Name'] = jogos['Name'].astype(str)
+    # Dentro de cada atleta × período os jogos vêm por data (o cubo já vem assim; o arquivo + a atual também ficam)
+    jogos = jogos.sort_values(CHAVE_CUBO, kind='stable', ignore_index=True)
+    atleta_periodo = [jogos['Name'], jogos['Período']]
+    features = jogos[CHAVE_CUBO].copy()
+
+    # Descanso desde o jogo anterior do atleta (qualquer período)
+    datas = jogos[['Name', 'Data']].drop_duplicates()
+    datas['Dias_Descanso'] = datas.groupby('Name')['Data'].diff().dt.days.fillna(7).clip(1, 30)
+    features['Dias_Descanso'] = datas.set_index(['Name', 'Data'])['Dias_Descanso'].reindex(
+        pd.MultiIndex.from_frame(jogos[['Name', 'Data']])
+    ).to_numpy()
+
+    # Minutagem acumulada antes deste jogo/período (fadiga crônica: os dois períodos entram na conta)
+    minutos = jogos['Minutos'].astype('float64')
+    features['Minutagem_Temporada'] = minutos.groupby(jogos['Name']).cumsum() - minutos
+    features['Posicao_encoded'] = jogos['Name'].map(lambda n: POSICAO_ENCODE.get(get_position(n), -1))
+
+    carga_3j, n_3j = _anteriores(atleta_periodo, jogos['Player Load'], n=3)
+    features['Carga_3Jogos_PL'] = carga_3j
+    features['N_Jogos'] = jogos.groupby(atleta_periodo).cumcount()
+
+    divisor = jogos['Minutos'].clip(lower=MIN_DIVISOR_ALVO) # Tipo original: o alvo fica igual ao dos modelos já treinados
+    minutos_periodo = jogos['Período'].map(MINUTOS_PERIODO).fillna(MINUTOS_PERIODO[2]).to_numpy()
+    t1 = jogos[jogos['Período'] == 1].set_index(['Name', 'Data'])
+    chave_jogo = pd.MultiIndex.from_frame(jogos[['Name', 'Data']])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for metric_target, metric_base in MAPA_METRICAS.items():
+            alvo = (jogos[metric_base] / divisor) * minutos_periodo
+            features[f'TARGET_{metric_target}'] = alvo
+            soma, n = _anteriores(atleta_periodo, alvo)
+            soma_3j, n_3j = _anteriores(atleta_periodo, alvo, n=3)
+            media_geral = (soma / n).where(n > 0)
+            features[f'Media_Geral_{metric_target}'] = media_geral
+            features[f'Trend_{metric_target}'] = (soma_3j / n_3j).where(n_3j > 0) / (media_geral + 1)
+            # Herança do 1º tempo: total do período 1 do mesmo jogo
+            features[f'Total_T1_{metric_target}'] = t1[metric_base].reindex(chave_jogo).to_numpy()
+
+    features = features.fillna(0).set_index(CHAVE_CUBO).sort_index()
+    if datas_df is not None: # Só as chaves da temporada em memória (as do arquivo serviram de histórico)
+        features = features[features.index.get_level_values('Data').isin(datas_df)]
+    return features
+
+# ---------------------------------------------------------
+# JOGO AO VIVO (FLUXO): O HISTÓRICO UMA VEZ, O JOGO A CADA VERSÃO
+# ---------------------------------------------------------
+# Nas chaves do jogo ao vivo só o Total_T1, os TARGET_* e a minutagem do 1º tempo
+# (na linha do 2º) dependem do próprio jogo. O resto sai de um jogo vazio na mesma
+# data, calculado uma vez por versão do Excel; a cada versão do fluxo as features
+# do jogo sozinho completam-no, sem refazer o histórico.
+COLUNAS_DO_JOGO = [f'{prefixo}_{alvo}' for alvo in MAPA_METRICAS for prefixo in ('Total_T1', 'TARGET')]
+
+def features_proximo_jogo(df, cubo, cubo_arquivado, data):
+    """
+    Features de todos os atletas do cubo (e do arquivo), em todos os períodos, num jogo sem
+    minutos na `data`, posterior a todos os do cubo. `df`/`cubo`: a base sem o jogo ao vivo e o cubo dela.
+    """
+    conhecidos = [c for c in (cubo_arquivado, cubo) if c is not None and not c.empty]
+    if not conhecidos:
+        return pd.DataFrame()
+    nomes = pd.unique(np.concatenate([c['Name'].astype(str).to_numpy() for c in conhecidos]))
+    periodos = np.unique(np.concatenate([c['Período'].to_numpy() for c in conhecidos]))
+    vazio = pd.MultiIndex.from_product([nomes, [pd.Timestamp(data)], periodos], names=CHAVE_CUBO).to_frame(index=False)
+    vazio[list(MAPA_METRICAS.values()) + ['Minutos']] = 0.0
+    features = construir_features_historicas(df, pd.concat([cubo.assign(Name=cubo['Name'].astype(str)), vazio]), cubo_arquivado)
+    return features[features.index.get_level_values('Data') == pd.Timestamp(data)]
+
+def features_jogo_ao_vivo(proximo, df_jogo, cubo_jogo=None):
+    """
+    Features das chaves do jogo ao vivo: histórico de `proximo` (features_proximo_jogo) e o que
+    depende do jogo das features dele sozinho. Atleta sem linha em `proximo` (sem jogos antes): só as do jogo.
+    """
+    proprias = construir_features_historicas(df_jogo, cubo_jogo)
+    if proprias.empty or proximo.empty:
+        return proprias
+    historico = proximo.reindex(proprias.index)
+    colunas = [c for c in proprias.columns if c not in COLUNAS_DO_JOGO]
+    features = proprias.copy()
+    features[colunas] = historico[colunas].fillna(proprias[colunas])
+    # A minutagem do jogo sozinho é a do 1º tempo (na linha do 2º): soma-se à de antes do jogo
+    features['Minutagem_Temporada'] = historico['Minutagem_Temporada'].fillna(0) + proprias['Minutagem_Temporada']
+    return features
+
+# Features do minuto -> coluna da linha da base de onde saem (acumulados e ritmo já vêm da ingestão)
+COLUNAS_MINUTO = {'Min_Num': 'Min_Num', 'Diff_Gols': 'Diff_Gols', 'Jogou_em_Casa': 'Jogou_em_Casa'}
+for _alvo, _base in MAPA_METRICAS.items():
+    COLUNAS_MINUTO[f'{_alvo}_Acumulado_Agora'] = config.COLUNAS_ACUMULADAS[_base]
+    COLUNAS_MINUTO[f'Ritmo_{_alvo}'] = config.COLUNAS_RITMO[_base]
+
+def _valores_minuto(linhas):
+    valores = linhas.reindex(columns=list(COLUNAS_MINUTO.values())).to_numpy(dtype=np.float64)
+    # Sem a coluna na base: placar neutro e jogo em casa
+    if 'Diff_Gols' not in linhas.columns:
+        valores[:, 1] = 0.0
+    if 'Jogou_em_Casa' not in linhas.columns:
+        valores[:, 2] = 1.0
+    return valores
+
+def features_minuto(linhas):
+    """Features do minuto, tiradas da própria linha da base."""
+    return pd.DataFrame(_valores_minuto(linhas), columns=list(COLUNAS_MINUTO))
+
+# Até este nº de linhas (inferência ao vivo) a chave é procurada uma a uma: montar um MultiIndex custa mais
+MAX_LINHAS_GET_LOC = 64
+
+def _posicoes(indice, linhas):
+    """Posição de cada linha (Name, Data, Período) na tabela de features; -1 se não existir."""
+    nomes, datas, periodos = linhas['Name'].astype(str).to_numpy(), linhas['Data'].to_numpy(), linhas['Período'].to_numpy()
+    if len(linhas) > MAX_LINHAS_GET_LOC:
+        return indice.get_indexer(pd.MultiIndex.from_arrays([nomes, datas, periodos]))
+    posicoes = np.full(len(linhas), -1)
+    for i, chave in enumerate(zip(nomes, datas, periodos)):
+        try:
+            posicoes[i] = indice.get_loc(chave)
+        except KeyError:
+            pass
+    return posicoes
+
+def montar_vetores(linhas, df_features):
+    """
+    Vetores completos (features do minuto + históricas) das linhas da base, na ordem delas.
+    É o mesmo caminho no treino (todas as linhas) e ao vivo (a última linha de cada atleta).
+    Chave sem linha na tabela: históricas em NaN.
+    """
+    posicoes = _posicoes(df_features.index, linhas)
+    historicas = df_features.to_numpy(dtype=np.float64)[posicoes]
+    historicas[posicoes < 0] = np.nan
+    return pd.DataFrame(
+        np.hstack([_valores_minuto(linhas), historicas]), columns=list(COLUNAS_MINUTO) + list(df_features.columns),
+    )
+
+# ---------------------------------------------------------
+# CURVAS POR MINUTO (REFERÊNCIAS DOS DELTAS AO VIVO)
+# ---------------------------------------------------------
+# Os deltas do Live Tracker comparam o jogo escolhido com os outros jogos no mesmo
+# minuto: o acumulado médio do atleta e a carga média da equipa até esse minuto.
+# Em vez de agrupar a temporada a cada rerun, a ingestão publica somas e contagens
+# por minuto de todos os jogos (por competição, por causa do filtro de campeonatos).
+# "Os outros jogos" são essas somas menos as do próprio jogo, que sai de um bloco da
+# base (get_game) pela mesma função.
+
+class CurvasMinuto(NamedTuple):
+    atleta: pd.DataFrame # (Competição, Período, Name, Interval) -> soma de cada coluna + Linhas
+    equipa: pd.DataFrame # (Competição, Período, Interval) -> soma de cada coluna + Blocos (atleta × jogo) que começam no minuto
+
+COLUNAS_CURVAS = list(dict.fromkeys(
+    coluna for cfg in config.METRICAS_CONFIG.values() for coluna in (cfg['coluna_distancia'], cfg['coluna_acumulada'])
+))
+
+def construir_curvas_minuto(df):
+    """Somas por minuto das COLUNAS_CURVAS de `df` (a base inteira ou só um jogo). Sem Name/Período/Interval, a linha fica de fora."""
+    colunas = [c for c in COLUNAS_CURVAS if c in df.columns]
+    validas = df[['Name', 'Período', 'Interval']].notna().all(axis=1).to_numpy()
+    linhas = df[validas]
+    tabela = pd.DataFrame({
+        # Competição em texto ('nan' quando falta): o filtro de campeonatos nunca a escolhe, sem filtro ela conta
+        'Competição': linhas['Competição'].astype(str).to_numpy(),
+        'Período': linhas['Período'].to_numpy(),
+        'Name': linhas['Name'].astype(str).to_numpy(),
+        'Interval': linhas['Interval'].to_numpy(dtype=np.float64),
+        'Data': linhas['Data'].to_numpy(),
+    })
+    tabela[colunas] = linhas[colunas].to_numpy(dtype=np.float64) # Somas em float64: a subtração do jogo não perde precisão
+
+    chave_atleta = ['Competição', 'Período', 'Name', 'Interval']
+    atleta = tabela.groupby(chave_atleta)[colunas].sum()
+    atleta['Linhas'] = tabela.groupby(chave_atleta).size()
+
+    chave_equipa = ['Competição', 'Período', 'Interval']
+    equipa = tabela.groupby(chave_equipa)[colunas].sum()
+    # Primeiro minuto de cada atleta × jogo: a partir dele o bloco entra na média da equipa
+    inicios = tabela.groupby(['Competição', 'Período', 'Data', 'Name'])['Interval'].min().reset_index()
+    equipa['Blocos'] = inicios.groupby(chave_equipa).size().reindex(equipa.index, fill_value=0)
+    return CurvasMinuto(atleta, equipa)
+
+def somar_curvas(curvas, outras):
+    """Curvas de duas partes da base (a histórica e o jogo ao vivo) somadas minuto a minuto."""
+    return CurvasMinuto(*(a.add(b, fill_value=0) for a, b in zip(curvas, outras)))
+
+def _selecionar(tabela, periodo, competicoes):
+    """Linhas de um período, só das competições pedidas (todas, sem filtro), somadas entre competições."""
+    try:
+        tabela = tabela.xs(periodo, level='Período')
+    except KeyError: # Período sem nenhum minuto
+        tabela = tabela.iloc[0:0].droplevel('Período')
+    if competicoes:
+        tabela = tabela[tabela.index.get_level_values('Competição').isin([str(c) for c in competicoes])]
+    return tabela.groupby(level=list(tabela.index.names[1:])).sum()
+
+def _sem_jogo(curvas, df_jogo, periodo, competicoes, tabela):
+    """Somas publicadas do período menos as do jogo (se o jogo passa no filtro de competições) e as do próprio jogo."""
+    total = _selecionar(getattr(curvas, tabela), periodo, competicoes)
+    if df_jogo.empty:
+        return total, total.iloc[0:0]
+    proprio = _selecionar(getattr(construir_curvas_minuto(df_jogo), tabela), periodo, None)
+    if not competicoes or str(df_jogo['Competição'].iloc[0]) in {str(c) for c in competicoes}:
+        total = total.sub(proprio, fill_value=0)
+    return total, proprio
+
+def _media(somas, contagem):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(contagem > 0.5, somas / contagem, np.nan) # Contagens em float depois da subtração
+
+def media_atleta_outros_jogos(curvas, df_jogo, periodo, nomes, minutos, colunas, competicoes=None):
+    """
+    Média de cada coluna no mesmo minuto nos outros jogos do atleta, para cada par (nome, minuto).
+    `df_jogo`: linhas do jogo escolhido nesse período (get_game). Array len(nomes) × len(colunas), NaN sem histórico.
+    """
+    total, _ = _sem_jogo(curvas, df_jogo, periodo, competicoes, 'atleta')
+    chave = pd.MultiIndex.from_arrays([np.asarray(nomes, dtype=str), np.asarray(minutos, dtype=np.float64)])
+    valores = total.reindex(chave)[list(colunas) + ['Linhas']].to_numpy(dtype=np.float64)
+    return _media(valores[:, :-1], valores[:, -1:])
+
+def carga_media_equipa(curvas, df_jogo, periodo, minutos, colunas, competicoes=None):
+    """
+    Soma de cada coluna até cada minuto, em média por atleta × jogo: (hoje, outros jogos).
+    Hoje sai do próprio jogo (`df_jogo`, linhas do período via get_game); os outros jogos
+    são as somas publicadas menos ele. Arrays len(minutos) × len(colunas), NaN sem dados.
+    """
+    total, proprio = _sem_jogo(curvas, df_jogo, periodo, competicoes, 'equipa')
+    minutos = np.asarray(minutos, dtype=np.float64)
+
+    def ate_ao_minuto(tabela):
+        tabela = tabela.sort_index()
+        acumulado = np.vstack([
+            np.zeros((1, len(colunas) + 1)), tabela[list(colunas) + ['Blocos']].to_numpy(dtype=np.float64).cumsum(axis=0),
+        ])
+        valores = acumulado[np.searchsorted(tabela.index.to_numpy(dtype=np.float64), minutos, side='right')]
+        return _media(valores[:, :-1], valores[:, -1:])
+
+    return ate_ao_minuto(proprio), ate_ao_minuto(total)
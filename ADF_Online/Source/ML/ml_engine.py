@@ -3,93 +3,108 @@
 MOTOR ML - ARQUITETURA SNAPSHOT (CORREÇÃO DA ESCALA DO SLIDER)
 =====================================================================
 """
-import os
-import pickle
 import numpy as np
 import pandas as pd
 import Source.Dados.config as config
 from Source.Dados.positions import get_position
+from Source.Dados.data_loader import get_game, construir_indice_blocos
+from Source.ML.registro_modelos import obter_modelo_treinado
+# Features históricas partilhadas com o treino e curvas por minuto (uma tabela de cada por versão dos dados)
+from Source.ML.features_historicas import (
+    MAPA_METRICAS, construir_features_historicas, montar_vetores,
+    construir_curvas_minuto, media_atleta_outros_jogos, carga_media_equipa,
+)
 
-POSICAO_ENCODE = {"GOL": 0, "ZAG": 1, "LAT": 2, "MEI": 3, "ATA": 4}
-
-MAPA_METRICAS = {
-    'Dist_Total': 'Total Distance',
-    'Load_Total': 'Player Load',
-    'V4_Dist':    'V4 Dist',
-    'V5_Dist':    'V5 Dist',
-    'V4_Eff':     'V4 To8 Eff',
-    'V5_Eff':     'V5 To8 Eff',
-    'HIA_Total':  'HIA'
-}
 
 def carregar_modelo_treinado(diretorio, metrica_selecionada, periodo):
     if metrica_selecionada not in config.METRICAS_CONFIG: return None
-    nome_base = config.METRICAS_CONFIG[metrica_selecionada]["arquivo_modelo"]
-    nome_arquivo = nome_base.replace('.pkl', f'_T{periodo}.pkl')
-    caminho = os.path.join(config.DIRETORIO_MODELOS, nome_arquivo)
-    try:
-        with open(caminho, 'rb') as f: return pickle.load(f)
-    except FileNotFoundError: return None
-
-def calcular_dias_descanso(df_atleta, jogo_atual):
-    datas = sorted(df_atleta['Data'].unique())
-    datas_anteriores = [d for d in datas if d < jogo_atual]
-    if not datas_anteriores: return 7 
-    ultimo_jogo = max(datas_anteriores)
-    return min((jogo_atual - ultimo_jogo).days, 30)
+    # Registro do processo: o modelo só é lido na primeira vez ou quando o ficheiro muda
+    return obter_modelo_treinado(config.METRICAS_CONFIG[metrica_selecionada]["modelo"], periodo)
 
-def projetar_com_modelo_treinado(modelo_dict, row_atleta, minutos_futuros,
-                                 dist_acumulada_atual, media_min_geral, periodo, minuto_atual):
+def _prever(modelo, amostra):
+    """Árvores compactas (manifesto) ou XGBRegressor dos pickles antigos."""
+    if hasattr(modelo, 'inplace_predict'):
+        return modelo.inplace_predict(amostra)
+    return modelo.predict(amostra)
+
+def matriz_pesos(curvas, minutos):
     """
-    1. Calcula a projeção TOTAL até ao fim do tempo regulamentar.
-    2. Recorta e devolve apenas os minutos que o utilizador escolheu no slider.
-    Isso impede que a linha fique espremida!
+    Pesos por minuto (k × len(minutos)) de k curvas media_min_geral (Series indexadas pelo minuto):
+    minuto sem histórico pesa 1.0, e nenhum peso fica abaixo de 0.01.
     """
-    features = modelo_dict['features']
-    modelo = modelo_dict['modelo']
-    
-    sample = {f: row_atleta.get(f, 0) for f in features}
-    sample_df = pd.DataFrame([sample])[features]
+    pesos = np.vstack([curva.reindex(minutos, fill_value=1.0).to_numpy(dtype=np.float64) for curva in curvas])
+    return np.fmax(pesos, 0.01) # fmax: um NaN na curva também vira 0.01
 
+def distribuir_projecao(acumulado_atual, total_previsto, pesos, minutos, minuto_atual, minuto_limite):
+    """
+    Curvas acumuladas de um lote de atletas/métricas (uma linha cada) sobre a grelha `minutos`.
+    O que falta até total_previsto é repartido pelos minutos minuto_atual+1..minuto_limite de cada
+    linha na proporção dos pesos (ritmo histórico); fora desse intervalo a curva é NaN.
+    """
+    acumulado_atual = np.atleast_1d(np.asarray(acumulado_atual, dtype=np.float64))
+    restante = np.maximum(np.atleast_1d(np.asarray(total_previsto, dtype=np.float64)) - acumulado_atual, 0.0)
+    minutos = np.asarray(minutos)
+    restantes = (minutos > np.atleast_1d(minuto_atual)[:, None]) & (minutos <= np.atleast_1d(minuto_limite)[:, None])
+    pesos = np.where(restantes, pesos, 0.0)
+    soma = pesos.sum(axis=1, keepdims=True)
+    soma[soma <= 0] = 1
+    acumulado = acumulado_atual[:, None] + restante[:, None] * (np.cumsum(pesos, axis=1) / soma)
+    return np.where(restantes, acumulado, np.nan)
+
+def projetar_lote_com_modelo_treinado(modelo_dict, linhas, minutos_futuros, acumulados_atuais,
+                                      curvas_min_geral, periodo, minutos_atuais):
+    """
+    Versão em lote do projetar_com_modelo_treinado: `linhas` (DataFrame ou lista de dicts) tem uma
+    linha de features por atleta, e todas vão num só predict.
+    Devolve (matriz k × len(minutos_futuros) com NaN nos minutos já jogados, totais previstos).
+    """
+    features = modelo_dict['features']
+    if isinstance(linhas, pd.DataFrame):
+        amostra = linhas.reindex(columns=features, fill_value=0).to_numpy(dtype=np.float32)
+    else:
+        amostra = np.array([[linha.get(f, 0) for f in features] for linha in linhas], dtype=np.float32)
+    if not hasattr(modelo_dict['modelo'], 'inplace_predict'):
+        amostra = pd.DataFrame(amostra, columns=features)
     # PREVISÃO DA IA (Para o final do tempo regulamentar)
-    dist_final_prevista = float(modelo.predict(sample_df)[0])
-    dist_restante = max(0.0, dist_final_prevista - dist_acumulada_atual)
+    totais_previstos = np.asarray(_prever(modelo_dict['modelo'], amostra), dtype=np.float64)
 
-    # O SEGREDO: Calculamos a escala ATÉ AO FIM DO JOGO (45 ou 50 min)
+    # A escala vai ATÉ AO FIM DO JOGO (45 ou 50 min), ou além se o slider passar dos acréscimos
     minuto_final_periodo = 45 if periodo == 1 else 50
-    
-    # Se o jogo teve acréscimos e o slider for além dos 45, esticamos o cálculo
-    minuto_limite_calculo = max(minuto_final_periodo, minutos_futuros[-1] if minutos_futuros else minuto_final_periodo)
-    todos_minutos_restantes = list(range(minuto_atual + 1, minuto_limite_calculo + 1))
-    
-    pesos_totais = []
-    for m in todos_minutos_restantes:
-        peso = media_min_geral.loc[m] if m in media_min_geral.index else 1.0
-        pesos_totais.append(max(0.01, peso))
-
-    soma_pesos_totais = sum(pesos_totais) if sum(pesos_totais) > 0 else 1
+    minuto_limite = max(minuto_final_periodo, minutos_futuros[-1] if len(minutos_futuros) else minuto_final_periodo)
+    grelha = np.arange(1, minuto_limite + 1)
+    curvas = distribuir_projecao(
+        acumulados_atuais, totais_previstos, matriz_pesos(curvas_min_geral, grelha), grelha, minutos_atuais, minuto_limite,
+    )
+    # Só vão para o gráfico os minutos dentro da seleção do slider
+    return curvas[:, np.isin(grelha, minutos_futuros)], totais_previstos
 
-    # DISTRIBUI O VOLUME NO RITMO CERTO (SEM ESPREMER)
-    acumulado_pred = []
-    acum = dist_acumulada_atual
-    
-    for m, peso in zip(todos_minutos_restantes, pesos_totais):
-        # A distância sobe aos poucos, respeitando o ritmo até aos 45 minutos
-        dist_minuto = dist_restante * (peso / soma_pesos_totais)
-        acum += dist_minuto
-        
-        # Só devolvemos para o gráfico os minutos que estão dentro da seleção do Slider!
-        if m in minutos_futuros:
-            acumulado_pred.append(acum)
+def projetar_com_modelo_treinado(modelo_dict, row_atleta, minutos_futuros,
+                                 dist_acumulada_atual, media_min_geral, periodo, minuto_atual):
+    """
+    1. Calcula a projeção TOTAL até ao fim do tempo regulamentar.
+    2. Recorta e devolve apenas os minutos que o utilizador escolheu no slider.
+    Isso impede que a linha fique espremida!
+    """
+    curvas, totais = projetar_lote_com_modelo_treinado(
+        modelo_dict, [row_atleta], minutos_futuros, dist_acumulada_atual, [media_min_geral], periodo, minuto_atual,
+    )
+    curva = curvas[0]
+    return curva[~np.isnan(curva)].tolist(), float(totais[0])
 
-    return acumulado_pred, dist_final_prevista
+def features_ao_vivo(df_atual, df_features):
+    """Features do último minuto de df_atual (um atleta), iguais às do treino; 0 no que faltar."""
+    return montar_vetores(df_atual.tail(1), df_features).iloc[0].fillna(0).to_dict()
 
 def executar_ml_ao_vivo(
     df_historico, df_atual, df_base,
     coluna_distancia, coluna_acumulada, coluna_minuto, coluna_jogo,
     jogo_atual_nome, periodo, minuto_projecao_ate, metrica_selecionada,
-    atleta_selecionado, DIRETORIO_ATUAL
+    atleta_selecionado, DIRETORIO_ATUAL, df_features=None, indice=None, curvas_minuto=None, competicoes=None
 ):
+    """
+    `df_base`: base ordenada (a publicada, com `indice`). `curvas_minuto`/`df_features`: tabelas publicadas
+    pela ingestão (sem elas, são calculadas a partir de df_base). `competicoes`: filtro de campeonatos da página.
+    """
     resultado = {
         'minutos_futuros': [], 'acumulado_pred': [], 'pred_superior': [], 'pred_inferior': [],
         'carga_projetada': 0, 'minuto_final_proj': 0, 'delta_alvo_pct': 0.0, 'delta_pl_pct': 0.0,
@@ -109,39 +124,13 @@ def executar_ml_ao_vivo(
         return resultado
 
     placar_atual  = df_atual['Placar'].iloc[-1] if 'Placar' in df_atual.columns else 'N/A'
-    resultado_ctx = df_atual['Resultado'].iloc[-1] if 'Resultado' in df_atual.columns else 'E'
 
-    dias_desc = calcular_dias_descanso(df_historico, pd.to_datetime(jogo_atual_nome)) if hasattr(jogo_atual_nome, 'year') or isinstance(jogo_atual_nome, str) else 7
-
-    # 1. DEFINIR VALOR PADRÃO LOGO NO INÍCIO
-    jogou_em_casa_val = 1 
-    
-    # 2. TENTAR CAPTURAR O VALOR REAL DO DATASET
-    if 'Jogou_em_Casa' in df_atual.columns:
-        jogou_em_casa_val = df_atual['Jogou_em_Casa'].iloc[-1]
-    elif 'Jogou_em_Casa' in df_historico.columns:
-        jogou_em_casa_val = df_historico['Jogou_em_Casa'].iloc[-1]
-    
-    def soma_jogo(col):
-        return df_historico.groupby(coluna_jogo)[col].sum().mean() if col in df_historico.columns else 0
-
-    metric_target = 'Dist_Total'
-    for k, v in MAPA_METRICAS.items():
-        if v == coluna_distancia:
-            metric_target = k
-            break
-            
     hia_cols = ['V4 To8 Eff', 'V5 To8 Eff', 'V6 To8 Eff', 'Acc3 Eff', 'Dec3 Eff']
     if 'HIA' not in df_historico.columns:
         df_historico['HIA'] = df_historico[[c for c in hia_cols if c in df_historico.columns]].sum(axis=1) if any(c in df_historico.columns for c in hia_cols) else 0
 
-    media_geral_num = soma_jogo(coluna_distancia)
-    media_3j = df_historico.groupby(coluna_jogo)[coluna_distancia].sum().tail(3).mean()
-    trend_dist = media_3j / (media_geral_num + 1) if media_geral_num > 0 else 1.0
-    carga_3jogos_pl = df_historico.groupby(coluna_jogo)['Player Load'].sum().tail(3).sum() if 'Player Load' in df_historico.columns else 0
-
     media_min_geral = (
-        df_historico.groupby(coluna_minuto)[coluna_distancia]
+        df_historico.groupby(coluna_minuto, observed=True)[coluna_distancia]
         .mean()
         .rolling(3, min_periods=1, center=True)
         .mean()
@@ -149,47 +138,11 @@ def executar_ml_ao_vivo(
     modelo_dict = carregar_modelo_treinado(DIRETORIO_ATUAL, metrica_selecionada, periodo)
     acumulado_pred = []
 
-        # 🆕 Ritmo atual (pacing) — acumulado / minuto atual
-    ritmo_atual = carga_atual / max(minuto_atual, 1)
-
-    # 🆕 Minutagem acumulada na temporada
-    datas_anteriores_todas = df_historico[coluna_jogo].unique()
-    minutagem_temporada = (
-        df_historico[df_historico[coluna_jogo].isin(datas_anteriores_todas)]
-        .groupby(coluna_jogo)[coluna_minuto].max().sum()
-    )
-
-    # 🆕 Posição codificada
-    posicao_atleta = get_position(atleta_selecionado)
-    posicao_encoded = POSICAO_ENCODE.get(posicao_atleta, -1)
-
-    # 🆕 Total do 1º tempo (para inferência do 2º tempo)
-    total_t1 = 0
-    if periodo == 2:
-        df_t1_atleta = df_base[
-            (df_base['Name'] == atleta_selecionado) &
-            (df_base['Data'] == jogo_atual_nome) &
-            (df_base['Período'] == 1)
-        ]
-        if not df_t1_atleta.empty and coluna_distancia in df_t1_atleta.columns:
-            total_t1 = df_t1_atleta[coluna_distancia].sum()
-
     if modelo_dict is not None:
-        row_atleta = {
-            'Min_Num':            minuto_atual,
-            'Dias_Descanso':      dias_desc,
-            'N_Jogos':            df_historico[coluna_jogo].nunique(),
-            'Carga_3Jogos_PL':    carga_3jogos_pl,
-            'Diff_Gols':          1 if resultado_ctx == 'V' else (-1 if resultado_ctx == 'D' else 0),
-            'Jogou_em_Casa':      jogou_em_casa_val,
-            'Posicao_encoded':    posicao_encoded,           # 🆕 Alta
-            'Minutagem_Temporada': minutagem_temporada,      # 🆕 Média
-            f'{metric_target}_Acumulado_Agora': carga_atual,
-            f'Ritmo_{metric_target}':  ritmo_atual,          # 🐛 bug fix
-            f'Media_Geral_{metric_target}': media_geral_num,
-            f'Trend_{metric_target}':  trend_dist,
-            f'Total_T1_{metric_target}': total_t1 if periodo == 2 else 0,  # 🐛 bug fix
-        }
+        # Vetor do treino: features da linha do minuto + lookup das históricas (atleta × jogo × período)
+        if df_features is None:
+            df_features = construir_features_historicas(df_base)
+        row_atleta = features_ao_vivo(df_atual, df_features)
 
         try:
             # Enviamos o período e o minuto_atual para o cálculo de proporção não espremer os dados
@@ -203,7 +156,7 @@ def executar_ml_ao_vivo(
             print(f"Modelo treinado falhou: {e}")
 
     if not acumulado_pred:
-        curva_media_acum = df_historico.groupby(coluna_minuto)[coluna_acumulada].mean()
+        curva_media_acum = df_historico.groupby(coluna_minuto, observed=True)[coluna_acumulada].mean()
         media_acum_agora = curva_media_acum.loc[minuto_atual] if minuto_atual in curva_media_acum.index else carga_atual
         fator_alvo = (carga_atual / media_acum_agora) if media_acum_agora > 0 else 1.0
 
@@ -234,14 +187,20 @@ def executar_ml_ao_vivo(
     carga_projetada = acumulado_pred[-1] if acumulado_pred else carga_atual
     minuto_final_proj = minutos_futuros[-1] if minutos_futuros else minuto_atual
     
-    curva_media_acum_final = df_historico.groupby(coluna_minuto)[coluna_acumulada].mean()
+    curva_media_acum_final = df_historico.groupby(coluna_minuto, observed=True)[coluna_acumulada].mean()
     media_hist_final = curva_media_acum_final.loc[minuto_final_proj] if minuto_final_proj in curva_media_acum_final.index else carga_projetada
     fator_proj = (carga_projetada / media_hist_final) if media_hist_final > 0 else 1.0
 
-    df_time_hoje = df_base[(df_base['Data'] == jogo_atual_nome) & (df_base['Período'] == periodo) & (df_base['Interval'] <= minuto_atual)]
-    df_time_hist = df_base[(df_base['Data'] != jogo_atual_nome) & (df_base['Período'] == periodo) & (df_base['Interval'] <= minuto_atual)]
-    carga_hoje_time = df_time_hoje.groupby('Name')[coluna_distancia].sum().mean() if not df_time_hoje.empty else 0
-    carga_hist_time = df_time_hist.groupby(['Data', 'Name'])[coluna_distancia].sum().mean() if not df_time_hist.empty else carga_hoje_time
+    # Equipa até ao minuto atual: o jogo sai do índice de blocos e os outros jogos das curvas publicadas
+    if indice is None:
+        indice = construir_indice_blocos(df_base)
+    if curvas_minuto is None:
+        curvas_minuto = construir_curvas_minuto(df_base)
+    hoje_time, hist_time = carga_media_equipa(
+        curvas_minuto, get_game(df_base, indice, jogo_atual_nome, periodo), periodo, [minuto_atual], [coluna_distancia], competicoes,
+    )
+    carga_hoje_time = float(np.nan_to_num(hoje_time[0, 0]))
+    carga_hist_time = carga_hoje_time if np.isnan(hist_time[0, 0]) else float(hist_time[0, 0])
     
     delta_time_pct  = ((carga_hoje_time / carga_hist_time) - 1) * 100 if carga_hist_time > 0 else 0.0
     
@@ -249,14 +208,14 @@ def executar_ml_ao_vivo(
     # CÁLCULO DOS DELTAS (VARIAÇÕES)
     # ==========================================
     # 1. Delta da Métrica Principal (Volume, HIA, V4, etc)
-    curva_media_acum = df_historico.groupby(coluna_minuto)[coluna_acumulada].mean()
+    curva_media_acum = df_historico.groupby(coluna_minuto, observed=True)[coluna_acumulada].mean()
     media_acum_agora = curva_media_acum.loc[minuto_atual] if minuto_atual in curva_media_acum.index else carga_atual
     delta_alvo_pct = ((carga_atual / media_acum_agora) - 1) * 100 if media_acum_agora > 0 else 0.0
 
     # 2. Delta do Player Load (A CORREÇÃO ESTÁ AQUI!)
     if 'Player Load Acumulada' in df_atual.columns and 'Player Load Acumulada' in df_historico.columns:
         pl_atual = df_atual[df_atual['Interval'] == minuto_atual]['Player Load Acumulada'].iloc[-1] if not df_atual.empty else 0
-        curva_media_pl = df_historico.groupby(coluna_minuto)['Player Load Acumulada'].mean()
+        curva_media_pl = df_historico.groupby(coluna_minuto, observed=True)['Player Load Acumulada'].mean()
         media_pl_agora = curva_media_pl.loc[minuto_atual] if minuto_atual in curva_media_pl.index else pl_atual
         
         # Faz a comparação do Load de hoje vs Load histórico exato para este minuto
@@ -276,4 +235,113 @@ def executar_ml_ao_vivo(
         'modelo_usado': resultado['modelo_usado']
     })
     
-    return resultado
\ No newline at end of file
+    return resultado
+
+# ---------------------------------------------------------
+# PROJEÇÃO DO ELENCO (UM PREDICT POR MODELO)
+# ---------------------------------------------------------
+# As mesmas features do executar_ml_ao_vivo, mas para todos os atletas em campo de
+# uma vez: o jogo sai do índice de blocos (get_game), as históricas são um lookup na
+# tabela de features e as referências dos deltas nas curvas por minuto (features_historicas.py),
+# e cada modelo recebe a matriz inteira do elenco (n_atletas × n_features) numa só chamada.
+# A projeção vai até ao fim do tempo regulamentar (45 / 50 min), como o slider no máximo.
+
+def _alvo_metrica(coluna_distancia):
+    """Sufixo das features do modelo: 'Total Distance' -> 'Dist_Total'."""
+    return next((k for k, v in MAPA_METRICAS.items() if v == coluna_distancia), 'Dist_Total')
+
+def montar_features_elenco(df_base, jogo, periodo, minuto=None, df_features=None, indice=None):
+    """
+    Uma linha por atleta com dados no jogo/período até `minuto` (None = último minuto de cada um),
+    com as features de todos os modelos do MAPA_METRICAS. Índice = Name.
+    """
+    if indice is None:
+        indice = construir_indice_blocos(df_base)
+    df_hoje = get_game(df_base, indice, jogo, periodo)
+    if minuto is not None:
+        df_hoje = df_hoje[df_hoje['Interval'] <= minuto]
+    if df_hoje.empty:
+        return pd.DataFrame()
+    if df_features is None:
+        df_features = construir_features_historicas(df_base)
+
+    # Último minuto de cada atleta (base ordenada por Name e Interval dentro do jogo/período)
+    ultima = df_hoje.drop_duplicates('Name', keep='last')
+    tabela = montar_vetores(ultima, df_features).fillna(0)
+    tabela.index = pd.Index(ultima['Name'].astype(str), name='Name')
+    return tabela
+
+def _delta_pct(atual, referencia):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(referencia > 0, (atual / referencia - 1) * 100, 0.0)
+
+def projetar_elenco(df_base, jogo, periodo, minuto=None, metricas=None, df_features=None,
+                    indice=None, curvas_minuto=None, competicoes=None):
+    """
+    Projeção de fim de período de todo o elenco em campo, para cada métrica do METRICAS_PROJECAO.
+    Tabela longa: Name, Posição, Métrica, Minuto, Atual, Projetado, Inferior, Superior,
+    Delta_Hist_pct (vs. o próprio histórico no mesmo minuto), Delta_Proj_pct (projeção vs.
+    média histórica no fim do período), Delta_Equipe_pct (vs. a variação média da equipa) e Modelo.
+    `df_base`, `indice`, `df_features`, `curvas_minuto` e `competicoes` como no executar_ml_ao_vivo.
+    """
+    if indice is None:
+        indice = construir_indice_blocos(df_base)
+    tabela = montar_features_elenco(df_base, jogo, periodo, minuto, df_features, indice)
+    if tabela.empty:
+        return pd.DataFrame()
+    if curvas_minuto is None:
+        curvas_minuto = construir_curvas_minuto(df_base)
+    nomes = tabela.index
+    minutos = tabela['Min_Num'].to_numpy()
+    minuto_final = 45 if periodo == 1 else 50
+    df_jogo = get_game(df_base, indice, jogo, periodo) # O período inteiro do jogo: é ele que sai do histórico
+
+    metricas = [m for m in (metricas or config.METRICAS_PROJECAO) if config.METRICAS_CONFIG[m]['coluna_distancia'] in df_base.columns]
+    colunas = [config.METRICAS_CONFIG[m]['coluna_distancia'] for m in metricas]
+    acumuladas = [config.METRICAS_CONFIG[m]['coluna_acumulada'] for m in metricas]
+    # Acumulado médio de cada atleta nos outros jogos, agora e no fim do período (as referências dos deltas do executar_ml_ao_vivo)
+    curvas_agora = media_atleta_outros_jogos(curvas_minuto, df_jogo, periodo, nomes, minutos, acumuladas, competicoes)
+    curvas_final = media_atleta_outros_jogos(curvas_minuto, df_jogo, periodo, nomes, np.full(len(nomes), minuto_final), acumuladas, competicoes)
+
+    # Variação da equipa no mesmo minuto (média por atleta hoje vs. média por atleta × jogo no histórico)
+    minutos_unicos = np.unique(minutos)
+    hoje, hist = carga_media_equipa(curvas_minuto, df_jogo, periodo, minutos_unicos, colunas, competicoes)
+    delta_time = _delta_pct(hoje, np.where(np.isnan(hist), hoje, hist))[np.searchsorted(minutos_unicos, minutos)]
+
+    blocos = []
+    for j, (metrica, coluna, coluna_acumulada) in enumerate(zip(metricas, colunas, acumuladas)):
+        atual = tabela[f'{_alvo_metrica(coluna)}_Acumulado_Agora'].to_numpy()
+        media_agora = curvas_agora[:, j]
+        media_agora = np.where(np.isnan(media_agora), atual, media_agora)
+        media_final = curvas_final[:, j]
+
+        modelo_dict = carregar_modelo_treinado(None, metrica, periodo)
+        projetado = None
+        if modelo_dict is not None:
+            features = modelo_dict['features']
+            matriz = tabela.reindex(columns=features, fill_value=0).to_numpy(dtype=np.float32)
+            try:
+                amostra = matriz if hasattr(modelo_dict['modelo'], 'inplace_predict') else pd.DataFrame(matriz, columns=features)
+                projetado = np.maximum(np.asarray(_prever(modelo_dict['modelo'], amostra), dtype=np.float64), atual)
+                erro = np.full(len(nomes), float(modelo_dict['mae']))
+                modelo_usado = f"XGBoost Snapshot (MAE: {modelo_dict['mae']:.1f})"
+            except Exception as e:
+                print(f"Modelo treinado falhou ({metrica}, elenco): {e}")
+        if projetado is None:
+            # Fallback: o ritmo de hoje face ao histórico do atleta, levado até ao fim do período
+            fator = np.where(media_agora > 0, atual / np.where(media_agora > 0, media_agora, 1), 1.0)
+            projetado = np.where(np.isnan(media_final), atual, np.maximum(media_final * fator, atual))
+            erro = atual * 0.05
+            modelo_usado = "Fallback (Média Ajustada)"
+
+        media_final = np.where(np.isnan(media_final), projetado, media_final)
+        delta_hist = _delta_pct(atual, media_agora)
+
+        blocos.append(pd.DataFrame({
+            'Name': nomes, 'Posição': [get_position(n) for n in nomes], 'Métrica': metrica,
+            'Minuto': minutos.astype(int), 'Atual': atual, 'Projetado': projetado,
+            'Inferior': np.maximum(projetado - erro, 0), 'Superior': projetado + erro,
+            'Delta_Hist_pct': delta_hist, 'Delta_Proj_pct': _delta_pct(projetado, media_final),
+            'Delta_Equipe_pct': delta_hist - delta_time[:, j], 'Modelo': modelo_usado,
+        }))
+    return pd.concat(blocos, ignore_index=True) if blocos else pd.DataFrame()
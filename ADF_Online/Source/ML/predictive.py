@@ -4,6 +4,15 @@ MODELO PREDITIVO AO VIVO — SNAPSHOTS + TODAS AS SUBSTITUIÇÕES (EQ45)
 =============================================================================
 Aproveita 100% dos dados. Se o jogador saiu aos 15 min, os snapshots do
 minuto 1 ao 15 são usados no treino, mas apontando para o Alvo Equivalente (Eq45).
+
+Cada métrica × período é um job independente, treinado num pool de processos
+(cada XGBoost com threads = núcleos / processos, sem sobrecarregar a máquina).
+Jobs cujo modelo no manifesto já tem a mesma versão dos dados, features e
+hiperparâmetros são pulados (use --forcar para retreinar).
+
+Uso: python Source/ML/predictive.py [--metricas Dist_Total V5_Dist] [--periodos 1 2]
+                                    [--saida Models] [--versao-dados ROTULO]
+                                    [--processos N] [--threads-por-modelo N] [--forcar]
 =============================================================================
 """
 
@@ -19,250 +28,286 @@ if RAIZ_PROJETO not in sys.path:
     sys.path.append(RAIZ_PROJETO)
 # ---------------------------------------------------------------------
 
+import time
+import hashlib
+import argparse
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import pandas as pd
-import pickle
-from sklearn.model_selection import train_test_split, GroupShuffleSplit
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import GroupShuffleSplit
+from sklearn.metrics import mean_absolute_error, r2_score
 import xgboost as xgb
 
 import Source.Dados.config as config
-from Source.Dados.data_loader import load_global_data
-# Após os outros imports
-from Source.Dados.positions import get_position
-
-POSICAO_ENCODE = {"GOL": 0, "ZAG": 1, "LAT": 2, "MEI": 3, "ATA": 4}
+from Source.Dados.data_loader import carregar_base_completa, CHAVE_CUBO
+# Features históricas partilhadas com o app (o ml_engine lê a mesma tabela ao vivo)
+from Source.ML.features_historicas import MAPA_METRICAS, construir_features_historicas, montar_vetores
+from Source.ML.registro_modelos import gravar_modelo, ler_manifesto_modelos, chave_modelo
 
 warnings.filterwarnings('ignore')
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CONFIGURAÇÕES
 # ─────────────────────────────────────────────────────────────────────────────
-CAMINHO_EXCEL        = os.path.join(DIRETORIO_ATUAL, 'ADF OnLine 2024.xlsb')
-DIRETORIO_MODELOS    = os.path.join(RAIZ_PROJETO, 'Models')
+DIRETORIO_MODELOS    = config.DIRETORIO_MODELOS
 RANDOM_STATE         = 42
-
-print("=" * 65)
-print("  MODELO PREDITIVO - APROVEITAMENTO TOTAL (INCLUI SUBSTITUIÇÕES)")
-print("=" * 65)
-
-MAPA_METRICAS = {
-    'Dist_Total': 'Total Distance',
-    'Load_Total': 'Player Load',
-    'V4_Dist':    'V4 Dist',
-    'V5_Dist':    'V5 Dist',
-    'V4_Eff':     'V4 To8 Eff',
-    'V5_Eff':     'V5 To8 Eff',
-    'HIA_Total':  'HIA' 
-}
+PERIODOS             = [1, 2]
+MIN_LINHAS_TREINO    = 50
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 1. CARREGAR DADOS
 # ─────────────────────────────────────────────────────────────────────────────
-print("\n[1/4] Carregando dados prontos para o Treino...")
-df, _ = load_global_data(0)
-
-if df is None:
-    print("❌ Falha ao carregar dados. Abortando.")
-    exit()
-
-# O df já vem com: HIA, Jogou_em_Casa, Diff_Gols (min a min) e Fillna(0).
-
-# 🆕 Minutagem acumulada na temporada (fadiga crônica)
-df_min_temporada = (
-    df.groupby(['Name', 'Data', 'Período'])['Interval']
-    .max()
-    .reset_index()
-    .rename(columns={'Interval': '_min_jogo'})
-)
-df_min_temporada = df_min_temporada.sort_values(['Name', 'Data'])
-df_min_temporada['Minutagem_Temporada'] = (
-    df_min_temporada.groupby('Name')['_min_jogo']
-    .transform(lambda x: x.expanding().sum().shift(1).fillna(0))
-)
-df_min_temporada = df_min_temporada.drop(columns='_min_jogo')
-df = df.merge(df_min_temporada, on=['Name', 'Data', 'Período'], how='left')
-df['Minutagem_Temporada'] = df['Minutagem_Temporada'].fillna(0)
-
-# 🆕 Posição codificada
-df['Posicao_encoded'] = df['Name'].apply(
-    lambda n: POSICAO_ENCODE.get(get_position(n), -1)
-)
+def carregar_dados():
+    print("\n[1/4] Carregando dados prontos para o Treino...")
+    # Temporada atual + temporadas anteriores arquivadas em Data_Files/particoes
+    df, _ = carregar_base_completa(0)
+    # O df já vem com: HIA, Jogou_em_Casa, Diff_Gols (min a min) e Fillna(0).
+    return df
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 2. HISTÓRICO COM TARGET EQUIVALENTE E HERANÇA DO 1º TEMPO
+# 2 + 3. HISTÓRICO, TARGETS E SNAPSHOTS MINUTO A MINUTO
 # ─────────────────────────────────────────────────────────────────────────────
-print("\n[2/4] Calculando o histórico e os Alvos de Previsão (Targets)...")
-df_jogos = df.groupby(['Name', 'Data', 'Período']).agg({
-    'Total Distance': 'sum', 'Player Load': 'sum', 'V4 Dist': 'sum',
-    'V5 Dist': 'sum', 'V4 To8 Eff': 'sum', 'V5 To8 Eff': 'sum', 'HIA': 'sum',
-    'Min_Num': 'max', 
-    'Jogou_em_Casa' : 'first' 
-    # Diff_Gols removido daqui (fica apenas no snapshot minuto a minuto)
-}).reset_index()
-df_jogos.rename(columns={'Min_Num': 'Minutos_Jogados'}, inplace=True)
-
-datas_unicas = df_jogos[['Name', 'Data']].drop_duplicates().sort_values(['Name', 'Data'])
-datas_unicas['Dias_Descanso'] = datas_unicas.groupby('Name')['Data'].diff().dt.days.fillna(7).clip(1, 30)
-df_jogos = df_jogos.merge(datas_unicas, on=['Name', 'Data'], how='left')
-
-df_jogos['Min_Divisor'] = df_jogos['Minutos_Jogados'].clip(lower=10)
-df_jogos['Min_Periodo'] = np.where(df_jogos['Período'] == 1, 45, 50)
-
-cols_target = []
-for metric_target, metric_base in MAPA_METRICAS.items():
-    nome_target = f'TARGET_{metric_target}'
-    df_jogos[nome_target] = (df_jogos[metric_base] / df_jogos['Min_Divisor']) * df_jogos['Min_Periodo']
-    cols_target.append(nome_target)
-    
-    df_jogos[f'Media_Geral_{metric_target}'] = df_jogos.groupby(['Name', 'Período'])[nome_target].transform(lambda x: x.expanding().mean().shift(1))
-    df_jogos[f'Media_3J_{metric_target}'] = df_jogos.groupby(['Name', 'Período'])[nome_target].transform(lambda x: x.rolling(3, min_periods=1).mean().shift(1))
-    df_jogos[f'Trend_{metric_target}'] = df_jogos[f'Media_3J_{metric_target}'] / (df_jogos[f'Media_Geral_{metric_target}'] + 1)
-
-df_jogos['Carga_3Jogos_PL'] = df_jogos.groupby(['Name', 'Período'])['Player Load'].transform(lambda x: x.rolling(3, min_periods=1).sum().shift(1))
-df_jogos['N_Jogos'] = df_jogos.groupby(['Name', 'Período']).cumcount()
-df_jogos = df_jogos.fillna(0)
-
-# 🚀 PASSO 1 DA MELHORIA: Capturar o esforço final do 1º Tempo para usar no 2º
-df_t1 = df_jogos[df_jogos['Período'] == 1].copy()
-renames_t1 = {metric_base: f'Total_T1_{metric_target}' for metric_target, metric_base in MAPA_METRICAS.items()}
-df_t1 = df_t1[['Name', 'Data'] + list(renames_t1.keys())].rename(columns=renames_t1)
-
-cols_historico = ['Name', 'Data', 'Período', 'Dias_Descanso', 'Carga_3Jogos_PL', 'N_Jogos', 'Minutos_Jogados'] + \
-                 [col for col in df_jogos.columns if 'Media_Geral_' in col or 'Trend_' in col] + cols_target
-
-df_historico_limpo = df_jogos[cols_historico]
+def preparar_snapshots(df, versao_dados=None):
+    """
+    Snapshots de treino (um por linha da base) e a versão dos dados que vai para o manifesto.
+    `versao_dados`: rótulo fixo no lugar do hash calculado.
+    """
+    print("\n[2/4] Calculando o histórico e os Alvos de Previsão (Targets)...")
+    # Uma linha por atleta × jogo × período (Source/ML/features_historicas.py): alvos EQ45/50,
+    # médias e tendência dos jogos anteriores, carga dos 3 últimos, descanso, minutagem,
+    # posição e herança do 1º tempo. O app publica a mesma tabela a cada versão dos dados.
+    df_features = construir_features_historicas(df)
+    cols_target = [f'TARGET_{metric_target}' for metric_target in MAPA_METRICAS]
 
-# ─────────────────────────────────────────────────────────────────────────────
-# 3. SNAPSHOTS MINUTO A MINUTO (COM PASSO 3: RITMO/PACING)
-# ─────────────────────────────────────────────────────────────────────────────
-print("\n[3/4] Gerando os Snapshots (Até ao minuto em que ele for substituído)...")
-grp = df.groupby(['Name', 'Data', 'Período'])
-for metric_target, metric_base in MAPA_METRICAS.items():
-    df[f'{metric_target}_Acumulado_Agora'] = grp[metric_base].cumsum()
-    # 🚀 PASSO 3 DA MELHORIA: Taxa de intensidade por minuto (Pacing)
-    # Clip(lower=1) evita erro de divisão por zero no minuto 0
-    df[f'Ritmo_{metric_target}'] = df[f'{metric_target}_Acumulado_Agora'] / df['Min_Num'].clip(lower=1)
-
-# Fusão 1: Historico
-df_snapshots = df.merge(df_historico_limpo, on=['Name', 'Data', 'Período'], how='left')
+    print("\n[3/4] Gerando os Snapshots (Até ao minuto em que ele for substituído)...")
+    # Features do minuto (acumulados e ritmo da ingestão) + lookup das históricas: o mesmo montar_vetores da inferência
+    df_snapshots = pd.concat([df[['Name', 'Data', 'Período']].reset_index(drop=True), montar_vetores(df, df_features)], axis=1)
+    df_snapshots = df_snapshots.dropna(subset=['Min_Num'])
 
-# Fusão 2: Herança do 1º Tempo
-df_snapshots = df_snapshots.merge(df_t1, on=['Name', 'Data'], how='left')
-for metric_target in MAPA_METRICAS.keys():
-    df_snapshots[f'Total_T1_{metric_target}'] = df_snapshots[f'Total_T1_{metric_target}'].fillna(0)
-
-df_snapshots = df_snapshots.dropna(subset=['Min_Num'])
+    # Versão dos dados de treino (vai para o manifesto): formato do processamento, período coberto e hash do cubo
+    if versao_dados is None:
+        versao_dados = (
+            f"p{config.VERSAO_PROCESSAMENTO}:{df['Data'].min():%Y-%m-%d}..{df['Data'].max():%Y-%m-%d}:{len(df)}:"
+            + hashlib.sha256(pd.util.hash_pandas_object(df_features.reset_index()[CHAVE_CUBO + cols_target], index=False).to_numpy().tobytes()).hexdigest()[:16]
+        )
+    return df_snapshots, versao_dados
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 4. TREINAR OS MODELOS E EXIBIR RAIO-X
+# 4. JOBS DE TREINO (MÉTRICA × PERÍODO)
 # ─────────────────────────────────────────────────────────────────────────────
-print("\n[4/4] Iniciando Treino...")
-os.makedirs(DIRETORIO_MODELOS, exist_ok=True)
-
-for metric_target in MAPA_METRICAS.keys():
-    print(f"\n" + "="*55)
-    print(f"🚀 TREINANDO E AVALIANDO: {metric_target.upper()}")
-    print("="*55)
-    
+def features_do_job(metric_target, periodo):
     # As features base agora incluem a funcionalidade do Passo 3
-    FEATURES_BASE = [
-        'Min_Num', 
-        'Dias_Descanso', 
-        'N_Jogos', 
+    features = [
+        'Min_Num',
+        'Dias_Descanso',
+        'N_Jogos',
         'Carga_3Jogos_PL',
         'Diff_Gols', 'Jogou_em_Casa',
-        f'{metric_target}_Acumulado_Agora', 
+        f'{metric_target}_Acumulado_Agora',
         'Posicao_encoded',
-        'Minutagem_Temporada',   
-        f'Ritmo_{metric_target}',            # <-- Nova Inteligência de Pacing 
-        f'Media_Geral_{metric_target}',       
-        f'Trend_{metric_target}'              
+        'Minutagem_Temporada',
+        f'Ritmo_{metric_target}',            # <-- Nova Inteligência de Pacing
+        f'Media_Geral_{metric_target}',
+        f'Trend_{metric_target}'
     ]
-    
+    # 🚀 PASSO 1 DA MELHORIA: Inserir a herança de fadiga no 2º Tempo
+    if periodo == 2:
+        features.append(f'Total_T1_{metric_target}')
+    return features
+
+def hiperparametros_do_job(metric_target):
+    # 🚀 PASSO 5 DA MELHORIA: Tuning Dinâmico do Cérebro
+    # Sprints e HIA têm muito ruído (estocásticos). Menos árvores evitam o "overfitting"
+    if 'V5' in metric_target or 'HIA' in metric_target:
+        n_est, max_d, lr = 100, 3, 0.03
+    else:
+        # Distância e Carga são mais lineares. Árvores mais profundas captam a curva fisiológica.
+        n_est, max_d, lr = 300, 5, 0.05
+    return {'n_estimators': n_est, 'max_depth': max_d, 'learning_rate': lr, 'random_state': RANDOM_STATE}
+
+def artefacto_atual(entrada, diretorio, versao_dados, features, hiperparametros):
+    """O modelo do manifesto já corresponde a este job (mesmos dados, features e hiperparâmetros) e o ficheiro está lá?"""
+    if entrada is None:
+        return False
+    caminho = os.path.join(diretorio, entrada['arquivo'])
+    return (
+        entrada.get('versao_dados') == versao_dados and entrada.get('features') == features
+        and entrada.get('hiperparametros') == hiperparametros
+        and os.path.exists(caminho) and os.path.getsize(caminho) == entrada.get('bytes')
+    )
+
+def treinar_job(metric_target, periodo, df_treino, features, hiperparametros, threads):
+    """
+    Holdout (Raio-X) + modelo final de uma métrica/período. Corre num processo do pool:
+    devolve o booster e o relatório em vez de imprimir (a saída dos jobs não se mistura)
+    e quem grava no manifesto é o processo principal, um modelo de cada vez.
+    """
+    inicio = time.perf_counter()
     alvo = f'TARGET_{metric_target}'
-    
-    for periodo in [1, 2]:
-        print(f"\n  ⏱️  {periodo}º TEMPO:")
-        
-        # Copiamos as features para não alterar a base do outro período
-        features_atuais = FEATURES_BASE.copy()
-        
-        # 🚀 PASSO 1 DA MELHORIA: Inserir a herança de fadiga no 2º Tempo
-        if periodo == 2:
-            features_atuais.append(f'Total_T1_{metric_target}')
-        
-        df_treino = df_snapshots[(df_snapshots['Período'] == periodo) & (df_snapshots['Min_Num'] > 0)].copy()
-        colunas_necessarias = features_atuais + [alvo, 'Data', 'Name']
-        df_treino = df_treino[colunas_necessarias].dropna()
-        
-        if len(df_treino) < 50:
-            print(f"     ⚠️ Poucos dados ({len(df_treino)} linhas). Pulando...")
-            continue
-            
-        X = df_treino[features_atuais]
-        y = df_treino[alvo]
-        grupos = df_treino['Data'].astype(str) + "_" + df_treino['Name']
-        
-        gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=RANDOM_STATE)
-        train_idx, test_idx = next(gss.split(X, y, groups=grupos))
-        
-        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-        
-        # 🚀 PASSO 5 DA MELHORIA: Tuning Dinâmico do Cérebro
-        # Sprints e HIA têm muito ruído (estocásticos). Menos árvores evitam o "overfitting"
-        is_explosivo = 'V5' in metric_target or 'HIA' in metric_target
-        if is_explosivo:
-            n_est, max_d, lr = 100, 3, 0.03
-        else:
-            # Distância e Carga são mais lineares. Árvores mais profundas captam a curva fisiológica.
-            n_est, max_d, lr = 300, 5, 0.05
-            
-        modelo = xgb.XGBRegressor(n_estimators=n_est, max_depth=max_d, learning_rate=lr, random_state=RANDOM_STATE, verbosity=0)
-        modelo.fit(X_train, y_train)
-        y_pred = modelo.predict(X_test)
-        
-        mae = mean_absolute_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
-        
-        print(f"     📊 Métricas de Teste:")
-        print(f"        - MAE (Erro Absoluto):  {mae:.1f}")
-        print(f"        - R² (Acurácia Global): {max(0, r2)*100:.1f} %")
-        
-        importancias = modelo.feature_importances_
-        indices_top = np.argsort(importancias)[::-1][:3]
-        print(f"     🧠 O que mais pesa (Top 3):")
-        for idx in indices_top:
-            print(f"        - {features_atuais[idx]}: {importancias[idx]*100:.1f}%")
-
-        print(f"     👀 Exemplos (Teste Cego - Alvo EQ45/50):")
-        amostra_idx = np.random.choice(len(y_test), 5, replace=False) if len(y_test) > 5 else range(len(y_test))
-        for i in amostra_idx:
-            real = y_test.iloc[i]
-            previsto = y_pred[i]
-            diff = previsto - real
-            minuto_amostra = X_test.iloc[i]['Min_Num']
-            print(f"        > Snapshot aos {minuto_amostra:.0f}' | Real: {real:.0f} | IA Previu: {previsto:.0f} | Erro: {diff:+.0f}")
-            
-        # Treinamento final aproveitando todos os dados daquela métrica/período
-        modelo_final = xgb.XGBRegressor(n_estimators=n_est, max_depth=max_d, learning_rate=lr, random_state=RANDOM_STATE, verbosity=0)
-        modelo_final.fit(X, y)
-        mae_final = mean_absolute_error(y, modelo_final.predict(X))
-        
-        nome_arquivo = f'modelo_{metric_target}_T{periodo}.pkl'
-        caminho_salvar = os.path.join(DIRETORIO_MODELOS, nome_arquivo)
-        
-        with open(caminho_salvar, 'wb') as f:
-            pickle.dump({
-                'modelo': modelo_final,
-                'features': features_atuais,
-                'mae': mae_final
-            }, f)
-            
-        print(f"     💾 IA salva: '{nome_arquivo}'")
-
-print("\n" + "=" * 65)
-print("✅ SUCESSO! Modelos atualizados com Herança T1, Ritmo e Tuning Dinâmico.")
-print("=" * 65)
\ No newline at end of file
+    X = df_treino[features]
+    y = df_treino[alvo]
+    grupos = df_treino['Data'].astype(str) + "_" + df_treino['Name'].astype(str)
+    linhas = [f"\n  ⏱️  {metric_target.upper()} — {periodo}º TEMPO ({len(df_treino)} snapshots):"]
+
+    gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=RANDOM_STATE)
+    train_idx, test_idx = next(gss.split(X, y, groups=grupos))
+
+    X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+    y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
+
+    modelo = xgb.XGBRegressor(**hiperparametros, n_jobs=threads, verbosity=0)
+    modelo.fit(X_train, y_train)
+    y_pred = modelo.predict(X_test)
+
+    mae = mean_absolute_error(y_test, y_pred)
+    r2 = r2_score(y_test, y_pred)
+
+    linhas.append(f"     📊 Métricas de Teste:")
+    linhas.append(f"        - MAE (Erro Absoluto):  {mae:.1f}")
+    linhas.append(f"        - R² (Acurácia Global): {max(0, r2)*100:.1f} %")
+
+    importancias = modelo.feature_importances_
+    indices_top = np.argsort(importancias)[::-1][:3]
+    linhas.append(f"     🧠 O que mais pesa (Top 3):")
+    for idx in indices_top:
+        linhas.append(f"        - {features[idx]}: {importancias[idx]*100:.1f}%")
+
+    linhas.append(f"     👀 Exemplos (Teste Cego - Alvo EQ45/50):")
+    rng = np.random.default_rng(RANDOM_STATE)
+    amostra_idx = rng.choice(len(y_test), 5, replace=False) if len(y_test) > 5 else range(len(y_test))
+    for i in amostra_idx:
+        real = y_test.iloc[i]
+        previsto = y_pred[i]
+        diff = previsto - real
+        minuto_amostra = X_test.iloc[i]['Min_Num']
+        linhas.append(f"        > Snapshot aos {minuto_amostra:.0f}' | Real: {real:.0f} | IA Previu: {previsto:.0f} | Erro: {diff:+.0f}")
+
+    # Treinamento final aproveitando todos os dados daquela métrica/período
+    modelo_final = xgb.XGBRegressor(**hiperparametros, n_jobs=threads, verbosity=0)
+    modelo_final.fit(X, y)
+    mae_final = mean_absolute_error(y, modelo_final.predict(X))
+
+    return {
+        'booster': modelo_final.get_booster(), 'mae_final': mae_final, 'mae': mae, 'r2': r2,
+        'linhas': linhas, 'segundos': time.perf_counter() - inicio,
+    }
+
+def dividir_nucleos(n_jobs, processos=None, threads=None):
+    """(processos, threads por modelo) de forma que processos × threads não passe dos núcleos da máquina."""
+    nucleos = os.cpu_count() or 1
+    processos = max(1, min(processos or nucleos, n_jobs))
+    threads = threads or max(1, nucleos // processos)
+    return processos, threads
+
+def treinar_modelos(df_snapshots, versao_dados, metricas=None, periodos=None, diretorio=None,
+                    processos=None, threads=None, forcar=False):
+    """
+    Treina os jobs métrica × período pedidos e grava cada booster no manifesto de `diretorio`.
+    Devolve o resumo por job: estado ('treinado', 'atual', 'poucos dados'), linhas, MAE, R² e segundos.
+    """
+    metricas = list(metricas or MAPA_METRICAS)
+    periodos = list(periodos or PERIODOS)
+    diretorio = diretorio or DIRETORIO_MODELOS
+    os.makedirs(diretorio, exist_ok=True)
+    modelos_manifesto = ler_manifesto_modelos(diretorio).get('modelos', {})
+
+    resumo, pendentes = [], []
+    for metric_target in metricas:
+        for periodo in periodos:
+            features = features_do_job(metric_target, periodo)
+            hiperparametros = hiperparametros_do_job(metric_target)
+            job = {'Job': chave_modelo(metric_target, periodo), 'Estado': 'atual', 'Linhas': 0, 'MAE': np.nan, 'R2': np.nan, 'Segundos': 0.0}
+            if not forcar and artefacto_atual(modelos_manifesto.get(job['Job']), diretorio, versao_dados, features, hiperparametros):
+                resumo.append(job)
+                continue
+
+            df_treino = df_snapshots[(df_snapshots['Período'] == periodo) & (df_snapshots['Min_Num'] > 0)]
+            df_treino = df_treino[features + [f'TARGET_{metric_target}', 'Data', 'Name']].dropna()
+            job['Linhas'] = len(df_treino)
+            if len(df_treino) < MIN_LINHAS_TREINO:
+                print(f"  ⚠️ {job['Job']}: poucos dados ({len(df_treino)} linhas). Pulando...")
+                job['Estado'] = 'poucos dados'
+                resumo.append(job)
+                continue
+            pendentes.append((job, (metric_target, periodo, df_treino, features, hiperparametros)))
+
+    print(f"\n[4/4] Iniciando Treino... {len(pendentes)} job(s) a treinar, {len(resumo)} pulado(s)")
+    if not pendentes:
+        return pd.DataFrame(resumo)
+
+    processos, threads = dividir_nucleos(len(pendentes), processos, threads)
+    print(f"  🧵 {processos} processo(s) × {threads} thread(s) por modelo ({os.cpu_count()} núcleos)")
+    # Os jobs mais pesados (mais árvores, mais linhas) entram primeiro: o pool termina mais equilibrado
+    pendentes.sort(key=lambda p: (p[1][4]['n_estimators'] * p[1][4]['max_depth'], len(p[1][2])), reverse=True)
+
+    def concluir(job, args, resultado):
+        metric_target, periodo, _, features, hiperparametros = args
+        print("\n".join(resultado['linhas']))
+        # Árvores compactas do booster (.npz) + entrada no manifesto; troca atómica, o app nunca lê um ficheiro a meio
+        nome_arquivo = gravar_modelo(
+            diretorio, metric_target, periodo, resultado['booster'],
+            features, resultado['mae_final'], hiperparametros, versao_dados,
+        )
+        print(f"     💾 IA salva: '{nome_arquivo}' ({resultado['segundos']:.1f}s)")
+        job.update({'Estado': 'treinado', 'MAE': resultado['mae'], 'R2': resultado['r2'], 'Segundos': resultado['segundos']})
+        resumo.append(job)
+
+    if processos == 1:
+        for job, args in pendentes:
+            concluir(job, args, treinar_job(*args, threads))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = {pool.submit(treinar_job, *args, threads): (job, args) for job, args in pendentes}
+            for futuro in as_completed(futuros):
+                concluir(*futuros[futuro], futuro.result())
+    return pd.DataFrame(resumo)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--metricas', nargs='+', choices=list(MAPA_METRICAS), help="Padrão: todas")
+    parser.add_argument('--periodos', nargs='+', type=int, choices=PERIODOS, help="Padrão: 1 e 2")
+    parser.add_argument('--saida', default=DIRETORIO_MODELOS, help="Pasta dos modelos e do manifesto")
+    parser.add_argument('--versao-dados', help="Rótulo da versão dos dados (padrão: hash dos alvos do cubo)")
+    parser.add_argument('--processos', type=int, help="Padrão: um por núcleo, até ao nº de jobs")
+    parser.add_argument('--threads-por-modelo', type=int, help="Padrão: núcleos / processos")
+    parser.add_argument('--forcar', action='store_true', help="Retreina mesmo os modelos já atuais")
+    args = parser.parse_args()
+
+    print("=" * 65)
+    print("  MODELO PREDITIVO - APROVEITAMENTO TOTAL (INCLUI SUBSTITUIÇÕES)")
+    print("=" * 65)
+    inicio = time.perf_counter()
+
+    df = carregar_dados()
+    if df is None:
+        print("❌ Falha ao carregar dados. Abortando.")
+        sys.exit(1)
+    df_snapshots, versao_dados = preparar_snapshots(df, args.versao_dados)
+    segundos_dados = time.perf_counter() - inicio
+    print(f"  📦 Versão dos dados: {versao_dados}")
+
+    inicio_treino = time.perf_counter()
+    resumo = treinar_modelos(
+        df_snapshots, versao_dados, args.metricas, args.periodos, args.saida,
+        args.processos, args.threads_por_modelo, args.forcar,
+    )
+    segundos_treino = time.perf_counter() - inicio_treino
+
+    print("\n" + "=" * 65)
+    print(f"{'Job':<16} {'Estado':<13} {'Linhas':>8} {'MAE':>9} {'R²':>7} {'Tempo':>8}")
+    for _, job in resumo.iterrows():
+        mae = f"{job['MAE']:.1f}" if pd.notna(job['MAE']) else "-"
+        r2 = f"{max(0, job['R2'])*100:.1f}%" if pd.notna(job['R2']) else "-"
+        print(f"{job['Job']:<16} {job['Estado']:<13} {job['Linhas']:>8} {mae:>9} {r2:>7} {job['Segundos']:>7.1f}s")
+    soma_jobs = resumo['Segundos'].sum()
+    print(f"\n⏱️ Dados: {segundos_dados:.1f}s | Treino: {segundos_treino:.1f}s de relógio "
+          f"({soma_jobs:.1f}s somando os jobs, {soma_jobs / max(segundos_treino, 1e-9):.1f}x) | Total: {time.perf_counter() - inicio:.1f}s")
+    print("✅ SUCESSO! Modelos atualizados com Herança T1, Ritmo e Tuning Dinâmico.")
+    print("=" * 65)
+
+if __name__ == "__main__":
+    main()
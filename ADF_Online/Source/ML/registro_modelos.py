@@ -0,0 +1,342 @@
+"""
+=====================================================================
+REGISTRO DE MODELOS EM MEMÓRIA (UM POR PROCESSO)
+=====================================================================
+Cada artefacto de Models/ é carregado uma vez e partilhado por todas as
+sessões e abas. A chave é o caminho + (mtime, tamanho) do ficheiro: quando
+o predictive.py grava um modelo novo, a próxima chamada vê o stat diferente
+e recarrega só esse ficheiro. Acima de config.MAX_MODELOS_EM_MEMORIA ou de
+config.MEMORIA_MAX_MODELOS_MB saem os modelos usados há mais tempo (LRU).
+
+Os modelos são as árvores dos boosters do XGBoost em forma compacta (.npz,
+só o que a previsão usa) descritas num único manifesto JSON (features, MAE,
+versão dos dados de treino, hiperparâmetros e sha256 de cada ficheiro). O app
+prevê com NumPy, sem importar o xgboost. Os .pkl antigos só são lidos se não
+houver manifesto.
+=====================================================================
+"""
+import io
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import Source.Dados.config as config
+
+# Contadores para o painel de debug da Home
+ESTATISTICAS_MODELOS = {
+    'pedidos': 0, 'acertos': 0, 'cargas': 0, 'recargas': 0, 'despejos': 0, 'falhas': 0,
+    'segundos_ultima_carga': None, 'segundos_total_carga': 0.0, 'em_memoria': 0, 'megabytes': 0.0,
+}
+
+class RegistroModelos:
+    """Cache LRU de artefactos ({'modelo': árvores, 'features', 'mae'}) invalidado pelo stat do ficheiro."""
+
+    def __init__(self, max_modelos=None, max_megabytes=None):
+        self.max_modelos = max_modelos or config.MAX_MODELOS_EM_MEMORIA
+        self.max_bytes = (max_megabytes or config.MEMORIA_MAX_MODELOS_MB) * 1e6
+        self._entradas = OrderedDict() # caminho -> (assinatura, artefacto, bytes)
+        self._lock = threading.Lock()
+
+    def obter(self, caminho, carregar=None):
+        """
+        Artefacto do ficheiro (carregado no máximo uma vez por versão do ficheiro); None se não existir.
+        `carregar(caminho)` lê o artefacto; por omissão, pickle.
+        """
+        ESTATISTICAS_MODELOS['pedidos'] += 1
+        try:
+            stat = os.stat(caminho)
+        except FileNotFoundError:
+            with self._lock:
+                self._remover(caminho)
+            return None
+        assinatura = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock: # Também impede que duas sessões carreguem o mesmo ficheiro ao mesmo tempo
+            entrada = self._entradas.get(caminho)
+            if entrada is not None and entrada[0] == assinatura:
+                self._entradas.move_to_end(caminho)
+                ESTATISTICAS_MODELOS['acertos'] += 1
+                return entrada[1]
+
+            inicio = time.perf_counter()
+            try:
+                artefacto = (carregar or _ler_pickle)(caminho)
+            except Exception as e:
+                # Ficheiro a meio de ser gravado ou checksum errado: fica a versão anterior, tenta de novo na próxima chamada
+                ESTATISTICAS_MODELOS['falhas'] += 1
+                print(f"⚠️ Modelo não carregado ({os.path.basename(caminho)}): {e}")
+                return entrada[1] if entrada is not None else None
+            segundos = time.perf_counter() - inicio
+
+            ESTATISTICAS_MODELOS['recargas' if entrada is not None else 'cargas'] += 1
+            ESTATISTICAS_MODELOS['segundos_ultima_carga'] = segundos
+            ESTATISTICAS_MODELOS['segundos_total_carga'] += segundos
+            self._remover(caminho)
+            # Memória das árvores compactas (o .npz é comprimido); nos pickles antigos, o tamanho do ficheiro
+            modelo = artefacto.get('modelo') if isinstance(artefacto, dict) else None
+            self._entradas[caminho] = (assinatura, artefacto, getattr(modelo, 'nbytes', stat.st_size))
+            self._despejar()
+            return artefacto
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._atualizar_estatisticas()
+
+    def _remover(self, caminho):
+        if self._entradas.pop(caminho, None) is not None:
+            self._atualizar_estatisticas()
+
+    def _despejar(self):
+        """Tira os menos usados até caber nos limites (o mais recente fica sempre)."""
+        while len(self._entradas) > 1 and (
+            len(self._entradas) > self.max_modelos or sum(e[2] for e in self._entradas.values()) > self.max_bytes
+        ):
+            self._entradas.popitem(last=False)
+            ESTATISTICAS_MODELOS['despejos'] += 1
+        self._atualizar_estatisticas()
+
+    def _atualizar_estatisticas(self):
+        ESTATISTICAS_MODELOS['em_memoria'] = len(self._entradas)
+        ESTATISTICAS_MODELOS['megabytes'] = sum(e[2] for e in self._entradas.values()) / 1e6
+
+REGISTRO_MODELOS = RegistroModelos()
+
+def _ler_pickle(caminho):
+    with open(caminho, 'rb') as f:
+        return pickle.load(f)
+
+def obter_modelo(caminho):
+    return REGISTRO_MODELOS.obter(caminho)
+
+# ---------------------------------------------------------
+# ÁRVORES COMPACTAS (.npz) + MANIFESTO
+# ---------------------------------------------------------
+# Models/manifesto_modelos.json:
+#   {"formato": 2, "xgboost": "3.2.0", "modelos": {"Dist_Total_T1": {"arquivo": "modelo_Dist_Total_T1.npz",
+#    "features": [...], "mae": 93.7, "versao_dados": "...", "hiperparametros": {...}, "sha256": "...", "bytes": 123}}}
+# Para prever, de cada nó bastam a feature, o limiar, os dois filhos e o lado dos valores
+# em falta (nas folhas, o limiar guarda o valor da folha). O treino grava só isso, tirado do
+# booster: o UBJSON traz também as estatísticas do treino (ganho, cobertura, pesos, pais) e
+# fica ~12× maior. Sem o booster, o app não importa o xgboost, que importa o sklearn (~1,3 s).
+# O modelo é gravado primeiro e o manifesto depois (ambos por troca atómica); se o app
+# apanhar o modelo novo com o manifesto antigo, o sha256 não bate e fica o modelo anterior.
+# Os manifestos do formato 1 (boosters .ubj) ainda são lidos, com o xgboost.
+FORMATO_MANIFESTO_MODELOS = 2
+
+# Objetivos em que a previsão é a soma das folhas (sem função de ligação)
+OBJETIVOS_IDENTIDADE = ('reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror')
+
+class ArvoresCompactas:
+    """
+    Árvores de regressão de um booster, previstas com NumPy (mesma chamada do xgb.Booster: inplace_predict).
+    Todas as árvores descem juntas, um nível por passo (as folhas apontam para si próprias). As folhas
+    somam-se em float32, na ordem das árvores e a partir do base_score, como no XGBoost: as previsões
+    são bit a bit as do booster (gravar_modelo confere-o).
+    """
+
+    def __init__(self, feature, limiar, esquerda, direita, padrao_esquerda, base, profundidade):
+        # Matrizes n_arvores × n_nos (árvores menores completadas com folhas); em memória, planas
+        self.matrizes = {
+            'feature': feature, 'limiar': limiar, 'esquerda': esquerda, 'direita': direita,
+            'padrao_esquerda': padrao_esquerda, 'base': np.float32(base), 'profundidade': int(profundidade),
+        }
+        n_arvores, n_nos = limiar.shape
+        self.raizes = np.arange(n_arvores) * n_nos
+        self.feature = feature.ravel().astype(np.intp)
+        self.limiar = limiar.ravel().astype(np.float32)
+        # Filhos de cada nó lado a lado, [direita, esquerda]: o filho do nó i é filhos[2 * i + vai_esquerda]
+        self.filhos = np.stack([direita + self.raizes[:, None], esquerda + self.raizes[:, None]], axis=-1).ravel()
+        self.padrao_esquerda = padrao_esquerda.ravel().astype(bool)
+        self.base = np.float32(base)
+        self.profundidade = int(profundidade)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.raizes, self.feature, self.limiar, self.filhos, self.padrao_esquerda))
+
+    @classmethod
+    def do_booster(cls, booster):
+        """Árvores de um xgb.Booster (gbtree de um só alvo, splits numéricos, objetivo sem função de ligação)."""
+        learner = json.loads(bytes(booster.save_raw(raw_format='json')))['learner']
+        objetivo = learner['objective']['name']
+        modelo = learner['gradient_booster'].get('model', {})
+        if learner['gradient_booster']['name'] != 'gbtree' or objetivo not in OBJETIVOS_IDENTIDADE:
+            raise ValueError(f"booster {learner['gradient_booster']['name']} / {objetivo} sem forma compacta")
+        if int(learner['learner_model_param'].get('num_target', 1)) != 1 or any(modelo['tree_info']):
+            raise ValueError("booster com mais de um alvo sem forma compacta")
+        arvores = modelo['trees']
+        if any(any(a['split_type']) for a in arvores):
+            raise ValueError("splits categóricos sem forma compacta")
+
+        n_nos = max(len(a['left_children']) for a in arvores)
+        nos = np.arange(n_nos)
+        feature = np.zeros((len(arvores), n_nos), np.int32)
+        limiar = np.zeros((len(arvores), n_nos), np.float32)
+        esquerda = np.tile(nos, (len(arvores), 1)).astype(np.int32) # Nós a mais: folhas de valor 0 (nunca alcançadas)
+        direita = esquerda.copy()
+        padrao_esquerda = np.zeros((len(arvores), n_nos), bool)
+        profundidade = 0
+        for i, arvore in enumerate(arvores):
+            k = len(arvore['left_children'])
+            filhos_esq, filhos_dir = np.array(arvore['left_children']), np.array(arvore['right_children'])
+            folha = filhos_esq < 0
+            esquerda[i, :k] = np.where(folha, nos[:k], filhos_esq)
+            direita[i, :k] = np.where(folha, nos[:k], filhos_dir)
+            feature[i, :k] = arvore['split_indices']
+            limiar[i, :k] = arvore['split_conditions']
+            padrao_esquerda[i, :k] = arvore['default_left']
+            profundidade = max(profundidade, _profundidade(filhos_esq, filhos_dir))
+        base = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+        return cls(feature, limiar, esquerda, direita, padrao_esquerda, base, profundidade)
+
+    def inplace_predict(self, dados):
+        dados = np.asarray(dados, dtype=np.float32) # O XGBoost também compara em float32
+        if dados.ndim == 1:
+            dados = dados[None, :]
+        linhas, colunas = dados.shape
+        deslocamento = (np.arange(linhas) * colunas)[:, None] # Índice de cada linha na matriz achatada
+        dados = dados.ravel()
+        no = np.broadcast_to(self.raizes, (linhas, len(self.raizes)))
+        for _ in range(self.profundidade):
+            valores = dados[deslocamento + self.feature[no]]
+            # Valor em falta (NaN) vai para o lado padrão do nó; nas folhas os dois filhos são ela própria
+            vai_esquerda = (valores < self.limiar[no]) | (np.isnan(valores) & self.padrao_esquerda[no])
+            no = self.filhos[2 * no + vai_esquerda]
+        folhas = np.hstack([np.full((linhas, 1), self.base, np.float32), self.limiar[no]])
+        return np.cumsum(folhas, axis=1, dtype=np.float32)[:, -1] # cumsum: soma sequencial, como o XGBoost
+
+    def para_bytes(self):
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **self.matrizes)
+        return buffer.getvalue()
+
+    @classmethod
+    def de_bytes(cls, dados):
+        with np.load(io.BytesIO(dados)) as arquivo:
+            return cls(**{nome: arquivo[nome] for nome in arquivo.files})
+
+def _profundidade(filhos_esq, filhos_dir):
+    """Nº de splits do caminho mais longo da raiz a uma folha."""
+    profundidade, nivel = 0, np.array([0])
+    while True:
+        internos = nivel[filhos_esq[nivel] >= 0]
+        if internos.size == 0:
+            return profundidade
+        nivel = np.concatenate([filhos_esq[internos], filhos_dir[internos]])
+        profundidade += 1
+
+def _amostra_conferencia(arvores, n_features, linhas=512, semente=0):
+    """Linhas com valores em cima, logo abaixo e logo acima dos limiares de cada feature, e valores em falta."""
+    rng = np.random.default_rng(semente)
+    limiares = arvores.matrizes['limiar'].ravel()
+    features = arvores.matrizes['feature'].ravel()
+    internos = (arvores.matrizes['esquerda'] != np.arange(limiares.size).reshape(arvores.matrizes['esquerda'].shape)).ravel()
+    dados = rng.normal(size=(linhas, n_features)).astype(np.float32)
+    for f in range(n_features):
+        candidatos = limiares[internos & (features == f)]
+        if candidatos.size:
+            escolhidos = rng.choice(candidatos, linhas)
+            dados[:, f] = np.nextafter(escolhidos, rng.choice([-np.inf, np.inf], linhas).astype(np.float32))
+            dados[::3, f] = escolhidos[::3]
+    dados[rng.random(dados.shape) < 0.1] = np.nan
+    return dados
+
+def chave_modelo(sufixo, periodo):
+    """chave_modelo('Dist_Total', 1) -> 'Dist_Total_T1' (sufixo = nome do alvo no predictive.py)."""
+    return f"{sufixo}_T{periodo}"
+
+def _caminho_manifesto(diretorio=None):
+    return os.path.join(diretorio or config.DIRETORIO_MODELOS, config.ARQUIVO_MANIFESTO_MODELOS)
+
+def _ler_json(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+def _gravar_atomico(caminho, dados):
+    with open(caminho + '.tmp', 'wb') as f:
+        f.write(dados)
+    os.replace(caminho + '.tmp', caminho)
+
+# Manifesto lido por pasta de modelos: caminho -> (stat, dict). Fica fora do LRU dos boosters
+# (não conta no limite nem nas estatísticas, e não despeja nem é despejado por um modelo)
+_MANIFESTOS = {}
+_LOCK_MANIFESTOS = threading.Lock()
+
+def ler_manifesto_modelos(diretorio=None):
+    """Manifesto dos modelos (só é relido quando o stat do ficheiro muda); vazio se não existir ou estiver ilegível."""
+    caminho = _caminho_manifesto(diretorio)
+    try:
+        stat = os.stat(caminho)
+    except FileNotFoundError:
+        _MANIFESTOS.pop(caminho, None)
+        return {'modelos': {}}
+    assinatura = (stat.st_mtime_ns, stat.st_size)
+    with _LOCK_MANIFESTOS:
+        entrada = _MANIFESTOS.get(caminho)
+        if entrada is not None and entrada[0] == assinatura:
+            return entrada[1]
+        try:
+            manifesto = _ler_json(caminho)
+        except (OSError, ValueError) as e:
+            # Manifesto a meio de ser trocado: fica o anterior, tenta de novo na próxima chamada
+            print(f"⚠️ Manifesto de modelos não lido: {e}")
+            return entrada[1] if entrada is not None else {'modelos': {}}
+        _MANIFESTOS[caminho] = (assinatura, manifesto)
+        return manifesto
+
+def gravar_modelo(diretorio, sufixo, periodo, booster, features, mae, hiperparametros, versao_dados):
+    """
+    Grava as árvores compactas do booster e regista-as no manifesto (chamado pelo treino, um modelo de cada vez).
+    Antes de gravar, confere que preveem o mesmo que o booster (ValueError se não).
+    """
+    import xgboost as xgb
+    arvores = ArvoresCompactas.do_booster(booster)
+    amostra = _amostra_conferencia(arvores, len(features))
+    if not np.array_equal(arvores.inplace_predict(amostra), booster.inplace_predict(amostra), equal_nan=True):
+        raise ValueError(f"árvores compactas de {chave_modelo(sufixo, periodo)} preveem diferente do booster")
+
+    arquivo = f"modelo_{chave_modelo(sufixo, periodo)}.npz"
+    dados = arvores.para_bytes()
+    _gravar_atomico(os.path.join(diretorio, arquivo), dados)
+
+    caminho_manifesto = _caminho_manifesto(diretorio)
+    manifesto = _ler_json(caminho_manifesto) if os.path.exists(caminho_manifesto) else {}
+    manifesto.update({'formato': FORMATO_MANIFESTO_MODELOS, 'xgboost': xgb.__version__})
+    manifesto.setdefault('modelos', {})[chave_modelo(sufixo, periodo)] = {
+        'arquivo': arquivo, 'features': list(features), 'mae': float(mae), 'versao_dados': versao_dados,
+        'hiperparametros': hiperparametros, 'sha256': hashlib.sha256(dados).hexdigest(), 'bytes': len(dados),
+        'gravado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    _gravar_atomico(caminho_manifesto, json.dumps(manifesto, ensure_ascii=False, indent=2).encode('utf-8'))
+    return arquivo
+
+def _carregador_modelo(entrada):
+    def carregar(caminho):
+        with open(caminho, 'rb') as f:
+            dados = f.read()
+        if hashlib.sha256(dados).hexdigest() != entrada['sha256']:
+            raise ValueError("sha256 diferente do manifesto")
+        if entrada['arquivo'].endswith('.ubj'): # Manifesto do formato 1: booster inteiro
+            import xgboost as xgb
+            modelo = xgb.Booster()
+            modelo.load_model(bytearray(dados))
+        else:
+            modelo = ArvoresCompactas.de_bytes(dados)
+        return {'modelo': modelo, 'features': entrada['features'], 'mae': entrada['mae'], 'manifesto': entrada}
+    return carregar
+
+def obter_modelo_treinado(sufixo, periodo, diretorio=None):
+    """
+    {'modelo', 'features', 'mae'} do modelo sufixo/período: árvores compactas pelo manifesto,
+    ou o .pkl antigo se o manifesto não o tiver. None se não houver modelo.
+    """
+    diretorio = diretorio or config.DIRETORIO_MODELOS
+    entrada = ler_manifesto_modelos(diretorio).get('modelos', {}).get(chave_modelo(sufixo, periodo))
+    if entrada is not None:
+        return REGISTRO_MODELOS.obter(os.path.join(diretorio, entrada['arquivo']), carregar=_carregador_modelo(entrada))
+    return obter_modelo(os.path.join(diretorio, f"modelo_{chave_modelo(sufixo, periodo)}.pkl"))
@@ -1,7 +1,7 @@
 import streamlit as st
 from PIL import Image
 import Source.UI.visual as visual
-from Source.Dados.data_loader import load_global_data, obter_hora_modificacao
+import Source.Dados.ingestao as ingestao
 import Source.Dados.config as config
 
 def renderizar_cabecalho(titulo, subtitulo):
@@ -181,20 +181,41 @@ def renderizar_menu_superior(pagina_atual="Home"):
                     if not is_active:
                         st.switch_page(caminho_pagina)
 
-# O "run_every" faz apenas este bloco de código rodar a cada 5 segundos
-@st.fragment(run_every="5s")
+def sincronizar_dados():
+    """
+    Coloca o snapshot atual do serviço de ingestão no session_state e devolve-o.
+    Nenhuma página lê o Excel: todas partilham a versão publicada pela thread de ingestão.
+    """
+    snapshot = ingestao.obter_snapshot()
+    if not snapshot.df.empty:
+        st.session_state['df_global'] = snapshot.df
+        st.session_state['df_recordes'] = snapshot.df_recordes
+        st.session_state['df_cubo'] = snapshot.derivados['cubo']
+        st.session_state['indice_global'] = snapshot.derivados['indice']
+        st.session_state['df_features'] = snapshot.derivados.get('features')
+        st.session_state['curvas_minuto'] = snapshot.derivados.get('curvas')
+        st.session_state['janelas_vivo'] = snapshot.derivados.get('janelas_vivo')
+        st.session_state['jogo_vivo'] = snapshot.derivados.get('jogo_vivo')
+        st.session_state['versao_dados'] = snapshot.versao
+    return snapshot
+
+@st.fragment(run_every=config.INTERVALO_VIGIA_PAGINAS_S)
+def vigiar_versao_dados():
+    """
+    Polling barato: a cada INTERVALO_VIGIA_PAGINAS_S cada sessão compara o número da versão
+    publicada com a que a página desenhou (a thread de ingestão não empurra nada para as sessões).
+    Quando há versão nova, refaz a página com o snapshot novo; caso contrário não faz nada.
+    """
+    if ingestao.versao_atual() > st.session_state.get('versao_dados', 0):
+        st.rerun()
+
+@st.fragment
 def renderizar_painel_ao_vivo(df_original, pagina_atual):
     """
     Componente inteligente anti-flicker. 
-    Ele busca ativamente dados novos sem recarregar os filtros laterais ou menus.
+    Lê o snapshot partilhado; a atualização é disparada pelo vigiar_versao_dados.
     """
-    hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-    df_novo, df_recordes_novo = load_global_data(hora_atual)
-    
-    # Atualizamos as métricas de sessão de forma invisível
-    if not df_novo.empty:
-        st.session_state['df_global'] = df_novo
-        st.session_state['df_recordes'] = df_recordes_novo
+    sincronizar_dados()
     
     # Agora pegamos os dados mais frescos
     df_ativo = st.session_state.get('df_global', df_original)
@@ -4,6 +4,7 @@ import Source.UI.visual as visual
 import Source.UI.components as ui
 import pandas as pd
 pd.set_option('future.no_silent_downcasting', True) #Ativa pandas novo comportamente para fillna
+pd.set_option('mode.copy_on_write', True) # A base é partilhada entre sessões: alterações nas páginas nunca a tocam
 
 # O set_page_config AGORA FICA AQUI NO MAESTRO, UMA ÚNICA VEZ PARA TODO O PROJETO!
 st.set_page_config(
@@ -6,15 +6,17 @@ import plotly.express as px
 import os
 import warnings
 
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
-from Source.ML.ml_engine import executar_ml_ao_vivo
+from Source.ML.ml_engine import executar_ml_ao_vivo, projetar_elenco
+from Source.Dados.data_loader import get_game, get_athlete_period, get_minutes, pico_recorde, tabela_picos, picos_por_posicao, coluna_pico, JANELAS_PICO
+from Source.Dados.janelas_vivo import estado_atleta, coluna_janela, coluna_total
 import Source.Dados.config as config
 import Source.UI.visual as visual
 import Source.UI.components as ui
 
 # Validação inicial
-if 'df_global' not in st.session_state or st.session_state['df_global'].empty:
-    st.warning("⚠️ Carregue os dados na página principal (Home) primeiro.")
+# Snapshot partilhado publicado pela thread de ingestão (não lê o Excel)
+if ui.sincronizar_dados().df.empty:
+    st.warning("⚠️ Base de dados indisponível. Verifique o arquivo Excel.")
     st.stop()
 
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
@@ -91,7 +93,7 @@ with col_esq:
     with c_camp:
         campeonatos_selecionados = st.multiselect("🏆 Campeonatos:", options=lista_campeonatos, default=[])
         
-    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico.copy()
+    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico
     lista_jogos_display = df_base_estatico.drop_duplicates(subset=['Data']).sort_values(by='Data', ascending=False)['Data_Display'].tolist()
     
     with c_jogo: 
@@ -102,7 +104,7 @@ with col_esq:
         st.stop()
         
     jogo_selecionado = df_base_estatico[df_base_estatico['Data_Display'] == jogo_selecionado_display]['Data'].iloc[0]
-    df_jogo_filtrado = df_base_estatico[df_base_estatico['Data'] == jogo_selecionado].copy()
+    df_jogo_filtrado = get_game(df_cache_estatico, st.session_state['indice_global'], jogo_selecionado)
 
     # 2. Período
     st.markdown("<br>", unsafe_allow_html=True)
@@ -132,32 +134,25 @@ with col_dir:
         </style>
     """, unsafe_allow_html=True)
 
-    @st.fragment(run_every="5s")
+    @st.fragment
     def painel_tracker_ao_vivo(campeonatos, jogo_alvo, atleta, periodo):
-        hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-        df_fresco, df_rec_fresco = load_global_data(hora_atual)
-        
-        if df_fresco.empty: df_fresco = st.session_state['df_global']
-        else:
-            st.session_state['df_global'] = df_fresco
-            st.session_state['df_recordes'] = df_rec_fresco
+        # Versão mais recente publicada (a troca de versão refaz a página via vigiar_versao_dados)
+        df_fresco = st.session_state['df_global']
+        indice = st.session_state['indice_global'] # Blocos Data × Período × Name da base ordenada
 
         df_base = df_fresco[df_fresco['Competição'].isin(campeonatos)] if campeonatos else df_fresco
-        df_atleta = df_base[df_base['Name'] == atleta].copy()
+        df_atleta = df_base[df_base['Name'] == atleta]
         
         coluna_jogo, coluna_minuto = 'Data', 'Interval'
+        # Acumulados (config.COLUNAS_ACUMULADAS) já vêm calculados da ingestão
         df_periodo = df_atleta[df_atleta['Período'] == periodo].sort_values(by=[coluna_jogo, coluna_minuto])
-        
-        # Recalcular Acumulados
-        for col_calc, col_acum in [('Total Distance', 'Dist Acumulada'), ('V4 Dist', 'V4 Dist Acumulada'), ('V5 Dist', 'V5 Dist Acumulada'), ('V4 To8 Eff', 'V4 Eff Acumulada'), ('V5 To8 Eff', 'V5 Eff Acumulada'), ('HIA', 'HIA Acumulada'), ('Player Load', 'Player Load Acumulada')]:
-            if col_calc in df_periodo.columns: df_periodo[col_acum] = df_periodo.groupby(coluna_jogo)[col_calc].cumsum()
 
         df = df_periodo.dropna(subset=[coluna_minuto]).copy()
         if df.empty:
             st.info(f"Nenhum dado encontrado para o {periodo}º Tempo deste atleta.")
             return
 
-        max_minutos_por_jogo = df.groupby(coluna_jogo)[coluna_minuto].max()
+        max_minutos_por_jogo = df.groupby(coluna_jogo, observed=True)[coluna_minuto].max()
         if jogo_alvo not in max_minutos_por_jogo.index:
             st.warning(f"O atleta selecionado não atuou no {periodo}º Tempo deste jogo.")
             return
@@ -176,11 +171,51 @@ with col_dir:
         with col_s1: minuto_corte = st.slider(f"⏱️ Início da Previsão (Corte):", min_value=1, max_value=minuto_atual_max, value=st.session_state[key_corte], step=1, key=key_corte)
         with col_s2: minuto_projecao_ate = st.slider(f"🚀 Fim da Previsão (Projetar até):", min_value=1, max_value=teto_maximo, value=max(st.session_state[key_proj], minuto_corte), step=1, key=key_proj) 
 
+        # ALERTA DE FADIGA (igual em todas as abas: calculado uma vez)
+        # Histórico pelo cubo (soma por jogo); jogo atual por fatia do índice até ao minuto atual
+        df_cubo = st.session_state['df_cubo']
+        df_cubo_hist = df_cubo[(df_cubo['Período'] == periodo) & (df_cubo[coluna_jogo] != jogo_alvo)]
+        if campeonatos:
+            df_cubo_hist = df_cubo_hist[df_cubo_hist['Competição'].isin(campeonatos)]
+        media_hist_por_atleta = df_cubo_hist.groupby('Name', observed=True)['Total Distance'].mean()
+
+        # Estado incremental (janelas_vivo.py): totais e somas móveis do jogo mais recente, sem refatiar a base
+        df_janelas = st.session_state.get('janelas_vivo') if jogo_alvo == st.session_state.get('jogo_vivo') else None
+
+        alertas_fadiga = []
+        for nome_atleta in get_game(df_fresco, indice, jogo_alvo, periodo)['Name'].unique():
+            if nome_atleta not in media_hist_por_atleta.index:
+                continue
+            estado_a = estado_atleta(df_janelas, nome_atleta, periodo)
+            if estado_a is not None and estado_a['Minuto'] <= minuto_atual_max:
+                carga_hoje_a = estado_a[coluna_total('Total Distance')]
+            else:
+                df_hoje_a = get_minutes(df_fresco, indice, nome_atleta, jogo_alvo, periodo, ate=minuto_atual_max)
+                if df_hoje_a.empty:
+                    continue
+                carga_hoje_a = df_hoje_a['Total Distance'].sum()
+            media_hist_a = media_hist_por_atleta[nome_atleta]
+            delta_a = ((carga_hoje_a / media_hist_a) - 1) * 100 if media_hist_a > 0 else 0
+
+            if delta_a > 20:
+                alertas_fadiga.append((nome_atleta, delta_a, "🔴 Sobrecarga"))
+            elif delta_a < -20:
+                alertas_fadiga.append((nome_atleta, delta_a, "🟡 Abaixo do padrão"))
+
+        # Projeção de fim de período de todo o elenco no minuto do corte (um predict por modelo, todas as abas)
+        df_features = st.session_state.get('df_features') # Features históricas do ML (lookup, publicadas pela ingestão)
+        curvas_minuto = st.session_state.get('curvas_minuto') # Somas por minuto de todos os jogos (referências dos deltas)
+        # Base inteira + índice: o jogo sai por get_game e o filtro de campeonatos vai para as curvas
+        df_elenco = projetar_elenco(
+            df_fresco, jogo_alvo, periodo, minuto_corte, df_features=df_features,
+            indice=indice, curvas_minuto=curvas_minuto, competicoes=campeonatos,
+        )
+
         df_historico_base = df[df[coluna_jogo] != jogo_alvo].copy()
         df_atual_base = df[df[coluna_jogo] == jogo_alvo].sort_values(coluna_minuto)
         
        # --- ABAS PRINCIPAIS (MÉTRICAS) ---
-        opcoes_metricas = list(config.METRICAS_CONFIG.keys())
+        opcoes_metricas = list(config.METRICAS_PROJECAO)
         # 1. O radar foi removido daqui
         abas = st.tabs(opcoes_metricas) 
         
@@ -193,7 +228,11 @@ with col_dir:
                 df_atual = df_atual_base.dropna(subset=[coluna_acumulada]).copy()
                 df_atual_corte = df_atual[df_atual[coluna_minuto] <= minuto_corte].copy()
 
-                ml = executar_ml_ao_vivo(df_historico, df_atual_corte, df_base, coluna_distancia, coluna_acumulada, coluna_minuto, coluna_jogo, jogo_alvo, periodo, minuto_projecao_ate, metrica, atleta, DIRETORIO_ATUAL)
+                ml = executar_ml_ao_vivo(
+                    df_historico, df_atual_corte, df_fresco, coluna_distancia, coluna_acumulada, coluna_minuto, coluna_jogo, jogo_alvo,
+                    periodo, minuto_projecao_ate, metrica, atleta, DIRETORIO_ATUAL, df_features,
+                    indice=indice, curvas_minuto=curvas_minuto, competicoes=campeonatos,
+                )
 
                 # =====================================================================
                 # RENDERIZANDO OS KPIs
@@ -201,15 +240,16 @@ with col_dir:
                 carga_atual = df_atual_corte[coluna_acumulada].iloc[-1] if not df_atual_corte.empty else 0
                 pl_atual = df_atual_corte['Player Load Acumulada'].iloc[-1] if 'Player Load Acumulada' in df_atual_corte.columns and not df_atual_corte.empty else 0
 
-                val_recorde = 0
-                if 'df_recordes' in st.session_state:
-                    rec = st.session_state['df_recordes']
-                    sufixo_recorde = config.METRICAS_CONFIG[metrica].get('arquivo_modelo', '').replace('modelo_', '').replace('.pkl', '') or metrica.replace(' ', '_')
-                    if f"Recorde_5min_{sufixo_recorde}" in rec.columns:
-                        recorde_atleta = rec[rec['Name'] == atleta][f"Recorde_5min_{sufixo_recorde}"].values
-                        val_recorde = recorde_atleta[0] if len(recorde_atleta) > 0 else 0
+                # Pior cenário de 5 min do atleta (motor de picos do data_loader)
+                df_recordes = st.session_state.get('df_recordes', pd.DataFrame())
+                val_recorde = pico_recorde(df_recordes, atleta, coluna_distancia, janela=5)
                 
-                esforço_atual_5m = df_atual_corte[coluna_distancia].tail(5).sum() if not df_atual_corte.empty else 0
+                # No minuto mais recente do jogo ao vivo a soma dos últimos 5 min já vem do estado incremental
+                estado = estado_atleta(df_janelas, atleta, periodo)
+                if estado is not None and estado['Minuto'] == minuto_corte:
+                    esforço_atual_5m = estado[coluna_janela(coluna_distancia, 5)]
+                else:
+                    esforço_atual_5m = df_atual_corte[coluna_distancia].tail(5).sum() if not df_atual_corte.empty else 0
                 percentual_do_limite = (esforço_atual_5m / val_recorde * 100) if val_recorde > 0 else 0
 
                 def fmt_dist(x): return f"{x:.2f}{unidade}" if not np.isnan(x) and metrica in ["Total Distance", "V4 Dist", "V5 Dist"] else f"{x:.0f}{unidade}" if not np.isnan(x) else "N/A"
@@ -222,29 +262,7 @@ with col_dir:
 
                 cor_delta = "normal" if metrica in ["V4 Dist", "HIA", "Total Distance"] else "inverse"
 
-                # ALERTA DE FADIGA
-                alertas_fadiga = []
-                for nome_atleta in df_base[df_base['Data'] == jogo_alvo]['Name'].unique():
-                    df_hist_a = df_base[(df_base['Name'] == nome_atleta) & 
-                                        (df_base['Data'] != jogo_alvo) & 
-                                        (df_base['Período'] == periodo)]
-                    df_hoje_a = df_base[(df_base['Name'] == nome_atleta) & 
-                                        (df_base['Data'] == jogo_alvo) & 
-                                        (df_base['Período'] == periodo) &
-                                        (df_base[coluna_minuto] <= minuto_atual_max)]
-                    
-                    if df_hist_a.empty or df_hoje_a.empty:
-                        continue
-                    
-                    carga_hoje_a = df_hoje_a['Total Distance'].sum()
-                    media_hist_a = df_hist_a.groupby('Data')['Total Distance'].sum().mean()
-                    delta_a = ((carga_hoje_a / media_hist_a) - 1) * 100 if media_hist_a > 0 else 0
-                    
-                    if delta_a > 20:
-                        alertas_fadiga.append((nome_atleta, delta_a, "🔴 Sobrecarga"))
-                    elif delta_a < -20:
-                        alertas_fadiga.append((nome_atleta, delta_a, "🟡 Abaixo do padrão"))
-
+                # ALERTA DE FADIGA (lista calculada antes das abas)
                 if alertas_fadiga:
                     with st.expander(f"⚠️ {len(alertas_fadiga)} atleta(s) fora do padrão — clique para ver", expanded=True):
                         COLS_POR_LINHA = 5
@@ -274,6 +292,41 @@ with col_dir:
                 with k4: renderizar_kpi_mini("Ritmo", fmt_pct_color(ml['delta_projetado_pct'], cor_delta), cor_borda=visual.CORES["primaria"], icone="📈")
                 with k5: renderizar_kpi_mini("Load Atual", f"{pl_atual:.0f}", delta=fmt_pct(ml['delta_pl_pct']), delta_color="inverse", cor_borda=visual.CORES["aviso_carga"], icone="🔋")
                 with k6: renderizar_kpi_mini("Pico (5m)", f"{percentual_do_limite:.0f}%", delta=f"{val_recorde:.0f}{unidade}", delta_color="off", cor_borda=visual.CORES["alerta_fadiga"], icone="🔥")
+                if estado is not None:
+                    sem_hia = f"{estado['Min_Desde_HIA']:.0f} min" if pd.notna(estado['Min_Desde_HIA']) else "sem ações no período"
+                    st.caption(f"⏱️ Min {estado['Minuto']:.0f} · última ação de alta intensidade: {sem_hia} · somas móveis 1/3/5/10 min: "
+                               + " / ".join(f"{estado[coluna_janela(coluna_distancia, j)]:.0f}" for j in JANELAS_PICO) + unidade)
+
+                # Picos de 1/3/5/10 min: atleta, posição dele e o maior do elenco
+                df_picos = tabela_picos(df_recordes, coluna_distancia)
+                if not df_picos.empty:
+                    with st.expander("🔥 Picos de demanda (pior cenário)"):
+                        cols_janela = [c for c in df_picos.columns if c.endswith(' min')]
+                        linha_atleta = df_picos[df_picos['Atleta'] == atleta]
+                        df_posicoes = picos_por_posicao(df_recordes)
+                        linhas = [linha_atleta.assign(Referência=f"👤 {atleta}")] if not linha_atleta.empty else []
+                        posicao_atleta = linha_atleta['Posição'].iloc[0] if not linha_atleta.empty else None
+                        if posicao_atleta and not df_posicoes.empty:
+                            pos = df_posicoes[df_posicoes['Posição'] == posicao_atleta]
+                            linhas.append(pd.DataFrame({'Referência': [f"🧩 {posicao_atleta}"], **{f"{j} min": pos[coluna_pico(coluna_distancia, j)].to_numpy() for j in JANELAS_PICO}}))
+                        linhas.append(pd.DataFrame({'Referência': ["👥 Elenco"], **{c: [df_picos[c].max()] for c in cols_janela}}))
+                        st.dataframe(pd.concat(linhas, ignore_index=True)[['Referência'] + cols_janela].set_index('Referência').style.format("{:.0f}"), width='stretch')
+
+                # Quadro do elenco: projeção, faixa do MAE e deltas de cada atleta em campo
+                df_quadro = df_elenco[df_elenco['Métrica'] == metrica] if not df_elenco.empty else df_elenco
+                if not df_quadro.empty:
+                    with st.expander(f"📋 Projeção do elenco — fim do {periodo}º T"):
+                        df_quadro = df_quadro.sort_values('Projetado', ascending=False).rename(columns={
+                            'Name': 'Atleta', 'Minuto': 'Min', 'Delta_Hist_pct': 'Δ Hist. %', 'Delta_Proj_pct': 'Δ Proj. %', 'Delta_Equipe_pct': 'Δ vs Equipe %',
+                        })
+                        cols_quadro = ['Atleta', 'Posição', 'Min', 'Atual', 'Projetado', 'Inferior', 'Superior', 'Δ Hist. %', 'Δ Proj. %', 'Δ vs Equipe %']
+                        st.dataframe(
+                            df_quadro[cols_quadro].set_index('Atleta').style
+                            .format({c: "{:.0f}" for c in ['Atual', 'Projetado', 'Inferior', 'Superior']})
+                            .format({c: "{:+.1f}" for c in ['Δ Hist. %', 'Δ Proj. %', 'Δ vs Equipe %']}),
+                            width='stretch',
+                        )
+                        st.caption(f"🤖 {df_quadro['Modelo'].iloc[0]} · faixa = projeção ± MAE do modelo")
 
                 st.markdown("<div style='margin-top: 20px; margin-bottom: 5px;'></div>", unsafe_allow_html=True)
 
@@ -332,7 +385,7 @@ with col_dir:
                         df_ritmo['Ritmo_min']  = df_ritmo[coluna_distancia]
                         df_ritmo['Ritmo_suav'] = df_ritmo['Ritmo_min'].rolling(3, min_periods=1).mean()
 
-                        ritmo_hist = df_historico.groupby(coluna_minuto)[coluna_distancia].mean().reset_index()
+                        ritmo_hist = df_historico.groupby(coluna_minuto, observed=True)[coluna_distancia].mean().reset_index()
                         ritmo_hist.columns = [coluna_minuto, 'Ritmo_hist']
                         ritmo_hist['Ritmo_hist_suav'] = ritmo_hist['Ritmo_hist'].rolling(3, min_periods=1).mean()
 
@@ -358,8 +411,8 @@ with col_dir:
                     pl_corte = df_atual_corte['Player Load Acumulada'].iloc[-1] if 'Player Load Acumulada' in df_atual_corte.columns and not df_atual_corte.empty else 0
                     df_hist_pl = df_historico_base.copy()
                     if not df_hist_pl.empty and 'Player Load' in df_hist_pl.columns:
-                        pl_max_hist   = df_hist_pl.groupby(coluna_jogo)['Player Load'].sum().max()
-                        pl_media_hist = df_hist_pl.groupby(coluna_jogo)['Player Load'].sum().mean()
+                        pl_max_hist   = df_hist_pl.groupby(coluna_jogo, observed=True)['Player Load'].sum().max()
+                        pl_media_hist = df_hist_pl.groupby(coluna_jogo, observed=True)['Player Load'].sum().mean()
                     else:
                         pl_max_hist   = max(pl_corte * 1.2, 1)
                         pl_media_hist = pl_corte
@@ -397,31 +450,34 @@ with col_dir:
                 with abas_graficos[4]:
                     st.markdown("#### 👥 Radar Coletivo — Volume × Ritmo Agudo")
 
-                    df_equipe_jogo = df_base[
-                        (df_base['Data'] == jogo_alvo) &
-                        (df_base['Período'] == periodo)
-                    ].copy()
+                    df_equipe_jogo = get_game(df_fresco, indice, jogo_alvo, periodo)
 
                     if not df_equipe_jogo.empty:
                         dados_radar = []
                         for atl in df_equipe_jogo['Name'].unique():
-                            df_a = df_equipe_jogo[df_equipe_jogo['Name'] == atl].sort_values(coluna_minuto)
-                            if not df_a.empty:
+                            estado_a = estado_atleta(df_janelas, atl, periodo)
+                            if estado_a is not None:
+                                load_total     = estado_a[coluna_total('Player Load')]
+                                intensidade_5m = estado_a[coluna_janela('Total Distance', 5)] / 5
+                            else:
+                                df_a = get_athlete_period(df_fresco, indice, atl, jogo_alvo, periodo)
+                                if df_a.empty:
+                                    continue
                                 load_total     = df_a['Player Load'].sum() if 'Player Load' in df_a.columns else 0
                                 intensidade_5m = (df_a['Total Distance'].tail(5).sum() / 5) if 'Total Distance' in df_a.columns else 0
 
-                                cor_ponto = visual.CORES['ok_prontidao']
-                                if load_total > 400 and intensidade_5m < 70:
-                                    cor_ponto = visual.CORES['alerta_fadiga']
-                                elif load_total > 400 and intensidade_5m > 110:
-                                    cor_ponto = visual.CORES['aviso_carga']
+                            cor_ponto = visual.CORES['ok_prontidao']
+                            if load_total > 400 and intensidade_5m < 70:
+                                cor_ponto = visual.CORES['alerta_fadiga']
+                            elif load_total > 400 and intensidade_5m > 110:
+                                cor_ponto = visual.CORES['aviso_carga']
 
-                                dados_radar.append({
-                                    'Atleta': atl,
-                                    'Load': load_total,
-                                    'Intensidade': intensidade_5m,
-                                    'Cor': cor_ponto
-                                })
+                            dados_radar.append({
+                                'Atleta': atl,
+                                'Load': load_total,
+                                'Intensidade': intensidade_5m,
+                                'Cor': cor_ponto
+                            })
 
                         df_radar_elenco = pd.DataFrame(dados_radar)
 
@@ -455,4 +511,7 @@ with col_dir:
                     else:
                         st.info("Aguardando dados da equipe para o período selecionado.")
 
-    painel_tracker_ao_vivo(campeonatos_selecionados, jogo_selecionado, atleta_selecionado, periodo_sel)
\ No newline at end of file
+    painel_tracker_ao_vivo(campeonatos_selecionados, jogo_selecionado, atleta_selecionado, periodo_sel)
+
+# Só refaz a página quando a thread de ingestão publica uma versão nova
+ui.vigiar_versao_dados()
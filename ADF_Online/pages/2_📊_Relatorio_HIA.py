@@ -6,8 +6,8 @@ import plotly.express as px
 import os
 import warnings
 
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
 import Source.Dados.config as config
+from Source.Dados.data_loader import get_game
 import Source.UI.visual as visual
 import Source.UI.components as ui
 
@@ -60,8 +60,9 @@ def renderizar_kpi_mini(titulo, valor, cor_borda=None, icone="📊", delta=None,
 # =====================================================================
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
-if 'df_global' not in st.session_state or st.session_state['df_global'].empty:
-    st.warning("⚠️ Carregue os dados na página principal (Home) primeiro.")
+# Snapshot partilhado publicado pela thread de ingestão (não lê o Excel)
+if ui.sincronizar_dados().df.empty:
+    st.warning("⚠️ Base de dados indisponível. Verifique o arquivo Excel.")
     st.stop()
 
 df_cache_estatico = st.session_state['df_global']
@@ -82,7 +83,7 @@ with col_esq:
     with c_camp:
         campeonatos_selecionados = st.multiselect("🏆 Competições:", options=lista_campeonatos, default=[])
         
-    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico.copy()
+    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico
     lista_jogos_display = df_base_estatico.drop_duplicates(subset=['Data']).sort_values(by='Data', ascending=False)['Data_Display'].tolist()
     
     with c_jogo: 
@@ -93,7 +94,7 @@ with col_esq:
         st.stop()
         
     jogo_selecionado = df_base_estatico[df_base_estatico['Data_Display'] == jogo_selecionado_display]['Data'].iloc[0]
-    df_jogo_filtrado = df_base_estatico[df_base_estatico['Data'] == jogo_selecionado].copy()
+    df_jogo_filtrado = get_game(df_cache_estatico, st.session_state['indice_global'], jogo_selecionado)
 
     # 2. Período
     st.markdown("<br>", unsafe_allow_html=True)
@@ -113,20 +114,15 @@ with col_esq:
 # ÁREA DIREITA: FRAGMENTO DE ATUALIZAÇÃO (GRÁFICO EMPILHADO + KPIS)
 # =====================================================================
 with col_dir:
-    @st.fragment(run_every="5s")
+    @st.fragment
     def painel_hia_ao_vivo(campeonatos, jogo_alvo, atleta, periodo):
         """Atualiza o gráfico de HIA dinamicamente em tempo real."""
-        hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-        df_fresco, df_rec_fresco = load_global_data(hora_atual)
-        
-        if df_fresco.empty:
-            df_fresco = st.session_state['df_global']
-        else:
-            st.session_state['df_global'] = df_fresco
-            st.session_state['df_recordes'] = df_rec_fresco
+        # Versão mais recente publicada (a troca de versão refaz a página via vigiar_versao_dados)
+        df_fresco = st.session_state['df_global']
+        indice = st.session_state['indice_global']
 
         df_base = df_fresco[df_fresco['Competição'].isin(campeonatos)] if campeonatos else df_fresco
-        df_equipa_jogo = df_base[df_base['Data'] == jogo_alvo].copy()
+        df_equipa_jogo = get_game(df_fresco, indice, jogo_alvo) # O jogo alvo já vem dos campeonatos filtrados
         df_atleta_jogo = df_equipa_jogo[df_equipa_jogo['Name'] == atleta].copy()
         
         cols_componentes_hia = [c for c in config.COLS_COMPONENTES_HIA if c in df_equipa_jogo.columns]
@@ -140,7 +136,7 @@ with col_dir:
         # =====================================================================
         # LÓGICA DE PROCESSAMENTO E AGREGAÇÃO DO HIA
         # =====================================================================
-        df_minutos_components = df_periodo.groupby('Interval')[cols_componentes_hia].sum().reset_index()
+        df_minutos_components = df_periodo.groupby('Interval', observed=True)[cols_componentes_hia].sum().reset_index()
         minuto_maximo = int(df_minutos_components['Interval'].max())
         todos_minutos = pd.DataFrame({'Interval': range(1, minuto_maximo + 1)})
         df_timeline_full = pd.merge(todos_minutos, df_minutos_components, on='Interval', how='left').fillna(0)
@@ -151,19 +147,19 @@ with col_dir:
         
         if not df_equipa_periodo.empty:
             df_equipa_periodo['Total_HIA'] = df_equipa_periodo[cols_componentes_hia].sum(axis=1)
-            hia_por_jogador = df_equipa_periodo.groupby('Name')['Total_HIA'].sum()
+            hia_por_jogador = df_equipa_periodo.groupby('Name', observed=True)['Total_HIA'].sum()
             hia_por_jogador = hia_por_jogador[hia_por_jogador > 0]
             media_hia_equipe = hia_por_jogador.mean() if not hia_por_jogador.empty else 0
             
-            hia_jogador_minuto = df_equipa_periodo.groupby(['Interval', 'Name'])['Total_HIA'].sum().reset_index()
-            media_grupo_minuto = hia_jogador_minuto.groupby('Interval')['Total_HIA'].mean().reset_index()
+            hia_jogador_minuto = df_equipa_periodo.groupby(['Interval', 'Name'], observed=True)['Total_HIA'].sum().reset_index()
+            media_grupo_minuto = hia_jogador_minuto.groupby('Interval', observed=True)['Total_HIA'].mean().reset_index()
         else:
             media_hia_equipe = 0
             media_grupo_minuto = pd.DataFrame(columns=['Interval', 'Total_HIA'])
 
         # Cálculos Avançados do Atleta (Gaps e Densidade)
         df_timeline_full['Zero_Block'] = (df_timeline_full['Total_HIA_Min'] > 0).cumsum()
-        sequencias_zeros = df_timeline_full[df_timeline_full['Total_HIA_Min'] == 0].groupby('Zero_Block').size()
+        sequencias_zeros = df_timeline_full[df_timeline_full['Total_HIA_Min'] == 0].groupby('Zero_Block', observed=True).size()
         maior_gap_descanso = sequencias_zeros.max() if not sequencias_zeros.empty else 0
         
         total_hia_periodo = df_timeline_full['Total_HIA_Min'].sum()
@@ -233,12 +229,12 @@ with col_dir:
         with abas_hia[1]:
             st.markdown("#### 🔵 Dispersão: Carga vs Minutagem por Atleta")
             
-            # Trocado df_completo por df_base e filtrado pelo jogo alvo do fragmento
-            df_scatter = df_base[df_base['Data'] == jogo_alvo].copy()
+            # Jogo alvo inteiro (mesma fatia do índice de blocos usada acima)
+            df_scatter = df_equipa_jogo
             
             if not df_scatter.empty and 'Player Load' in df_scatter.columns:
                 # Trocado Min_Num por Interval
-                df_scatter_agg = df_scatter.groupby('Name').agg(
+                df_scatter_agg = df_scatter.groupby('Name', observed=True).agg(
                     Distancia=('Total Distance', 'sum') if 'Total Distance' in df_scatter.columns else ('Interval', 'count'),
                     Player_Load=('Player Load', 'sum'),
                     HIA=('HIA', 'sum') if 'HIA' in df_scatter.columns else ('Interval', 'count'),
@@ -280,7 +276,10 @@ with col_dir:
 
             if metrica_linha in df_base.columns:
                 # Trocado df_completo por df_base
-                df_linha = df_base[df_base['Name'] == atleta_linha].groupby(['Data','Data_Display'])[metrica_linha].sum().reset_index().sort_values('Data')
+                # Totais por jogo vêm do cubo (atleta × jogo × período) publicado pela ingestão
+                df_cubo = st.session_state['df_cubo']
+                df_cubo = df_cubo[df_cubo['Competição'].isin(campeonatos)] if campeonatos else df_cubo
+                df_linha = df_cubo[df_cubo['Name'] == atleta_linha].groupby(['Data','Data_Display'], observed=True)[metrica_linha].sum().reset_index().sort_values('Data')
 
                 if len(df_linha) >= 3:
                     media_l  = df_linha[metrica_linha].mean()
@@ -333,4 +332,7 @@ with col_dir:
         jogo_selecionado, 
         atleta_selecionado,
         periodo_sel
-    )
\ No newline at end of file
+    )
+
+# Só refaz a página quando a thread de ingestão publica uma versão nova
+ui.vigiar_versao_dados()
@@ -7,7 +7,7 @@ import warnings
 
 # Importações da Arquitetura
 import Source.Dados.config as config
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
+from Source.Dados.data_loader import get_game
 import Source.UI.visual as visual
 import Source.UI.components as ui
 
@@ -16,15 +16,16 @@ import Source.UI.components as ui
 # =====================================================================
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
-if 'df_global' not in st.session_state or st.session_state['df_global'].empty:
-    st.warning("⚠️ Carregue os dados na página principal (Home) primeiro.")
+# Snapshot partilhado publicado pela thread de ingestão (não lê o Excel)
+if ui.sincronizar_dados().df.empty:
+    st.warning("⚠️ Base de dados indisponível. Verifique o arquivo Excel.")
     st.stop()
     
-df_cache_estatico = st.session_state['df_global'].copy()
+# Referência à base partilhada (sem cópia); Data já vem em datetime64 do esquema da ingestão
+df_cache_estatico = st.session_state['df_global']
 
-# Garantindo a ordem ASCENDENTE por Data (Cronológica) para os filtros
+# Garantindo a ordem por Data (Cronológica) para os filtros
 if 'Data' in df_cache_estatico.columns:
-    df_cache_estatico['Data'] = pd.to_datetime(df_cache_estatico['Data'], errors='coerce')
     df_cache_estatico = df_cache_estatico.sort_values(by='Data', ascending=False)
 
 # =====================================================================
@@ -42,7 +43,7 @@ with col_esq:
     with c_camp:
         campeonatos_selecionados = st.multiselect("🏆 Competições:", options=lista_campeonatos, default=[])
         
-    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico.copy()
+    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico
     lista_jogos_display = df_base_estatico.drop_duplicates(subset=['Data']).sort_values(by='Data', ascending=False)['Data_Display'].tolist()
     
     with c_jogo: 
@@ -72,22 +73,15 @@ with col_esq:
 with col_dir:
     st.markdown("### 🚨 Monitoramento Contínuo (V4)")
 
-    @st.fragment(run_every="5s")
+    @st.fragment
     def painel_fadiga_ao_vivo(campeonatos, jogo_alvo, periodo, coluna_faixa):
         """Atualiza a página de fadiga dinamicamente em tempo real."""
         
-        hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-        df_fresco, df_rec_fresco = load_global_data(hora_atual)
-        
-        if df_fresco.empty:
-            df_fresco = st.session_state['df_global']
-        else:
-            st.session_state['df_global'] = df_fresco
-            st.session_state['df_recordes'] = df_rec_fresco
+        # Versão mais recente publicada (a troca de versão refaz a página via vigiar_versao_dados)
+        df_fresco = st.session_state['df_global']
 
-        df_base = df_fresco[df_fresco['Competição'].isin(campeonatos)] if campeonatos else df_fresco
-        df_jogo = df_base[df_base['Data'] == jogo_alvo].copy()
-        df_periodo = df_jogo[df_jogo['Período'] == periodo].copy()
+        # O jogo alvo já vem dos campeonatos filtrados: fatia direta pelo índice de blocos
+        df_periodo = get_game(df_fresco, st.session_state['indice_global'], jogo_alvo, periodo)
 
         if df_periodo.empty:
             st.info(f"Nenhum dado encontrado para o {periodo}º Tempo deste jogo.")
@@ -105,7 +99,7 @@ with col_dir:
 
         # Alerta: Jogadores com mais de 8 minutos sem ação em V4
         df_ausente = df_periodo[df_periodo[col_v4] <= 0].copy()
-        contagem_critica = df_ausente.groupby('Name').size()
+        contagem_critica = df_ausente.groupby('Name', observed=True).size()
         atletas_em_alerta = contagem_critica[contagem_critica > 8].index.tolist()
 
         if atletas_em_alerta:
@@ -121,7 +115,7 @@ with col_dir:
             c_graf1, c_graf2 = st.columns(2)
 
             with c_graf1:
-                df_contagem = df_ausente.groupby(['Name', coluna_faixa]).size().reset_index(name='Minutos_Ausentes')
+                df_contagem = df_ausente.groupby(['Name', coluna_faixa], observed=True).size().reset_index(name='Minutos_Ausentes')
                 fig_rank = px.bar(
                     df_contagem, y="Name", x="Minutos_Ausentes", color=coluna_faixa,
                     orientation='h', template='plotly_dark',
@@ -136,7 +130,7 @@ with col_dir:
                 st.plotly_chart(fig_rank, width='stretch', key=f"bar_{periodo}")
 
             with c_graf2:
-                df_heatmap = df_periodo.groupby(['Interval', 'Name'])[col_v4].sum().reset_index()
+                df_heatmap = df_periodo.groupby(['Interval', 'Name'], observed=True)[col_v4].sum().reset_index()
                 fig_heat = px.density_heatmap(
                     df_heatmap, x="Interval", y="Name", z=col_v4,
                     color_continuous_scale="Viridis", template='plotly_dark',
@@ -215,4 +209,7 @@ with col_dir:
         jogo_selecionado, 
         periodo_sel,
         coluna_faixa_sel
-    )
\ No newline at end of file
+    )
+
+# Só refaz a página quando a thread de ingestão publica uma versão nova
+ui.vigiar_versao_dados()
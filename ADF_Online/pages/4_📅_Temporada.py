@@ -7,7 +7,8 @@ import warnings
 
 # Importações da Arquitetura
 import Source.Dados.config as config
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
+from Source.Dados.data_loader import listar_temporadas_arquivadas, carregar_temporadas, concatenar_bases
+import Source.Dados.base_analitica as base_analitica
 import Source.UI.visual as visual
 import Source.UI.components as ui
 
@@ -81,11 +82,12 @@ def renderizar_kpi_mini(titulo, valor, cor_borda=None, icone="📊", delta=None,
 
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
-if 'df_global' not in st.session_state or st.session_state['df_global'].empty:
-    st.warning("⚠️ Carregue os dados na página principal (Home) primeiro.")
+# Snapshot partilhado publicado pela thread de ingestão (não lê o Excel)
+if ui.sincronizar_dados().df.empty:
+    st.warning("⚠️ Base de dados indisponível. Verifique o arquivo Excel.")
     st.stop()
 
-df_cache_estatico = st.session_state['df_global'].copy()
+df_cache_estatico = st.session_state['df_global']
 
 # =====================================================================
 # LAYOUT PRINCIPAL: 30% ESQUERDA (FILTROS) | 70% DIREITA (PAINEL)
@@ -94,15 +96,23 @@ col_esq, col_dir = st.columns([0.28, 0.72], gap="medium")
 
 with col_esq:
     st.markdown("### 🔍 Configuração")
+
+    # 0. Temporadas anteriores (ficam em disco e só são carregadas se escolhidas)
+    temporadas_arquivadas = listar_temporadas_arquivadas()
+    temporadas_extra = st.multiselect("🗂️ Temporadas Anteriores:", options=temporadas_arquivadas, default=[]) if temporadas_arquivadas else []
+    # Só as listas de competições e atletas: vêm da base analítica quando existe (sem carregar as temporadas em memória)
+    df_cubo_antigo = base_analitica.agregar('cubo', ['Competição', 'Name'], [], temporadas=temporadas_extra) if temporadas_extra else pd.DataFrame(columns=['Competição', 'Name'])
+    if df_cubo_antigo is None:
+        df_cubo_antigo = carregar_temporadas(temporadas_extra)[1]
     
     # 1. Campeonato e Jogo Lado a Lado
     c_camp, c_jogo = st.columns(2)
     
-    lista_campeonatos = sorted(df_cache_estatico['Competição'].dropna().unique().tolist())
+    lista_campeonatos = sorted(set(df_cache_estatico['Competição'].dropna().unique()) | set(df_cubo_antigo['Competição'].dropna().unique()))
     with c_camp:
         campeonatos_selecionados = st.multiselect("🏆 Campeonatos:", options=lista_campeonatos, default=[])
         
-    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico.copy()
+    df_base_estatico = df_cache_estatico[df_cache_estatico['Competição'].isin(campeonatos_selecionados)] if campeonatos_selecionados else df_cache_estatico
     lista_jogos_display = df_base_estatico.drop_duplicates(subset=['Data']).sort_values(by='Data', ascending=False)['Data_Display'].tolist()
     
     with c_jogo: 
@@ -131,7 +141,7 @@ with col_esq:
     visao_tipo = st.radio("🎯 Foco da Análise:", ["Média da Equipa", "Atleta Específico"])
 
     if visao_tipo == "Atleta Específico":
-        lista_atletas = sorted(df_cache_estatico['Name'].dropna().unique())
+        lista_atletas = sorted(set(df_cache_estatico['Name'].dropna().unique()) | set(df_cubo_antigo['Name'].dropna().unique()))
         atleta_alvo = st.selectbox("👤 Selecione o Atleta:", lista_atletas)
     else:
         atleta_alvo = None
@@ -154,33 +164,38 @@ with col_dir:
         </style>
     """, unsafe_allow_html=True)
 
-    @st.fragment(run_every="5s")
-    def painel_temporada_ao_vivo(competicoes, metrica, visao, atleta, local):
-        hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-        df_fresco, df_rec_fresco = load_global_data(hora_atual)
-        
-        if df_fresco.empty:
-            df_fresco = st.session_state['df_global']
-        else:
-            st.session_state['df_global'] = df_fresco
-            st.session_state['df_recordes'] = df_rec_fresco
-
-        df_raw = df_fresco.copy()
-        df_raw['Data'] = pd.to_datetime(df_raw['Data'], errors='coerce')
-        df_raw = df_raw.sort_values('Data')
-
-        # Agrupamento
-        cols_agrupar = ['Total Distance', 'HIA', 'V5 Dist', 'Player Load', 'Acc3 Eff', 'Dec3 Eff']
-        cols_existentes = [c for c in cols_agrupar if c in df_raw.columns]
-
-        df_atleta_jogo = df_raw.groupby(['Data', 'Data_Display', 'Competição', 'Name', 'Jogou_em_Casa'])[cols_existentes].sum().reset_index()
-
-        if 'Acc3 Eff' in df_atleta_jogo.columns and 'Dec3 Eff' in df_atleta_jogo.columns:
-            df_atleta_jogo['AccDec_Total'] = df_atleta_jogo['Acc3 Eff'] + df_atleta_jogo['Dec3 Eff']
-            if 'AccDec_Total' not in cols_existentes: cols_existentes.append('AccDec_Total')
+    @st.fragment
+    def painel_temporada_ao_vivo(competicoes, metrica, visao, atleta, local, temporadas):
+        # Versão mais recente publicada (a troca de versão refaz a página via vigiar_versao_dados)
+        df_fresco = st.session_state['df_global']
+
+        # Temporada atual: sempre do snapshot da sessão (os mesmos dados das outras páginas, também no fluxo ao vivo).
+        # Agrupamento: cubo por jogo publicado pela ingestão, só junta os dois períodos (AccDec_Total já vem pronto)
+        df_cubo = st.session_state['df_cubo']
+        chaves_jogo = ['Data', 'Data_Display', 'Competição', 'Name', 'Jogou_em_Casa']
+        cols_agrupar = ['Total Distance', 'HIA', 'V5 Dist', 'Player Load', 'Acc3 Eff', 'Dec3 Eff', 'AccDec_Total']
+        cols_existentes = [c for c in cols_agrupar if c in df_cubo.columns]
+        df_atleta_jogo = df_cubo.groupby(chaves_jogo, observed=True)[cols_existentes].sum().reset_index()
+        # HIA por placar guardado como soma e contagem: a média junta-se entre temporadas sem reler os minutos
+        placar = df_fresco.groupby('Placar', observed=True)['HIA'].agg(['sum', 'count'])
+        if temporadas:
+            # Temporadas anteriores: agregação feita na base analítica (DuckDB/SQLite), sem trazer as partições para memória
+            df_atleta_antigo = base_analitica.agregar('cubo', chaves_jogo, cols_existentes, temporadas=temporadas)
+            soma_antiga = base_analitica.agregar('minutos', ['Placar'], ['HIA'], funcao='SUM', temporadas=temporadas)
+            contagem_antiga = base_analitica.agregar('minutos', ['Placar'], ['HIA'], funcao='COUNT', temporadas=temporadas)
+            if df_atleta_antigo is None or soma_antiga is None or contagem_antiga is None:
+                # Sem base analítica: lidas das partições em disco (em cache por versão das partições)
+                df_antigo, df_cubo_antigo = carregar_temporadas(temporadas)
+                df_atleta_antigo = df_cubo_antigo.groupby(chaves_jogo, observed=True)[cols_existentes].sum().reset_index()
+                placar_antigo = df_antigo.groupby('Placar', observed=True)['HIA'].agg(['sum', 'count'])
+            else:
+                placar_antigo = pd.DataFrame({'sum': soma_antiga.set_index('Placar')['HIA'], 'count': contagem_antiga.set_index('Placar')['HIA']})
+            df_atleta_jogo = concatenar_bases([df_atleta_antigo, df_atleta_jogo])
+            placar = placar.rename(index=str).add(placar_antigo.rename(index=str), fill_value=0)
+        df_placar_int = (placar['sum'] / placar['count']).rename('HIA').rename_axis('Placar').reset_index()
 
         # Média da Equipe
-        df_equipa_jogo = df_atleta_jogo.groupby(['Data', 'Data_Display', 'Competição', 'Jogou_em_Casa'])[cols_existentes].mean().reset_index()
+        df_equipa_jogo = df_atleta_jogo.groupby(['Data', 'Data_Display', 'Competição', 'Jogou_em_Casa'], observed=True)[cols_existentes].mean().reset_index()
         df_equipa_jogo = df_equipa_jogo.sort_values('Data')
 
         # Aplicando Filtros
@@ -255,8 +270,6 @@ with col_dir:
         # --- ABA 2: TÁTICA X PLACAR ---
         with tab2:
             st.markdown("##### Comportamento Tático-Físico (Placar vs. HIA)")
-            df_placar_int = df_raw.groupby('Placar')['HIA'].mean().reset_index()
-            
             fig_placar = px.bar(
                 df_placar_int, x='Placar', y='HIA', color='Placar',
                 title="Intensidade Média da Equipe por Condição do Jogo",
@@ -296,7 +309,7 @@ with col_dir:
                     st.plotly_chart(fig_line_comp, width='stretch', key="graf_line_comp")
 
                 st.markdown("##### 📋 Resumo Estatístico")
-                df_stats = df_plot.groupby('Competição')[metrica].agg(
+                df_stats = df_plot.groupby('Competição', observed=True)[metrica].agg(
                     Jogos='count', Média='mean', Máximo='max', Mínimo='min', Desvio_Padrão='std'
                 ).reset_index().round(1)
                 df_stats.rename(columns={'Média': f'Média ({nome_metrica_legivel})'}, inplace=True)
@@ -323,7 +336,7 @@ with col_dir:
                 df_comp_local = df_comp_local[df_comp_local['Name'] == atleta]
 
             if not df_comp_local.empty and 'Jogou_em_Casa' in df_comp_local.columns:
-                df_casa_fora = df_comp_local.groupby('Jogou_em_Casa')[metrica].mean().reset_index()
+                df_casa_fora = df_comp_local.groupby('Jogou_em_Casa', observed=True)[metrica].mean().reset_index()
                 df_casa_fora['Local'] = df_casa_fora['Jogou_em_Casa'].map({1: '🏟️ Casa', 0: '🚌 Fora'})
 
                 fig_comp_local = px.bar(
@@ -343,7 +356,7 @@ with col_dir:
 
         with tabScatter:
             df_scatter = df_comp_local[df_comp_local['Data'] == jogo_selecionado].copy()
-            df_scatter_agg = df_scatter.groupby('Name').agg(
+            df_scatter_agg = df_scatter.groupby('Name', observed=True).agg(
                 Distancia=('Total Distance', 'sum'),
                 Player_Load=('Player Load', 'sum'),
                 HIA=('HIA', 'sum'),
@@ -374,5 +387,9 @@ with col_dir:
         metrica_visao,
         visao_tipo,
         atleta_alvo,
-        filtro_local
+        filtro_local,
+        temporadas_extra
     )
+
+# Só refaz a página quando a thread de ingestão publica uma versão nova
+ui.vigiar_versao_dados()
@@ -7,43 +7,26 @@ from Source.Dados.positions import get_position, get_benchmark, classify_perform
 
 # 1. Novas Importações
 import Source.Dados.config as config
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
-from streamlit_autorefresh import st_autorefresh
 import Source.UI.visual as visual
 import Source.UI.components as ui
 
 # 3. Cabeçalho Padronizado
 ui.renderizar_cabecalho("Comparação de Atletas", "Comparativo direto de performance e métricas de GPS")
 
-# 1. Pede à página para "piscar os olhos" a cada 2 segundos (2000 ms)
-st_autorefresh(interval=2000, limit=None, key="refresh_desta_pagina")
+# 1. Refaz a página só quando o Excel muda (evento do monitor -> nova versão publicada)
+ui.vigiar_versao_dados()
 
-# 2. Verifica a "impressão digital" (hora exata) do ficheiro Excel
-hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-
-# 3. Pede os dados. Se a "hora_atual" não mudou, o Streamlit não faz NADA (0% de CPU).
-df_novo, df_recordes_novo = load_global_data(hora_atual)
-
-# 4. Atualiza a memória global para os gráficos desenharem com os dados frescos
-if not df_novo.empty:
-    st.session_state['df_global'] = df_novo
-    st.session_state['df_recordes'] = df_recordes_novo
-
-if 'df_global' not in st.session_state or st.session_state['df_global'].empty:
+# 2. Pega o snapshot partilhado publicado pela thread de ingestão (não lê o Excel)
+if ui.sincronizar_dados().df.empty:
     st.warning("⚠️ Carregue os dados na página principal ou verifique o arquivo Excel.")
     st.stop()
     
-df_base = st.session_state['df_global'].copy()
-
-# 1. Converte a coluna para o formato de data (caso ainda não esteja)
-df_base['Data'] = pd.to_datetime(df_base['Data'], errors='coerce')
+# Data (datetime64) e Data_Display já vêm prontos do esquema da ingestão
+df_base = st.session_state['df_global']
 
-# 2. Ordena os dados do MAIS NOVO para o MAIS ANTIGO (ascending=False)
+# Ordena os dados do MAIS NOVO para o MAIS ANTIGO (ascending=False)
 df_base = df_base.sort_values(by='Data', ascending=False)
 
-# 3. Cria o nome de exibição do jogo já com os dados ordenados
-df_base['Data_Display'] = df_base['Data'].dt.strftime('%d/%m/%Y') + ' ' + df_base['Adversário'].astype(str)
-
 # ==========================================
 # 2. FILTROS DE COMPARAÇÃO (TUDO EM UMA LINHA)
 # ==========================================
@@ -54,7 +37,7 @@ with st.container():
     
     with c1:
         competicao_sel = st.multiselect("🏆 Competição:", options=df_base['Competição'].unique().tolist() if 'Competição' in df_base.columns else [])
-        df_f1 = df_base[df_base['Competição'].isin(competicao_sel)] if competicao_sel else df_base.copy()
+        df_f1 = df_base[df_base['Competição'].isin(competicao_sel)] if competicao_sel else df_base
 
     with c2:
         jogo_sel = st.selectbox("📅 Selecione o Jogo:", df_f1['Data_Display'].unique())
@@ -97,23 +80,15 @@ if df_jogo.empty:
 # ==========================================
 cols_volume = ['Total Distance', 'V4 Dist', 'V5 Dist', 'Player Load']
 cols_hia = ['V4 To8 Eff', 'V5 To8 Eff', 'V6 To8 Eff', 'Acc3 Eff', 'Dec3 Eff', 'Acc4 Eff', 'Dec4 Eff']
-cols_existentes = [c for c in cols_volume + cols_hia if c in df_jogo.columns]
-
-df_jogo['HIA_Total'] = df_jogo[[c for c in cols_hia if c in df_jogo.columns]].sum(axis=1)
-if 'HIA_Total' not in cols_existentes:
-    cols_existentes.append('HIA_Total')
-
-df_agrupado = df_jogo.groupby('Name')[cols_existentes].sum().reset_index()
 
-df_agrupado['AccDec_Total'] = df_agrupado.get('Acc3 Eff', 0) + df_agrupado.get('Dec3 Eff', 0)
+# Totais do jogo a partir do cubo (atleta × jogo × período) publicado pela ingestão
+df_cubo = st.session_state['df_cubo']
+df_cubo_jogo = df_cubo[(df_cubo['Data_Display'] == jogo_sel) & df_cubo['Período'].isin(df_jogo['Período'].unique())]
+cols_existentes = [c for c in cols_volume + cols_hia + ['AccDec_Total', 'Minutos_Registrados'] if c in df_cubo_jogo.columns]
 
-minutos_jogados = (
-    df_jogo.groupby('Name')
-    .apply(lambda x: x.set_index(['Período', 'Interval']).index.nunique())
-    .reset_index()
-)
-minutos_jogados.columns = ['Name', 'Minutos Jogados']
-df_agrupado = pd.merge(df_agrupado, minutos_jogados, on='Name')
+df_agrupado = df_cubo_jogo.groupby('Name', observed=True)[cols_existentes].sum().reset_index()
+df_agrupado['HIA_Total'] = df_agrupado[[c for c in cols_hia if c in df_agrupado.columns]].sum(axis=1)
+df_agrupado = df_agrupado.rename(columns={'Minutos_Registrados': 'Minutos Jogados'})
 
 df_a1 = df_agrupado[df_agrupado['Name'] == atleta_1].iloc[0] if not df_agrupado[df_agrupado['Name'] == atleta_1].empty else None
 df_a2 = df_agrupado[df_agrupado['Name'] == atleta_2].iloc[0] if not df_agrupado[df_agrupado['Name'] == atleta_2].empty else None
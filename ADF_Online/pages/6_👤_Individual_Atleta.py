@@ -6,20 +6,14 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 import Source.Dados.config as config
-from Source.Dados.data_loader import obter_hora_modificacao, load_global_data
 import Source.UI.visual as visual
 import Source.UI.components as ui
 
 ui.renderizar_cabecalho("Relatório Individual", "Análise de performance e comparação histórica")
 
-# Carregamento inicial fora do fragmento — garante que df existe
-hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-df_novo, _ = load_global_data(hora_atual)
-if not df_novo.empty:
-    st.session_state['df_global'] = df_novo
-
-if 'df_global' not in st.session_state:
-    st.warning("⚠️ Carregue os dados na Home primeiro.")
+# Snapshot partilhado publicado pela thread de ingestão — garante que df existe
+if ui.sincronizar_dados().df.empty:
+    st.warning("⚠️ Base de dados indisponível. Verifique o arquivo Excel.")
     st.stop()
 
 # =====================================================================
@@ -113,16 +107,11 @@ def gerar_pdf_atleta(atleta, jogo, periodo, df_comp, df_evolucao, metrica_grafic
     return buffer
 
 # =====================================================================
-# FRAGMENTO PRINCIPAL — tudo dentro para o auto-refresh funcionar
+# FRAGMENTO PRINCIPAL — a troca de versão dos dados refaz a página via vigiar_versao_dados
 # =====================================================================
-@st.fragment(run_every="5s")
+@st.fragment
 def pagina_individual():
-    hora_atual = obter_hora_modificacao(config.ARQUIVO_ORIGINAL)
-    df_novo, _ = load_global_data(hora_atual)
-    if not df_novo.empty:
-        st.session_state['df_global'] = df_novo
-
-    df_completo = st.session_state['df_global'].copy()
+    df_completo = st.session_state['df_global']
 
     # FILTROS
     st.markdown("### 🔍 Seleção de Análise")
@@ -140,7 +129,7 @@ def pagina_individual():
             periodo_selecionado = st.selectbox("⏱️ Período:", ["Jogo Completo", "1º Tempo", "2º Tempo"])
 
     # PROCESSAMENTO
-    df_atleta_total = df_completo[df_completo['Name'] == atleta_selecionado].copy()
+    df_atleta_total = df_completo[df_completo['Name'] == atleta_selecionado]
     df_atleta_total = df_atleta_total[df_atleta_total['Período'].astype(str).str.contains('1|2', regex=True, na=False)]
     if periodo_selecionado == "1º Tempo":
         df_atleta_total = df_atleta_total[df_atleta_total['Período'].astype(str).str.contains('1', na=False)]
@@ -150,11 +139,18 @@ def pagina_individual():
     df_jogo_atleta     = df_atleta_total[df_atleta_total['Data'] == jogo_destaque_data]
     df_historico_atleta = df_atleta_total[df_atleta_total['Data'] != jogo_destaque_data]
 
+    # Totais por jogo: fatias do cubo (atleta × jogo × período) publicado pela ingestão
+    df_cubo = st.session_state['df_cubo']
+    periodos = {"1º Tempo": [1], "2º Tempo": [2]}.get(periodo_selecionado, [1, 2])
+    df_cubo_atleta = df_cubo[(df_cubo['Name'] == atleta_selecionado) & df_cubo['Período'].isin(periodos)]
+    df_cubo_jogo = df_cubo_atleta[df_cubo_atleta['Data'] == jogo_destaque_data]
+    df_cubo_historico = df_cubo_atleta[df_cubo_atleta['Data'] != jogo_destaque_data]
+
     # KPIs
     st.markdown(f"#### 👤 Painel Individual: {atleta_selecionado} | Jogo {jogo_destaque_display} ({periodo_selecionado})")
     total_jogos = df_atleta_total['Data'].nunique()
-    total_minutos = df_jogo_atleta.groupby('Período')['Min_Num'].max().sum() if 'Min_Num' in df_jogo_atleta.columns and not df_jogo_atleta.empty else 0
-    media_minutos = df_atleta_total.groupby(['Data', 'Período'])['Min_Num'].max().groupby('Data').sum().mean() if 'Min_Num' in df_atleta_total.columns and total_jogos > 0 else 0
+    total_minutos = df_cubo_jogo['Minutos'].sum()
+    media_minutos = df_cubo_atleta.groupby('Data')['Minutos'].sum().mean() if total_jogos > 0 else 0
 
     col_kpi_1, col_kpi_2, col_kpi_3, col_pdf = st.columns([2, 2, 2, 1])
     with col_kpi_1:
@@ -181,13 +177,10 @@ def pagina_individual():
         cols_analise = ['Total Distance', 'Player Load', 'HIA', 'V4 Dist', 'V5 Dist']
         metrica_grafico = st.pills("Visualizar Evolução de:", cols_analise, default="Total Distance")
 
-        df_metricas_timeline = df_atleta_total.groupby(['Data', 'Data_Display'])[cols_analise].sum().reset_index()
-        if 'Min_Num' in df_atleta_total.columns:
-            df_minutos_timeline = df_atleta_total.groupby(['Data', 'Data_Display', 'Período'])['Min_Num'].max().groupby(['Data', 'Data_Display']).sum().reset_index(name='Minutagem')
-        else:
-            df_minutos_timeline = pd.DataFrame({'Data': df_metricas_timeline['Data'], 'Data_Display': df_metricas_timeline['Data_Display'], 'Minutagem': 0})
-
-        df_evolucao = pd.merge(df_metricas_timeline, df_minutos_timeline, on=['Data', 'Data_Display']).sort_values('Data')
+        df_evolucao = (
+            df_cubo_atleta.groupby(['Data', 'Data_Display'], observed=True)[cols_analise + ['Minutos']].sum()
+            .reset_index().rename(columns={'Minutos': 'Minutagem'}).sort_values('Data')
+        )
 
         if not df_evolucao.empty:
             col_a, col_b = st.columns([2, 1])
@@ -269,7 +262,7 @@ def pagina_individual():
         metricas_alvo = ["Total Distance", "Player Load", "HIA", "V5 To8 Eff", "V4 Dist", "V5 Dist"]
         if not df_jogo_atleta.empty and not df_historico_atleta.empty:
             jogo_atual_stats = df_jogo_atleta[metricas_alvo].sum()
-            df_agrupado_hist = df_historico_atleta.groupby('Data')[metricas_alvo].sum()
+            df_agrupado_hist = df_cubo_historico.groupby('Data')[metricas_alvo].sum()
             media_historica  = df_agrupado_hist.mean().fillna(0).infer_objects(copy=False)
             df_comp = pd.DataFrame({
                 "Métrica": metricas_alvo,
@@ -290,7 +283,7 @@ def pagina_individual():
     # ABA 3: CLUSTERS
     with aba_clusters:
         st.markdown(f"#### Perfil de Intensidade: V4 Dist vs Distância Total ({periodo_selecionado})")
-        df_intensidade = df_atleta_total.groupby(['Data', 'Data_Display'])[['Total Distance', 'V4 Dist']].sum().reset_index()
+        df_intensidade = df_cubo_atleta.groupby(['Data', 'Data_Display'], observed=True)[['Total Distance', 'V4 Dist']].sum().reset_index()
         df_intensidade['Intensidade (%)'] = (df_intensidade['V4 Dist'] / df_intensidade['Total Distance'].replace(0, 1)) * 100
 
         if not df_jogo_atleta.empty and len(df_intensidade) > 0:
@@ -366,8 +359,8 @@ def pagina_individual():
             if posicao_atl:
                 # Pega todos os atletas da mesma posição no histórico
                 atletas_mesma_pos = [n for n in df_completo['Name'].unique() if get_position(n) == posicao_atl]
-                df_pos_grupo = df_completo[df_completo['Name'].isin(atletas_mesma_pos)]
-                df_pos_agg   = df_pos_grupo.groupby(['Name','Data'])[[m for m in metricas_perc if m in df_completo.columns]].sum().reset_index()
+                df_pos_grupo = df_cubo[df_cubo['Name'].isin(atletas_mesma_pos)]
+                df_pos_agg   = df_pos_grupo.groupby(['Name','Data'], observed=True)[[m for m in metricas_perc if m in df_cubo.columns]].sum().reset_index()
                 
                 vals_atleta_p, percentis, labels_p = [], [], []
                 for m in metricas_perc:
@@ -407,7 +400,7 @@ def pagina_individual():
         with col_corr:
             st.markdown("#### 🔗 Carga vs Performance")
             
-            df_corr = df_atleta_total.groupby(['Data','Data_Display']).agg(
+            df_corr = df_cubo_atleta.groupby(['Data','Data_Display'], observed=True).agg(
                 Player_Load=('Player Load', 'sum'),
                 HIA=('HIA', 'sum'),
                 Distancia=('Total Distance', 'sum')
@@ -451,9 +444,9 @@ def pagina_individual():
         st.markdown("#### 🎻 Distribuição Histórica por Métrica")
         
         metricas_violin = ['Total Distance', 'Player Load', 'HIA', 'V4 Dist']
-        metricas_violin = [m for m in metricas_violin if m in df_atleta_total.columns]
+        metricas_violin = [m for m in metricas_violin if m in df_cubo_atleta.columns]
         
-        df_violin = df_atleta_total.groupby('Data')[metricas_violin].sum().reset_index()
+        df_violin = df_cubo_atleta.groupby('Data')[metricas_violin].sum().reset_index()
         
         if len(df_violin) >= 4:
             metrica_viol = st.radio("Métrica:", metricas_violin, horizontal=True, key="rad_violin")
@@ -508,4 +501,5 @@ def pagina_individual():
             key="btn_download_pdf"
         )
 
-pagina_individual()
\ No newline at end of file
+pagina_individual()
+ui.vigiar_versao_dados()